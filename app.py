@@ -1,12 +1,21 @@
+import json
+import os
+from typing import AsyncIterator
 import pkg_resources
 
 import uvicorn
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
 
 from src import model_locator
 from src.api.service import CiRAService, CiRAServiceImpl
+from src.api.executor import InferenceExecutor, InferenceQueueFullError, DEFAULT_WORKERS, DEFAULT_QUEUE_DEPTH
+from src.api.batcher import MicroBatcher, DEFAULT_WINDOW, DEFAULT_MAX_BATCH_SIZE
+from src.api.cache import ResultCache, LRUCache, SQLiteCache, DEFAULT_MAX_SIZE
+from src.util.onnxbackend import TORCH, DEFAULT_DIR as DEFAULT_ONNX_DIR
+from src.data.labels import LabelReferenceError
 
 cira_version = pkg_resources.require("cira")[0].version
 
@@ -20,6 +29,7 @@ At the time, the following features are supported:
 * **label** each token in a sentence regarding its role within the causal relationship
 * generate a cause-effect **graph** from a labeled sentence
 * convert a cause-effect graph into a **test suite** containing the minimal number of test cases ensuring full requirements coverage
+* **process** a list of sentences through the whole pipeline at once
 """
 
 tags_metadata = [
@@ -35,6 +45,9 @@ tags_metadata = [
     }, {
         "name": "testsuite",
         "description": "Convert a cause-effect graph into a test suite"
+    }, {
+        "name": "process",
+        "description": "Classify a list of sentences and generate labels, a cause-effect graph, and a test suite for each causal one"
     },
 ]
 
@@ -61,15 +74,64 @@ app.add_middleware(
 )
 
 cira: CiRAService = None
+executor: InferenceExecutor = InferenceExecutor()
+
+
+async def classify_batch(sentences: list[str]) -> list[tuple[bool, float]]:
+    return await executor.run(cira.classify_batch, sentences)
+
+
+async def sentences_to_labels(sentences: list[str]) -> list[list[dict]]:
+    return await executor.run(cira.sentences_to_labels, sentences)
+
+
+# collect concurrent requests to the language models into micro-batches
+classification_batcher: MicroBatcher = MicroBatcher(classify_batch)
+labeling_batcher: MicroBatcher = MicroBatcher(sentences_to_labels)
 
 
 def setup_cira():
-    global cira
+    global cira, executor, classification_batcher, labeling_batcher
+
+    quantize = os.getenv('CIRA_QUANTIZE') or None
+    backend = os.getenv('CIRA_BACKEND', TORCH)
+    onnx_dir = os.getenv('CIRA_ONNX_DIR', DEFAULT_ONNX_DIR)
+    print(f'Inference backend: {backend} (quantization: {quantize})')
 
-    print(f'Classification model path: {model_locator.CLASSIFICATION}')
-    print(f'Labeling model path: {model_locator.LABELING}')
     # generate a CiRA service implementation
-    cira = CiRAServiceImpl(model_locator.CLASSIFICATION, model_locator.LABELING)
+    if model_locator.BUNDLE is not None:
+        print(f'Model bundle path: {model_locator.BUNDLE}')
+        cira = CiRAServiceImpl(model_bundle=model_locator.BUNDLE, cache=setup_cache(), quantize=quantize, backend=backend, onnx_dir=onnx_dir)
+    else:
+        print(f'Classification model path: {model_locator.CLASSIFICATION}')
+        print(f'Labeling model path: {model_locator.LABELING}')
+        cira = CiRAServiceImpl(model_locator.CLASSIFICATION, model_locator.LABELING, cache=setup_cache(), quantize=quantize, backend=backend, onnx_dir=onnx_dir)
+
+    # offload the calls to the service to a bounded pool of workers
+    workers = int(os.getenv('CIRA_INFERENCE_WORKERS', DEFAULT_WORKERS))
+    queue_depth = int(os.getenv('CIRA_INFERENCE_QUEUE_DEPTH', DEFAULT_QUEUE_DEPTH))
+    print(f'Inference workers: {workers} (queue depth: {queue_depth})')
+    executor.shutdown()
+    executor = InferenceExecutor(workers=workers, queue_depth=queue_depth)
+
+    window = float(os.getenv('CIRA_BATCH_WINDOW_MS', DEFAULT_WINDOW*1000))/1000
+    max_batch_size = int(os.getenv('CIRA_BATCH_SIZE', DEFAULT_MAX_BATCH_SIZE))
+    print(f'Micro-batching: up to {max_batch_size} sentences within {window*1000} ms')
+    classification_batcher = MicroBatcher(classify_batch, window=window, max_batch_size=max_batch_size)
+    labeling_batcher = MicroBatcher(sentences_to_labels, window=window, max_batch_size=max_batch_size)
+
+
+def setup_cache() -> ResultCache:
+    """Create the cache for the results of the pipeline stages as configured by the environment variables CIRA_CACHE ('memory', 'sqlite', or 'none'), CIRA_CACHE_SIZE (maximum number of entries of the in-memory cache), and CIRA_CACHE_PATH (location of the SQLite database).
+
+    returns: the configured cache or None if caching is disabled"""
+    backend = os.getenv('CIRA_CACHE', 'memory')
+    print(f'Result cache: {backend}')
+    if backend == 'memory':
+        return LRUCache(max_size=int(os.getenv('CIRA_CACHE_SIZE', DEFAULT_MAX_SIZE)))
+    if backend == 'sqlite':
+        return SQLiteCache(path=os.getenv('CIRA_CACHE_PATH', 'cira-cache.sqlite'))
+    return None
 
 
 class SentenceRequest(BaseModel):
@@ -96,6 +158,40 @@ class TestsuiteResponse(BaseModel):
     suite: dict
 
 
+class BatchRequest(BaseModel):
+    sentences: list[str]
+    language: str = "en"
+
+
+class ProcessResponse(BaseModel):
+    sentence: str
+    causal: bool
+    confidence: float
+    labels: list[dict] = None
+    graph: dict = None
+    suite: dict = None
+    error: str = None
+
+
+class BatchResponse(BaseModel):
+    results: list[ProcessResponse]
+
+
+@app.exception_handler(InferenceQueueFullError)
+def inference_queue_full(req: Request, exc: InferenceQueueFullError):
+    return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={'detail': str(exc)})
+
+
+@app.exception_handler(LabelReferenceError)
+def invalid_label_reference(req: Request, exc: LabelReferenceError):
+    return JSONResponse(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, content={'detail': str(exc), 'reason': exc.reason, 'id': exc.id})
+
+
+@app.on_event('shutdown')
+def shutdown_executor():
+    executor.shutdown()
+
+
 @app.get(PREFIX + "/")
 def root(req: Request):
     url_list = [
@@ -112,30 +208,60 @@ def health():
     }
 
 
+@app.get(PREFIX + "/cache")
+def cache():
+    return cira.cache_statistics()
+
+
 @app.put(PREFIX + '/classify', response_model=ClassificationResponse, tags=['classify'])
 async def create_classification(req: SentenceRequest):
-    causal, confidence = cira.classify(req.sentence)
+    causal, confidence = await classification_batcher.submit(req.sentence)
     return ClassificationResponse(causal=causal, confidence=confidence)
 
 
 @app.put(PREFIX + '/label', response_model=LabelingResponse, tags=['label'])
 async def create_labels(req: SentenceRequest):
-    labels = cira.sentence_to_labels(sentence=req.sentence)
+    labels = await labeling_batcher.submit(req.sentence)
     return LabelingResponse(labels=labels)
 
 
 @app.put(PREFIX + '/graph', response_model=GraphResponse, tags=['graph'])
 async def create_graph(req: SentenceRequest):
-    graph = cira.sentence_to_graph(sentence=req.sentence, labels=req.labels)
+    graph = await executor.run(cira.sentence_to_graph, sentence=req.sentence, labels=req.labels)
     return GraphResponse(graph=graph)
 
 
 @app.put(PREFIX + '/testsuite', response_model=TestsuiteResponse, tags=['testsuite'])
 async def create_testsuite(req: SentenceRequest):
-    testsuite = cira.graph_to_test(graph=req.graph, sentence=req.sentence)
+    testsuite = await executor.run(cira.graph_to_test, graph=req.graph, sentence=req.sentence)
     return TestsuiteResponse(suite=testsuite)
 
 
+@app.put(PREFIX + '/process/batch', response_model=BatchResponse, tags=['process'])
+async def create_batch(req: BatchRequest, stream: bool = False):
+    if stream:
+        # emit one line of JSON per sentence as soon as it has been processed
+        results = executor.stream(cira.process_stream(sentences=req.sentences))
+        return StreamingResponse(stream_ndjson(results), media_type='application/x-ndjson')
+
+    results = await executor.run(cira.process_batch, sentences=req.sentences)
+    return BatchResponse(results=results)
+
+
+async def stream_ndjson(results: AsyncIterator[dict]) -> AsyncIterator[str]:
+    """Serialize the results of an asynchronous iterator to newline-delimited JSON. Since the status of the response has already been sent once the first line is emitted, a failure while producing the results is reported by a final line containing only the error.
+
+    parameters:
+        results -- asynchronous iterator over serialized results
+
+    returns: asynchronous iterator over one line of JSON per result"""
+    try:
+        async for result in results:
+            yield json.dumps(result) + '\n'
+    except Exception as exception:
+        yield json.dumps({'error': f'{type(exception).__name__}: {exception}'}) + '\n'
+
+
 if __name__ == '__main__':
     setup_cira()
     uvicorn.run(app, host='0.0.0.0')
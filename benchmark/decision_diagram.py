@@ -0,0 +1,53 @@
+"""Measure the binary decision diagram engine on cause-effect graphs with up to hundreds of cause events (a conjunction of disjunctions of events, as in requirements enumerating alternative conditions): the time to compile the cause tree, the size of the diagram, the number of satisfying configurations (counted without enumerating them), and the MC/DC test suite derived from the diagram in comparison to the one derived from the tree. The exhaustive enumeration of testsuiteconverter.convert is measured as well as long as it remains feasible.
+
+usage: python -m benchmark.decision_diagram"""
+import argparse
+import timeit
+
+from tabulate import tabulate
+
+from benchmark.mcdc import generate_graph
+from src.converters.graphtotestsuite.testsuiteconverter import convert, DECISION_DIAGRAM, EXHAUSTIVE, MCDC
+from src.data.bdd import BDD
+
+# largest number of cause events for which the exhaustive enumeration is measured
+MAX_EXHAUSTIVE_EVENTS = 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the binary decision diagram engine on large cause-effect graphs')
+    parser.add_argument('--repetitions', type=int, default=3, help='number of repetitions of each measurement')
+    args = parser.parse_args()
+
+    rows = []
+    for groups, alternatives in [(4, 3), (6, 3), (8, 4), (12, 4), (25, 4), (50, 4)]:
+        graph = generate_graph(groups=groups, alternatives=alternatives)
+        events = groups * alternatives
+
+        bdd = BDD()
+        function = bdd.compile(graph.root)
+        compile_time = timeit.timeit(lambda: BDD().compile(graph.root), number=args.repetitions) / args.repetitions
+        count_time = timeit.timeit(lambda: bdd.count(function), number=args.repetitions) / args.repetitions
+
+        measurements = []
+        for strategy in [DECISION_DIAGRAM, MCDC, EXHAUSTIVE]:
+            if strategy == EXHAUSTIVE and events > MAX_EXHAUSTIVE_EVENTS:
+                measurements += ['-', '-']
+                continue
+            seconds = timeit.timeit(lambda: convert(graph, strategy=strategy), number=args.repetitions) / args.repetitions
+            measurements += [len(convert(graph, strategy=strategy).cases), f'{seconds*1000:.2f}']
+
+        rows.append([
+            f'{groups} x {alternatives}',
+            events,
+            len(bdd.reachable(function)) - 2,
+            f'{compile_time*1000:.2f}',
+            f'{bdd.count(function):.3e}',
+            f'{count_time*1000:.2f}'] + measurements)
+
+    print(tabulate(rows, headers=['disjunctions x events', 'events', 'BDD nodes', 'compile [ms]', 'satisfying configurations', 'count [ms]',
+                                  'MC/DC (BDD) cases', 'MC/DC (BDD) [ms]', 'MC/DC (tree) cases', 'MC/DC (tree) [ms]', 'exhaustive cases', 'exhaustive [ms]']))
+
+
+if __name__ == '__main__':
+    main()
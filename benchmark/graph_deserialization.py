@@ -0,0 +1,77 @@
+"""Measure the time of deserializing cause-effect graphs (from_dict) of increasing size, as they occur for long enumerations of conditions in safety requirements. The graphs consist of a disjunction of conjunctions of cause event nodes which lead to a few effect event nodes. The id-indexed deserialization is compared to resolving the ids of the edges by scanning the list of nodes (get_node_from_list), and both must yield equal graphs.
+
+usage: python -m benchmark.graph_deserialization"""
+import argparse
+import timeit
+
+from tabulate import tabulate
+
+from src.data.graph import EventNode, Graph, IntermediateNode, Node, from_dict, get_node_from_list
+
+CONJUNCTION_SIZE = 10
+EFFECTS = 3
+
+
+def generate_graph(causes: int) -> dict:
+    """Generate a serialized cause-effect graph in which groups of cause event nodes are conjoined and all conjunctions are disjoined.
+
+    parameters:
+        causes -- number of cause event nodes
+
+    returns: graph as a dictionary"""
+    nodes, edges = [{'id': 'i0', 'conjunction': False}], []
+    for index in range(causes):
+        if index % CONJUNCTION_SIZE == 0:
+            conjunction = f'i{index // CONJUNCTION_SIZE + 1}'
+            nodes.append({'id': conjunction, 'conjunction': True})
+            edges.append({'origin': conjunction, 'target': 'i0', 'negated': False})
+        nodes.append({'id': f'c{index}', 'variable': f'the sensor {index}', 'condition': 'reports an error'})
+        edges.append({'origin': f'c{index}', 'target': conjunction, 'negated': index % 3 == 0})
+    for index in range(EFFECTS):
+        nodes.append({'id': f'e{index}', 'variable': f'the actuator {index}', 'condition': 'is disabled'})
+        edges.append({'origin': 'i0', 'target': f'e{index}', 'negated': False})
+    return {'nodes': nodes, 'root': 'i0', 'edges': edges}
+
+
+def from_dict_by_scanning(dict_graph: dict) -> Graph:
+    """Deserialize a graph like from_dict, but resolve the ids of the edges by scanning the list of nodes for every edge.
+
+    parameters:
+        dict_graph -- graph as a dictionary
+
+    returns: actual graph representing the dict_graph"""
+    nodes: list[Node] = []
+    for node in dict_graph['nodes']:
+        if 'conjunction' in node.keys():
+            nodes.append(IntermediateNode(id=node['id'], conjunction=node['conjunction'], precedence=node.get('precedence', False)))
+        else:
+            nodes.append(EventNode(id=node['id'], variable=node['variable'], condition=node['condition']))
+
+    edges = []
+    for edge in dict_graph['edges']:
+        origin = get_node_from_list(nodes, edge['origin'])
+        target = get_node_from_list(nodes, edge['target'])
+        edges.append(target.add_incoming(origin, negated=edge['negated']))
+
+    return Graph(nodes=nodes, root=get_node_from_list(nodes, dict_graph['root']), edges=edges)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the time of deserializing cause-effect graphs')
+    parser.add_argument('--repetitions', type=int, default=3, help='number of repetitions of each measurement')
+    args = parser.parse_args()
+
+    rows = []
+    for causes in [100, 500, 1000, 2000, 4000]:
+        serialized = generate_graph(causes)
+        assert from_dict(serialized) == from_dict_by_scanning(serialized)
+
+        by_index = timeit.timeit(lambda: from_dict(serialized), number=args.repetitions) / args.repetitions
+        by_scanning = timeit.timeit(lambda: from_dict_by_scanning(serialized), number=args.repetitions) / args.repetitions
+        rows.append([causes, len(serialized['nodes']), len(serialized['edges']), f'{by_scanning*1000:.1f}', f'{by_index*1000:.1f}', f'{by_scanning/by_index:.0f}x'])
+
+    print(tabulate(rows, headers=['causes', 'nodes', 'edges', 'by scanning [ms]', 'by index [ms]', 'speedup']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Compare the size and generation time of the test suites selected by the exhaustive and the MC/DC strategy of testsuiteconverter.convert on cause-effect graphs of nested junctors, as they occur in requirements enumerating alternative conditions (a conjunction of disjunctions of events). The number of exhaustive test cases grows multiplicatively with the nesting, while the MC/DC test suite grows linearly with the number of events.
+
+usage: python -m benchmark.mcdc"""
+import argparse
+import timeit
+
+from tabulate import tabulate
+
+from src.converters.graphtotestsuite.testsuiteconverter import convert, EXHAUSTIVE, MCDC
+from src.data.graph import EventNode, Graph, IntermediateNode, Node
+
+
+def generate_graph(groups: int, alternatives: int) -> Graph:
+    """Generate a cause-effect graph whose root is a conjunction of disjunctions of events, which leads to a single effect.
+
+    parameters:
+        groups -- number of disjunctions connected to the root conjunction
+        alternatives -- number of events connected to each disjunction
+
+    returns: the cause-effect graph"""
+    root = IntermediateNode(id='i0', conjunction=True)
+    nodes: list[Node] = [root]
+    for group in range(groups):
+        disjunction = IntermediateNode(id=f'i{group+1}', conjunction=False)
+        root.add_incoming(disjunction)
+        nodes.append(disjunction)
+        for alternative in range(alternatives):
+            event = EventNode(id=f'c{group}_{alternative}', variable=f'the sensor {group}.{alternative}', condition='reports an error')
+            disjunction.add_incoming(event, negated=(alternative % 2 == 1))
+            nodes.append(event)
+    effect = EventNode(id='e0', variable='the system', condition='shuts down')
+    effect.add_incoming(root)
+    nodes.append(effect)
+    return Graph(nodes=nodes, root=root, edges=[])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the exhaustive and the MC/DC test case selection strategy')
+    parser.add_argument('--repetitions', type=int, default=3, help='number of repetitions of each measurement')
+    args = parser.parse_args()
+
+    rows = []
+    for groups, alternatives in [(2, 2), (2, 4), (3, 3), (4, 3), (5, 3), (6, 3), (4, 5)]:
+        graph = generate_graph(groups=groups, alternatives=alternatives)
+        exhaustive = timeit.timeit(lambda: convert(graph, strategy=EXHAUSTIVE), number=args.repetitions) / args.repetitions
+        mcdc = timeit.timeit(lambda: convert(graph, strategy=MCDC), number=args.repetitions) / args.repetitions
+        rows.append([
+            f'{groups} x {alternatives}',
+            groups * alternatives,
+            len(convert(graph, strategy=EXHAUSTIVE).cases),
+            len(convert(graph, strategy=MCDC).cases),
+            f'{exhaustive*1000:.2f}',
+            f'{mcdc*1000:.2f}'])
+
+    print(tabulate(rows, headers=['disjunctions x events', 'events', 'exhaustive cases', 'MC/DC cases', 'exhaustive [ms]', 'MC/DC [ms]']))
+
+
+if __name__ == '__main__':
+    main()
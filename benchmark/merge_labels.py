@@ -0,0 +1,62 @@
+"""Measure the time of merging token labels into labels (merge_labels) on synthetic sentences of increasing length, where every token carries an event label and an attribute label. A linear implementation keeps the time per token constant.
+
+usage: python -m benchmark.merge_labels"""
+import argparse
+import random
+import timeit
+
+from tabulate import tabulate
+
+import src.util.constants as consts
+from src.converters.sentencetolabels.labelingconverter import TokenLabel, merge_labels
+
+EVENTS = consts.LABEL_IDS_VERBOSE[1:7]
+ATTRIBUTES = [consts.VARIABLE, consts.CONDITION]
+
+
+def generate_token_labels(tokens: int, seed: int = 0) -> list[TokenLabel]:
+    """Generate the token labels of a synthetic sentence consisting of events of random length (separated by junctors), where each token of an event is either part of the variable or the condition.
+
+    parameters:
+        tokens -- number of tokens of the sentence
+        seed -- seed of the random number generator
+
+    returns: list of token labels in the order of the tokens"""
+    generator = random.Random(seed)
+    token_labels: list[TokenLabel] = []
+    cursor = 0
+    event_index = 0
+    remaining_in_event = 0
+    for _ in range(tokens):
+        length = generator.randint(2, 8)
+        if remaining_in_event == 0:
+            # start a new event after a junctor
+            token_labels.append(TokenLabel(begin=cursor, end=cursor+3, event=False, name=consts.CONJUNCTION))
+            cursor += 4
+            event_index += 1
+            remaining_in_event = generator.randint(3, 12)
+        event = EVENTS[event_index % len(EVENTS)]
+        attribute = ATTRIBUTES[0] if remaining_in_event > 2 else ATTRIBUTES[1]
+        token_labels.append(TokenLabel(begin=cursor, end=cursor+length, event=True, name=event))
+        token_labels.append(TokenLabel(begin=cursor, end=cursor+length, event=False, name=attribute))
+        cursor += length + 1
+        remaining_in_event -= 1
+    return token_labels
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the time of merging token labels')
+    parser.add_argument('--repetitions', type=int, default=20, help='number of repetitions of each measurement')
+    args = parser.parse_args()
+
+    rows = []
+    for tokens in [125, 250, 500, 1000, 2000]:
+        token_labels = generate_token_labels(tokens)
+        seconds = timeit.timeit(lambda: merge_labels(token_labels=token_labels), number=args.repetitions) / args.repetitions
+        rows.append([tokens, len(token_labels), f'{seconds*1000:.3f}', f'{seconds*1e6/tokens:.2f}'])
+
+    print(tabulate(rows, headers=['tokens', 'token labels', 'merge [ms]', 'per token [µs]']))
+
+
+if __name__ == '__main__':
+    main()
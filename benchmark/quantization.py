@@ -0,0 +1,117 @@
+"""Compare the quantized language models and the models executed by ONNX Runtime (if exported to model/onnx) with their full-precision PyTorch counterparts. The whole pipeline is applied to every sentence in static/sentences once per mode (each in a fresh process), and the agreement of the classification, labels, cause-effect graph, and test suite with the full-precision results is reported next to the throughput and the peak memory (resident set size) of each mode.
+
+usage: python -m benchmark.quantization"""
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from tabulate import tabulate
+
+import src.util.constants as consts
+from src.util.loader import load_sentence
+from src.util.onnxbackend import DEFAULT_DIR, ONNX
+
+FULL_PRECISION = 'fp32'
+# arguments of the CiRA service for each mode
+MODES = {
+    FULL_PRECISION: {},
+    'int8': {'quantize': 'int8'},
+    'onnx': {'backend': ONNX, 'onnx_dir': DEFAULT_DIR}
+}
+
+
+def load_sentences() -> list[str]:
+    """Load the literal sentences of all static test files.
+
+    returns: list of sentences in a deterministic order"""
+    filenames = sorted(glob.glob(f'{consts.SENTENCES_PATH}/*.json'))
+    return [load_sentence(filename=filename)[1] for filename in filenames]
+
+
+def measure(mode: str, repetitions: int) -> dict:
+    """Load the CiRA service in the given mode (without a result cache), process all sentences, and measure the throughput and peak memory.
+
+    parameters:
+        mode -- one of MODES
+        repetitions -- number of times all sentences are processed to measure the throughput
+
+    returns: serialized results for each sentence, throughput in sentences per second, and peak resident set size in MB"""
+    from src import model_locator
+    from src.api.service import CiRAServiceImpl
+    if model_locator.BUNDLE is not None:
+        cira = CiRAServiceImpl(model_bundle=model_locator.BUNDLE, **MODES[mode])
+    else:
+        cira = CiRAServiceImpl(model_locator.CLASSIFICATION, model_locator.LABELING, **MODES[mode])
+
+    sentences = load_sentences()
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        results = cira.process_batch(sentences)
+    duration = time.perf_counter() - start
+
+    return {
+        'results': results,
+        'throughput': len(sentences) * repetitions / duration,
+        # ru_maxrss is reported in kilobytes on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+
+def agreement(reference: list[dict], results: list[dict], aspect: str) -> float:
+    """Determine the share of sentences for which an aspect of the results is identical to the reference.
+
+    parameters:
+        reference -- serialized results of the full-precision models
+        results -- serialized results of the compared models
+        aspect -- compared aspect of the results (e.g., 'causal', 'labels', 'graph', or 'suite')
+
+    returns: share of identical results between 0 and 1"""
+    identical = [expected[aspect] == actual[aspect] for expected, actual in zip(reference, results)]
+    return sum(identical) / len(identical)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the quantized and ONNX language models with the full-precision models')
+    parser.add_argument('--mode', choices=MODES.keys(), help='measure a single mode in this process and print the result as JSON')
+    parser.add_argument('--repetitions', type=int, default=5, help='number of times all sentences are processed to measure the throughput')
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        print(json.dumps(measure(mode=args.mode, repetitions=args.repetitions)))
+        return
+
+    measurements = {}
+    for mode, arguments in MODES.items():
+        if arguments.get('backend') == ONNX and not os.path.isdir(DEFAULT_DIR):
+            print(f'Skipping mode "{mode}", as the models have not been exported to {DEFAULT_DIR} (see src.export_onnx)')
+            continue
+        process = subprocess.run([sys.executable, '-m', 'benchmark.quantization', '--mode', mode, '--repetitions', str(args.repetitions)], capture_output=True, text=True, check=True)
+        measurements[mode] = json.loads(process.stdout.strip().splitlines()[-1])
+
+    reference = measurements[FULL_PRECISION]['results']
+    rows = []
+    for mode, measurement in measurements.items():
+        results = measurement['results']
+        confidence_delta = max(abs(expected['confidence'] - actual['confidence']) for expected, actual in zip(reference, results))
+        rows.append([
+            mode,
+            f'{agreement(reference, results, "causal"):.1%}',
+            f'{confidence_delta:.4f}',
+            f'{agreement(reference, results, "labels"):.1%}',
+            f'{agreement(reference, results, "graph"):.1%}',
+            f'{agreement(reference, results, "suite"):.1%}',
+            f'{measurement["throughput"]:.1f}',
+            f'{measurement["peak_rss_mb"]:.0f}'
+        ])
+
+    print(f'{len(reference)} sentences from {consts.SENTENCES_PATH}, agreement with {FULL_PRECISION}')
+    print(tabulate(rows, headers=['mode', 'classification', 'max. confidence delta', 'labels', 'graph', 'suite', 'sentences/s', 'peak RSS [MB]']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Measure the cold start time and the peak memory (resident set size) of loading the CiRA converter, once building the language models from their configuration only, once loading the pre-trained base models first, and once loading the model bundle (if MODEL_BUNDLE is configured). Each mode is measured in a fresh process.
+
+usage: python -m benchmark.startup"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from tabulate import tabulate
+
+FROM_CONFIG = 'from config'
+FROM_PRETRAINED = 'from pretrained'
+FROM_BUNDLE = 'from bundle'
+MODES = [FROM_CONFIG, FROM_PRETRAINED, FROM_BUNDLE]
+
+
+def measure(mode: str) -> dict:
+    """Load the CiRA converter and measure the time and peak memory this takes.
+
+    parameters:
+        mode -- how the language models are loaded (one of MODES)
+
+    returns: duration in seconds and peak resident set size in MB, or None if the mode is not available"""
+    start = time.perf_counter()
+
+    from src import model_locator
+    from src.cira import CiRAConverter
+    if mode == FROM_BUNDLE:
+        if model_locator.BUNDLE is None:
+            return None
+        CiRAConverter(bundle_path=model_locator.BUNDLE)
+    else:
+        CiRAConverter(
+            classifier_causal_model_path=model_locator.CLASSIFICATION,
+            converter_s2l_model_path=model_locator.LABELING,
+            from_config=(mode == FROM_CONFIG))
+
+    return {
+        'seconds': time.perf_counter() - start,
+        # ru_maxrss is reported in kilobytes on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the cold start of the CiRA converter')
+    parser.add_argument('--mode', choices=MODES, help='measure a single mode in this process and print the result as JSON')
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        print(json.dumps(measure(mode=args.mode)))
+        return
+
+    rows = []
+    for mode in MODES:
+        process = subprocess.run([sys.executable, '-m', 'benchmark.startup', '--mode', mode], capture_output=True, text=True, check=True)
+        result = json.loads(process.stdout.strip().splitlines()[-1])
+        if result is None:
+            print(f'Skipping mode "{mode}", as it is not configured')
+            continue
+        rows.append([mode, f'{result["seconds"]:.1f}', f'{result["peak_rss_mb"]:.0f}'])
+
+    print(tabulate(rows, headers=['mode', 'cold start [s]', 'peak RSS [MB]']))
+
+
+if __name__ == '__main__':
+    main()
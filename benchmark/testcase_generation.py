@@ -0,0 +1,76 @@
+"""Measure the time of generating the test cases of a cause-effect graph (testsuiteconverter.convert) with and without memoizing the configurations of the nodes, on graphs whose root is a wide conjunction or disjunction of events and of small subtrees, as they occur for long enumerations of conditions in requirements. Without memoization, a conjunction expected to be false (or a disjunction expected to be true) evaluates every incoming node once per sibling. Both ways must yield identical test cases.
+
+usage: python -m benchmark.testcase_generation"""
+import argparse
+import timeit
+
+from tabulate import tabulate
+
+from src.converters.graphtotestsuite.testsuiteconverter import convert, get_parameters, generate_test_cases
+from src.data.graph import ConfigurationCache, EventNode, Graph, IntermediateNode, Node
+
+
+def generate_graph(width: int, conjunction: bool, subtrees: bool) -> Graph:
+    """Generate a cause-effect graph whose root junctor has the given number of incoming nodes, which lead to a single effect.
+
+    parameters:
+        width -- number of incoming nodes of the root
+        conjunction -- True if the root is a conjunction, False if it is a disjunction
+        subtrees -- True if the incoming nodes of the root are small subtrees (an event combined with a negated event by the same junctor as the root, which keeps the number of test cases linear in the width), False if they are events
+
+    returns: the cause-effect graph"""
+    root = IntermediateNode(id='i0', conjunction=conjunction)
+    nodes: list[Node] = [root]
+    for index in range(width):
+        event = EventNode(id=f'c{index}', variable=f'the sensor {index}', condition='reports an error')
+        nodes.append(event)
+        if subtrees:
+            junctor = IntermediateNode(id=f'i{index+1}', conjunction=conjunction)
+            other = EventNode(id=f'd{index}', variable=f'the backup sensor {index}', condition='is active')
+            junctor.add_incoming(event)
+            junctor.add_incoming(other, negated=True)
+            root.add_incoming(junctor)
+            nodes.extend([junctor, other])
+        else:
+            root.add_incoming(event)
+    effect = EventNode(id='e0', variable='the system', condition='shuts down')
+    effect.add_incoming(root)
+    nodes.append(effect)
+    return Graph(nodes=nodes, root=root, edges=[])
+
+
+def convert_without_cache(graph: Graph) -> list[dict]:
+    """Generate the test cases of a graph without memoizing the configurations of the nodes.
+
+    parameters:
+        graph -- cause-effect graph
+
+    returns: list of test cases"""
+    parameters_map, _, _, effects = get_parameters(graph=graph)
+    return list(generate_test_cases(graph=graph, parameters_map=parameters_map, effects=effects))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the time of generating test cases with and without memoization')
+    parser.add_argument('--repetitions', type=int, default=3, help='number of repetitions of each measurement')
+    args = parser.parse_args()
+
+    rows = []
+    for subtrees in [False, True]:
+        for conjunction in [True, False]:
+            for width in [50, 100, 200, 400]:
+                graph = generate_graph(width=width, conjunction=conjunction, subtrees=subtrees)
+                cache = ConfigurationCache()
+                cases = convert(graph, cache=cache).cases
+                assert cases == convert_without_cache(graph)
+
+                uncached = timeit.timeit(lambda: convert_without_cache(graph), number=args.repetitions) / args.repetitions
+                cached = timeit.timeit(lambda: convert(graph), number=args.repetitions) / args.repetitions
+                root = ('AND' if conjunction else 'OR') + (' of subtrees' if subtrees else ' of events')
+                rows.append([root, width, len(graph.nodes), len(cases), f'{uncached*1000:.1f}', f'{cached*1000:.1f}', f'{uncached/cached:.1f}x', f'{cache.reuse_rate:.1%}'])
+
+    print(tabulate(rows, headers=['root', 'width', 'nodes', 'test cases', 'without cache [ms]', 'with cache [ms]', 'speedup', 'reuse rate']))
+
+
+if __name__ == '__main__':
+    main()
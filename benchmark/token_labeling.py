@@ -0,0 +1,59 @@
+"""Compare the two ways of converting the predictions of the labeler into token labels on increasingly long synthetic sentences: locating each token in the sentence (get_token_labeling) and using the character offsets produced by the tokenizer (get_token_labeling_from_offsets). Both ways must yield identical token labels.
+
+usage: python -m benchmark.token_labeling"""
+import argparse
+import re
+import timeit
+
+import torch
+from tabulate import tabulate
+
+import src.util.constants as consts
+from src.converters.sentencetolabels.labelingconverter import get_token_labeling, get_token_labeling_from_offsets, TOKEN_INIT, TOKEN_PREFIX, TOKENS_END
+
+SENTENCE = 'If the red button is pressed and the system is running, the system shuts down and the red light turns on.'
+TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]')
+
+
+def tokenize(sentence: str) -> tuple[list[str], list[tuple[int, int]]]:
+    """Split a sentence into tokens in the style of the RoBERTa tokenizer (words and punctuation, where tokens following a whitespace are prefixed) and determine their character offsets.
+
+    parameters:
+        sentence -- natural language sentence
+
+    returns: list of tokens including special tokens and their character offsets"""
+    tokens, offsets = [TOKEN_INIT], [(0, 0)]
+    for match in TOKEN_PATTERN.finditer(sentence):
+        prefix = TOKEN_PREFIX if match.start() > 0 and sentence[match.start()-1] == ' ' else ''
+        tokens.append(prefix + match.group())
+        offsets.append(match.span())
+    tokens.append(TOKENS_END[0])
+    offsets.append((0, 0))
+    return tokens, offsets
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the token labeling via the sentence and via the offset mapping')
+    parser.add_argument('--repetitions', type=int, default=5, help='number of repetitions of each measurement')
+    args = parser.parse_args()
+
+    rows = []
+    for sentence_count in [1, 4, 16, 64]:
+        sentence = ' '.join([SENTENCE]*sentence_count)
+        tokens, offsets = tokenize(sentence)
+        torch.manual_seed(0)
+        # the predictions are passed as nested lists, such that the measurement is not dominated by accessing single tensor elements
+        predictions = (torch.rand(1, len(tokens), len(consts.LABEL_IDS_VERBOSE)) > 0.8).int().tolist()
+
+        expected = get_token_labeling(sentence_tokens=tokens, sentence=sentence, predictions=predictions)
+        assert get_token_labeling_from_offsets(offsets=offsets, predictions=predictions) == expected
+
+        via_sentence = timeit.timeit(lambda: get_token_labeling(sentence_tokens=tokens, sentence=sentence, predictions=predictions), number=args.repetitions) / args.repetitions
+        via_offsets = timeit.timeit(lambda: get_token_labeling_from_offsets(offsets=offsets, predictions=predictions), number=args.repetitions) / args.repetitions
+        rows.append([len(sentence), len(tokens), f'{via_sentence*1000:.2f}', f'{via_offsets*1000:.2f}', f'{via_sentence/via_offsets:.1f}x'])
+
+    print(tabulate(rows, headers=['characters', 'tokens', 'via sentence [ms]', 'via offsets [ms]', 'speedup']))
+
+
+if __name__ == '__main__':
+    main()
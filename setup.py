@@ -18,6 +18,7 @@ setup(
         'numpy==1.23',
         'python-dotenv==0.20',
         'pytorch_lightning==1.7',
+        'safetensors==0.3.1',
         'tabulate==0.8.10',
         'torch==1.12',
         'transformers==4.10',
@@ -32,6 +33,10 @@ setup(
             'pytest-env==0.8.1',
             'pytest-mock==3.10.0'
         ],
+        'onnx': [
+            'onnx==1.12.0',
+            'onnxruntime==1.12.1'
+        ],
     },
 )
 
@@ -0,0 +1,84 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+DEFAULT_WINDOW = 0.005
+DEFAULT_MAX_BATCH_SIZE = 16
+
+
+class MicroBatcher:
+
+    def __init__(self, function: Callable[[list], Awaitable[list]], window: float = DEFAULT_WINDOW, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE):
+        """Create a micro-batcher that collects single items submitted by concurrent requests and processes them together in one batch. A batch is processed once the first item of the batch has waited for the given window or once the batch reached its maximum size, whichever comes first.
+
+        parameters:
+            function -- coroutine function which processes a list of items and returns a list of results in the same order
+            window -- maximum time (in seconds) an item waits for further items to join its batch
+            max_batch_size -- maximum number of items processed in one batch"""
+        self.function = function
+        self.window = window
+        self.max_batch_size = max_batch_size
+
+        self.pending: list[tuple[Any, asyncio.Future]] = []
+        self.timer: asyncio.TimerHandle = None
+        # the event loop only keeps weak references to tasks, hence the running batches are kept until they are done
+        self.tasks: set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Add an item to the current batch and wait until the batch has been processed.
+
+        parameters:
+            item -- single item to process
+
+        returns: the result of processing the item"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((item, future))
+
+        if len(self.pending) >= self.max_batch_size:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.window, self.flush)
+
+        return await future
+
+    def flush(self):
+        """Process all currently pending items as one batch."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+        batch, self.pending = self.pending, []
+        if len(batch) > 0:
+            task = asyncio.ensure_future(self.process(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def process(self, batch: list[tuple[Any, asyncio.Future]]):
+        """Process a batch of items and resolve the future of each item with its respective result.
+
+        parameters:
+            batch -- list of items and the futures awaiting their result"""
+        try:
+            results = await self.function([item for item, _ in batch])
+        except Exception as exception:
+            # every request in the batch is affected by the failure
+            self.fail(batch, exception)
+            return
+
+        if len(results) != len(batch):
+            self.fail(batch, ValueError(f'Processing a batch of {len(batch)} items returned {len(results)} results'))
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def fail(self, batch: list[tuple[Any, asyncio.Future]], exception: Exception):
+        """Resolve the future of each item of a batch which is still awaiting its result with an exception.
+
+        parameters:
+            batch -- list of items and the futures awaiting their result
+            exception -- exception raised to every waiting caller"""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(exception)
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from abc import abstractmethod
+from collections import Counter, OrderedDict
+from typing import Any
+
+# stages of the pipeline whose results can be cached independently
+CLASSIFY = 'classify'
+LABELS = 'labels'
+GRAPH = 'graph'
+SUITE = 'suite'
+
+DEFAULT_MAX_SIZE = 10000
+
+
+def fingerprint(path: str) -> str:
+    """Generate a fingerprint of a model checkpoint, which changes whenever the checkpoint is replaced. The fingerprint is derived from the name, size, and modification time of the file rather than its content, as hashing several hundred megabytes would considerably delay the startup.
+
+    parameters:
+        path -- location of the model checkpoint
+
+    returns: fingerprint of the checkpoint"""
+    if path is None or not os.path.isfile(path):
+        return str(path)
+
+    stat = os.stat(path)
+    return f'{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}'
+
+
+def key(*contents) -> str:
+    """Generate a content-addressed key from all inputs that determine the result of a pipeline stage (e.g., the sentence and the fingerprint of the model that processes it).
+
+    parameters:
+        contents -- JSON-serializable inputs of the stage
+
+    returns: hash of the contents"""
+    digest = hashlib.sha256()
+    for content in contents:
+        digest.update(json.dumps(content, sort_keys=True).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class ResultCache:
+
+    def __init__(self):
+        """Create a cache for serialized results of the pipeline stages, which counts the hits and misses per stage."""
+        self.hits = Counter()
+        self.misses = Counter()
+        self.lock = threading.Lock()
+
+    def get(self, stage: str, key: str) -> Any:
+        """Obtain a cached result of a pipeline stage.
+
+        parameters:
+            stage -- the pipeline stage (e.g., 'classify', 'labels', 'graph', or 'suite')
+            key -- content-addressed key of the inputs of the stage
+
+        returns: the cached result if it exists, None otherwise"""
+        with self.lock:
+            value = self.load(f'{stage}:{key}')
+            counter = self.misses if value is None else self.hits
+            counter[stage] += 1
+        return value
+
+    def put(self, stage: str, key: str, value: Any):
+        """Cache the result of a pipeline stage.
+
+        parameters:
+            stage -- the pipeline stage (e.g., 'classify', 'labels', 'graph', or 'suite')
+            key -- content-addressed key of the inputs of the stage
+            value -- JSON-serializable result of the stage"""
+        with self.lock:
+            self.store(f'{stage}:{key}', value)
+
+    def statistics(self) -> dict:
+        """Summarize the usage of the cache.
+
+        returns: number of hits and misses per stage and the number of cached entries"""
+        with self.lock:
+            return {
+                'hits': dict(self.hits),
+                'misses': dict(self.misses),
+                'size': self.size()
+            }
+
+    @abstractmethod
+    def load(self, key: str) -> Any:
+        pass
+
+    @abstractmethod
+    def store(self, key: str, value: Any):
+        pass
+
+    @abstractmethod
+    def size(self) -> int:
+        pass
+
+
+class LRUCache(ResultCache):
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        """Create an in-memory cache that evicts the least recently used entry once it exceeds its maximum size.
+
+        parameters:
+            max_size -- maximum number of cached entries"""
+        super().__init__()
+        self.max_size = max_size
+        self.entries: OrderedDict = OrderedDict()
+
+    def load(self, key: str) -> Any:
+        if key not in self.entries:
+            return None
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def store(self, key: str, value: Any):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def size(self) -> int:
+        return len(self.entries)
+
+
+class SQLiteCache(ResultCache):
+
+    def __init__(self, path: str):
+        """Create a persistent cache that stores the results in a SQLite database, such that they survive restarts of the service.
+
+        parameters:
+            path -- location of the database file"""
+        super().__init__()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+        self.connection.commit()
+
+    def load(self, key: str) -> Any:
+        row = self.connection.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def store(self, key: str, value: Any):
+        self.connection.execute('INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)', (key, json.dumps(value)))
+        self.connection.commit()
+
+    def size(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Iterator
+
+DEFAULT_WORKERS = 1
+DEFAULT_QUEUE_DEPTH = 32
+
+# marks the end of an iterator advanced by a worker thread
+EXHAUSTED = object()
+
+
+class InferenceQueueFullError(Exception):
+    pass
+
+
+class InferenceExecutor:
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, queue_depth: int = DEFAULT_QUEUE_DEPTH):
+        """Create an executor that runs blocking calls to the CiRA service (e.g., forward passes of the language models) on a bounded pool of worker threads, such that the event loop of the API remains responsive.
+
+        parameters:
+            workers -- number of worker threads executing calls in parallel
+            queue_depth -- number of calls that may wait for a free worker before further calls are rejected"""
+        self.workers = workers
+        self.queue_depth = queue_depth
+
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cira-inference')
+        # every running or waiting call occupies one slot
+        self.slots = threading.BoundedSemaphore(workers + queue_depth)
+
+    async def run(self, function: Callable, *args, **kwargs) -> Any:
+        """Execute a blocking function on one of the worker threads and wait for its result without blocking the event loop.
+
+        parameters:
+            function -- the blocking function to execute
+            args -- positional arguments passed to the function
+            kwargs -- keyword arguments passed to the function
+
+        returns: the return value of the function"""
+        self.acquire()
+
+        # release the slot only once the call is actually finished, even if the awaiting request is cancelled before
+        try:
+            future = self.pool.submit(partial(function, *args, **kwargs))
+        except RuntimeError:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return await asyncio.wrap_future(future)
+
+    def stream(self, iterator: Iterator) -> 'InferenceStream':
+        """Advance a blocking iterator on the worker threads without blocking the event loop. The whole iteration occupies a single slot, which is acquired immediately (i.e., before the first item is requested), such that a full queue rejects the iteration before any item has been produced instead of interrupting it.
+
+        parameters:
+            iterator -- the blocking iterator to advance
+
+        returns: asynchronous iterator over the items of the iterator"""
+        self.acquire()
+        return InferenceStream(self, iterator)
+
+    def acquire(self):
+        """Occupy one slot of the executor or raise an InferenceQueueFullError if all workers are busy and the queue is full."""
+        if not self.slots.acquire(blocking=False):
+            raise InferenceQueueFullError(f'All {self.workers} workers are busy and {self.queue_depth} calls are already queued')
+
+    def shutdown(self):
+        """Wait for all pending calls to finish and release the worker threads."""
+        self.pool.shutdown(wait=True)
+
+
+class InferenceStream:
+
+    def __init__(self, executor: InferenceExecutor, iterator: Iterator):
+        """Create an asynchronous iterator which advances a blocking iterator on the worker threads of an executor. The stream owns a slot of the executor, which has already been acquired, and releases it once the iteration is exhausted, fails, or is closed, or once the stream is collected without ever being iterated.
+
+        parameters:
+            executor -- the executor owning the worker threads
+            iterator -- the blocking iterator to advance"""
+        self.executor = executor
+        self.iterator = iterator
+
+        self.future: Future = None
+        self.released = False
+
+    def __aiter__(self) -> 'InferenceStream':
+        return self
+
+    async def __anext__(self) -> Any:
+        if self.released:
+            raise StopAsyncIteration
+
+        try:
+            self.future = self.executor.pool.submit(next, self.iterator, EXHAUSTED)
+            item = await asyncio.wrap_future(self.future)
+        except BaseException:
+            self.release()
+            raise
+
+        if item is EXHAUSTED:
+            self.release()
+            raise StopAsyncIteration
+        return item
+
+    async def aclose(self):
+        self.release()
+
+    def __del__(self):
+        self.release()
+
+    def release(self):
+        """Release the slot of the stream (only once), but not before the step of the iteration that is currently running has finished."""
+        if self.released:
+            return
+        self.released = True
+
+        if self.future is None or self.future.done():
+            self.executor.slots.release()
+        else:
+            self.future.add_done_callback(lambda _: self.executor.slots.release())
@@ -1,6 +1,11 @@
+import os
 from abc import abstractmethod
+from typing import Any, Callable, Iterator
 
-from src.cira import CiRAConverter
+from src.cira import CiRAConverter, BATCH_SIZE
+from src.api.cache import ResultCache, fingerprint, key, CLASSIFY, LABELS, GRAPH, SUITE
+from src.api.singleflight import SingleFlight
+from src.util.onnxbackend import CLASSIFIER_FILE, LABELER_FILE, ONNX, TORCH
 
 from src.data.labels import Label
 from src.data.labels import from_dict as labels_from_dict
@@ -10,16 +15,27 @@ from src.data.graph import from_dict as graph_from_dict
 
 from src.data.test import Suite
 
+# key of the result of a sentence describing why its processing failed
+ERROR = 'error'
+
 
 class CiRAService:
     @abstractmethod
     def classify(self, sentence: str) -> tuple[bool, float]:
         pass
 
+    @abstractmethod
+    def classify_batch(self, sentences: list[str]) -> list[tuple[bool, float]]:
+        pass
+
     @abstractmethod
     def sentence_to_labels(self, sentence: str) -> list[dict]:
         pass
 
+    @abstractmethod
+    def sentences_to_labels(self, sentences: list[str]) -> list[list[dict]]:
+        pass
+
     @abstractmethod
     def sentence_to_graph(self, sentence: str, labels: list) -> dict:
         pass
@@ -28,14 +44,59 @@ class CiRAService:
     def graph_to_test(self, graph, sentence: str) -> dict:
         pass
 
+    @abstractmethod
+    def process_batch(self, sentences: list[str]) -> list[dict]:
+        pass
+
+    @abstractmethod
+    def process_stream(self, sentences: list[str]) -> Iterator[dict]:
+        pass
+
+    @abstractmethod
+    def cache_statistics(self) -> dict:
+        pass
+
 
 class CiRAServiceImpl(CiRAService):
 
-    def __init__(self, model_classification: str, model_labeling: str, use_GPU: bool = False):
+    def __init__(self, model_classification: str = None, model_labeling: str = None, use_GPU: bool = False, cache: ResultCache = None, model_bundle: str = None, quantize: str = None, backend: str = TORCH, onnx_dir: str = None):
+        """Create a CiRA service which wraps a CiRA converter.
+
+        parameters:
+            model_classification -- path to the pre-trained classification model
+            model_labeling -- path to the pre-trained labeling model
+            use_GPU -- True if the executing system can offer CUDA to accelerate the usage of the language models
+            cache -- optional cache for the results of each pipeline stage, which are reused for identical inputs
+            model_bundle -- optional path to a model bundle containing both language models, which replaces the two model paths
+            quantize -- optional quantization mode (e.g., 'int8') applied to both language models
+            backend -- inference backend of the language models, either 'torch' or 'onnx'
+            onnx_dir -- directory containing the language models exported to ONNX, required by the 'onnx' backend"""
         self.cira = CiRAConverter(
             classifier_causal_model_path=model_classification,
             converter_s2l_model_path=model_labeling,
-            use_GPU=use_GPU)
+            use_GPU=use_GPU,
+            bundle_path=model_bundle,
+            quantize=quantize,
+            backend=backend,
+            onnx_dir=onnx_dir)
+
+        # the results of the language models depend on the models, hence the model fingerprints are part of the cache keys
+        self.cache = cache
+        if backend == ONNX:
+            self.fingerprint_classification = fingerprint(os.path.join(onnx_dir, CLASSIFIER_FILE))
+            self.fingerprint_labeling = fingerprint(os.path.join(onnx_dir, LABELER_FILE))
+        elif model_bundle is not None:
+            self.fingerprint_classification = self.fingerprint_labeling = fingerprint(model_bundle)
+        else:
+            self.fingerprint_classification = fingerprint(model_classification)
+            self.fingerprint_labeling = fingerprint(model_labeling)
+        if quantize is not None:
+            # quantized models produce slightly different results than their full-precision counterparts
+            self.fingerprint_classification = f'{self.fingerprint_classification}:{quantize}'
+            self.fingerprint_labeling = f'{self.fingerprint_labeling}:{quantize}'
+
+        # coalesce concurrent calls for the same stage and inputs
+        self.flights = SingleFlight()
 
     def classify(self, sentence: str) -> tuple[bool, float]:
         """Classify a given sentence as either causal or non-causal.
@@ -46,9 +107,25 @@ class CiRAServiceImpl(CiRAService):
         returns:
             causal -- True, if the sentence is considered to be causal
             confidence -- float value between 0 and 1 representing the confidence with which the classified chose either label"""
-        causal, confidence = self.cira.classify(sentence)
+        causal, confidence = self.cached(
+            stage=CLASSIFY,
+            key=key(sentence, self.fingerprint_classification),
+            compute=lambda: self.cira.classify(sentence))
         return causal, confidence
 
+    def classify_batch(self, sentences: list[str]) -> list[tuple[bool, float]]:
+        """Classify a list of sentences as either causal or non-causal in one batch.
+
+        parameters:
+            sentences -- list of natural language sentences
+
+        returns: list containing the classification (causal, confidence) of each sentence in the order of the input list"""
+        classifications: list = self.cached_batch(
+            stage=CLASSIFY,
+            keys=[key(sentence, self.fingerprint_classification) for sentence in sentences],
+            compute=lambda indices: self.cira.classify_batch([sentences[index] for index in indices]))
+        return [tuple(classification) for classification in classifications]
+
     def sentence_to_labels(self, sentence: str) -> list[dict]:
         """Generate the causal labels for a sentence.
 
@@ -57,9 +134,24 @@ class CiRAServiceImpl(CiRAService):
 
         returns: list of labels serialized to dictionaries
         """
-        labels: list[Label] = self.cira.label(sentence)
+        labels_serialized: list[dict] = self.cached(
+            stage=LABELS,
+            key=key(sentence, self.fingerprint_labeling),
+            compute=lambda: [label.to_dict() for label in self.cira.label(sentence)])
+        return labels_serialized
+
+    def sentences_to_labels(self, sentences: list[str]) -> list[list[dict]]:
+        """Generate the causal labels for a list of sentences in one batch.
 
-        labels_serialized: list[dict] = [label.to_dict() for label in labels]
+        parameters:
+            sentences -- list of natural language sentences
+
+        returns: list of labels serialized to dictionaries for each sentence in the order of the input list
+        """
+        labels_serialized: list[list[dict]] = self.cached_batch(
+            stage=LABELS,
+            keys=[key(sentence, self.fingerprint_labeling) for sentence in sentences],
+            compute=lambda indices: [[label.to_dict() for label in sentence_labels] for sentence_labels in self.cira.label_batch([sentences[index] for index in indices])])
         return labels_serialized
 
     def sentence_to_graph(self, sentence: str, labels: list) -> dict:
@@ -71,11 +163,16 @@ class CiRAServiceImpl(CiRAService):
 
         returns: graph serialized to a dictionary
         """
-        labels_deserialized: list[Label] = self.get_deserialized_labels(sentence, labels)
+        # a graph generated from given labels only depends on these labels, otherwise on the labeling model
+        labels_missing = (labels is None) or (len(labels) == 0)
+        labels_key = self.fingerprint_labeling if labels_missing else [label if type(label) == dict else label.to_dict() for label in labels]
 
-        graph: Graph = self.cira.graph(sentence, labels_deserialized)
+        def generate_graph() -> dict:
+            labels_deserialized: list[Label] = self.get_deserialized_labels(sentence, labels)
+            graph: Graph = self.cira.graph(sentence, labels_deserialized)
+            return graph.to_dict()
 
-        graph_serialized: dict = graph.to_dict()
+        graph_serialized: dict = self.cached(stage=GRAPH, key=key(sentence, labels_key), compute=generate_graph)
         return graph_serialized
 
     def get_deserialized_labels(self, sentence: str, labels: list) -> list[Label]:
@@ -88,11 +185,15 @@ class CiRAServiceImpl(CiRAService):
         returns: list of actual labels representing the causal relationship implied by the sentence"""
         labels_missing = (labels is None) or (len(labels) == 0)
         if labels_missing:
+            if self.cache is not None:
+                # reuse the cached labels of the sentence if available
+                return labels_from_dict(self.sentence_to_labels(sentence))
             return self.cira.label(sentence)
 
         labels_serialized = (type(labels[0]) == dict)
         if labels_serialized:
-            return labels_from_dict(labels)
+            # labels supplied by a client must not contain duplicate or dangling references
+            return labels_from_dict(labels, strict=True)
 
         return labels
 
@@ -104,18 +205,177 @@ class CiRAServiceImpl(CiRAService):
 
         returns: test suite serialized to a dictionary
         """
+        # a test suite generated from a given graph only depends on this graph, otherwise on the sentence and the labeling model
         if not graph:
-            graph = self.sentence_to_graph(sentence, labels=[])
+            suite_key = key(sentence, self.fingerprint_labeling)
+        else:
+            suite_key = key(graph if type(graph) == dict else graph.to_dict())
 
-        graph_serialized = (type(graph) == dict)
-        if graph_serialized:
-            graph: Graph = graph_from_dict(graph)
+        def generate_suite() -> dict:
+            ceg = graph
+            if not ceg:
+                ceg = self.sentence_to_graph(sentence, labels=[])
 
-        suite: Suite = self.cira.testsuite(ceg=graph)
+            graph_serialized = (type(ceg) == dict)
+            if graph_serialized:
+                ceg: Graph = graph_from_dict(ceg)
 
-        suite_serialized: dict = suite.to_dict()
+            suite: Suite = self.cira.testsuite(ceg=ceg)
+            return suite.to_dict()
+
+        suite_serialized: dict = self.cached(stage=SUITE, key=suite_key, compute=generate_suite)
         return suite_serialized
 
+    def process_batch(self, sentences: list[str]) -> list[dict]:
+        """Run the whole pipeline (classification, labeling, graph generation, and test suite generation) on a list of sentences. Sentences that are classified as non-causal are not processed any further.
+
+        parameters:
+            sentences -- list of natural language sentences
+
+        returns: one result per sentence (in the order of the input list) containing the sentence, its classification, and - if the sentence is causal - its labels, graph, and test suite serialized to dictionaries, as well as an error message if the graph or test suite of the sentence could not be generated (None otherwise)
+        """
+        return list(self.process_stream(sentences))
+
+    def process_stream(self, sentences: list[str]) -> Iterator[dict]:
+        """Run the whole pipeline on a list of sentences like process_batch, but yield the serialized result of each sentence as soon as it is available. Sentences whose results are cached for every stage are not processed again.
+
+        parameters:
+            sentences -- list of natural language sentences
+
+        returns: iterator over one result per sentence (in the order of the input list) as described in process_batch
+        """
+        for start in range(0, len(sentences), BATCH_SIZE):
+            batch: list[str] = sentences[start:start+BATCH_SIZE]
+
+            # only process the sentences which are not completely cached
+            cached_results: list[dict] = [self.get_cached_result(sentence) for sentence in batch]
+            missing: list[str] = [sentence for sentence, result in zip(batch, cached_results) if result is None]
+            classifications: list[tuple[bool, float]] = self.cira.classify_batch(missing) if len(missing) > 0 else []
+
+            # only label the causal sentences
+            causal_sentences: list[str] = [sentence for sentence, (causal, _) in zip(missing, classifications) if causal]
+            causal_labels: Iterator[list[Label]] = iter(self.cira.label_batch(causal_sentences) if len(causal_sentences) > 0 else [])
+            processed: Iterator = zip(missing, classifications)
+
+            for cached_result in cached_results:
+                if cached_result is not None:
+                    yield cached_result
+                    continue
+
+                sentence, (causal, confidence) = next(processed)
+                result: dict = {'sentence': sentence, 'causal': causal, 'confidence': confidence, LABELS: None, GRAPH: None, SUITE: None, ERROR: None}
+                if causal:
+                    labels: list[Label] = next(causal_labels)
+                    result[LABELS] = [label.to_dict() for label in labels]
+                    try:
+                        _, graph, suite = self.cira.process_labeled(sentence, labels)
+                        result[GRAPH], result[SUITE] = graph.to_dict(), suite.to_dict()
+                    except Exception as exception:
+                        # a sentence whose labels cannot be converted does not affect the other sentences of the batch
+                        result[ERROR] = f'{type(exception).__name__}: {exception}'
+
+                if result[ERROR] is None:
+                    self.put_cached_result(result)
+                yield result
+
+    def get_cached_result(self, sentence: str) -> dict:
+        """Assemble the result of the whole pipeline for a sentence from the cached results of each stage.
+
+        parameters:
+            sentence -- single natural language sentence
+
+        returns: the result as described in process_batch if every relevant stage is cached, None otherwise"""
+        if self.cache is None:
+            return None
+
+        classification = self.cache.get(CLASSIFY, key(sentence, self.fingerprint_classification))
+        if classification is None:
+            return None
+
+        causal, confidence = classification
+        result: dict = {'sentence': sentence, 'causal': causal, 'confidence': confidence, LABELS: None, GRAPH: None, SUITE: None, ERROR: None}
+        if causal:
+            # labels, graph, and test suite of a sentence processed as a whole are all derived from the labeling model
+            sentence_key = key(sentence, self.fingerprint_labeling)
+            for stage in [LABELS, GRAPH, SUITE]:
+                result[stage] = self.cache.get(stage, sentence_key)
+                if result[stage] is None:
+                    return None
+        return result
+
+    def put_cached_result(self, result: dict):
+        """Cache the result of the whole pipeline for a sentence per stage.
+
+        parameters:
+            result -- the result as described in process_batch"""
+        if self.cache is None:
+            return
+
+        sentence: str = result['sentence']
+        self.cache.put(CLASSIFY, key(sentence, self.fingerprint_classification), (result['causal'], result['confidence']))
+        if result['causal']:
+            sentence_key = key(sentence, self.fingerprint_labeling)
+            for stage in [LABELS, GRAPH, SUITE]:
+                self.cache.put(stage, sentence_key, result[stage])
+
+    def cache_statistics(self) -> dict:
+        """Summarize the usage of the result cache.
+
+        returns: number of hits and misses per stage and the number of cached entries"""
+        if self.cache is None:
+            return {'hits': {}, 'misses': {}, 'size': 0}
+        return self.cache.statistics()
+
+    def cached(self, stage: str, key: str, compute: Callable[[], Any]) -> Any:
+        """Obtain the result of a pipeline stage from the cache or compute (and cache) it if it is missing. Concurrent calls for the same stage and inputs share one computation.
+
+        parameters:
+            stage -- the pipeline stage
+            key -- content-addressed key of the inputs of the stage
+            compute -- function computing the result of the stage
+
+        returns: the result of the stage"""
+        def lookup() -> Any:
+            value = None if self.cache is None else self.cache.get(stage, key)
+            if value is None:
+                value = compute()
+                if self.cache is not None:
+                    self.cache.put(stage, key, value)
+            return value
+
+        return self.flights.do(f'{stage}:{key}', lookup)
+
+    def cached_batch(self, stage: str, keys: list[str], compute: Callable[[list[int]], list]) -> list:
+        """Obtain the results of a pipeline stage for a batch of inputs from the cache and compute (and cache) all missing results in one batch. Identical inputs within the batch are only computed once, and inputs which are already being computed by a concurrent call are not computed again but awaited.
+
+        parameters:
+            stage -- the pipeline stage
+            keys -- content-addressed keys of the inputs of the stage
+            compute -- function computing the results of the stage for the inputs at the given indices
+
+        returns: the results of the stage in the order of the keys"""
+        values: list = [None if self.cache is None else self.cache.get(stage, k) for k in keys]
+
+        # group the indices of all missing results by the key of their flight
+        missing: dict[str, list[int]] = {}
+        for index, value in enumerate(values):
+            if value is None:
+                missing.setdefault(f'{stage}:{keys[index]}', []).append(index)
+
+        def compute_missing(flights: list[str]) -> list:
+            computed: list = compute([missing[flight][0] for flight in flights])
+            if self.cache is not None:
+                for flight, value in zip(flights, computed):
+                    self.cache.put(stage, keys[missing[flight][0]], value)
+            return computed
+
+        if len(missing) > 0:
+            computed: list = self.flights.do_batch(list(missing.keys()), compute_missing)
+            for indices, value in zip(missing.values(), computed):
+                for index in indices:
+                    values[index] = value
+        return values
+
 
 class CiraServiceMock(CiRAService):
 
@@ -125,9 +385,15 @@ class CiraServiceMock(CiRAService):
     def classify(self, sentence) -> tuple[bool, float]:
         return (True, 0.99)
 
+    def classify_batch(self, sentences: list[str]) -> list[tuple[bool, float]]:
+        return [self.classify(sentence) for sentence in sentences]
+
     def sentence_to_labels(self, sentence: str) -> list[dict]:
         return [{'id': 'L1', 'name': 'Variable', 'begin': 10, 'end': 20, 'parent': None}]
 
+    def sentences_to_labels(self, sentences: list[str]) -> list[list[dict]]:
+        return [self.sentence_to_labels(sentence) for sentence in sentences]
+
     def sentence_to_graph(self, sentence: str, labels: list) -> dict:
         return {
             'nodes': [
@@ -144,3 +410,22 @@ class CiraServiceMock(CiRAService):
             'expected': [{'id': 'c', 'variable': 'the system', 'condition': 'shuts down'}],
             'cases': [{'c': True, 'e': True}, {'c': False, 'e': False}]
         }
+
+    def process_batch(self, sentences: list[str]) -> list[dict]:
+        return list(self.process_stream(sentences))
+
+    def process_stream(self, sentences: list[str]) -> Iterator[dict]:
+        for sentence in sentences:
+            causal, confidence = self.classify(sentence)
+            yield {
+                'sentence': sentence,
+                'causal': causal,
+                'confidence': confidence,
+                'labels': self.sentence_to_labels(sentence),
+                'graph': self.sentence_to_graph(sentence, labels=[]),
+                'suite': self.graph_to_test(graph=None, sentence=sentence),
+                'error': None
+            }
+
+    def cache_statistics(self) -> dict:
+        return {'hits': {}, 'misses': {}, 'size': 0}
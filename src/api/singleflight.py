@@ -0,0 +1,87 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+
+class SingleFlight:
+
+    def __init__(self):
+        """Create a coordinator that coalesces concurrent calls with the same key into one computation, whose result is shared with every caller."""
+        self.lock = threading.Lock()
+        self.calls: dict[str, Future] = {}
+
+    def do(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Compute a value unless a computation for the same key is already in flight, in which case wait for and return the result of that computation.
+
+        parameters:
+            key -- identifier of the computation (e.g., the pipeline stage and a hash of its inputs)
+            compute -- function computing the value
+
+        returns: the computed value"""
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = Future()
+                self.calls[key] = call
+
+        if not leader:
+            # another caller is already computing the value
+            return call.result()
+
+        try:
+            value = compute()
+            call.set_result(value)
+            return value
+        except Exception as exception:
+            call.set_exception(exception)
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+
+    def do_batch(self, keys: list[str], compute: Callable[[list[str]], list]) -> list:
+        """Compute the values of several distinct keys in one call, except for the keys whose computation is already in flight, for which the result of that computation is awaited instead. The computation of the remaining keys is in flight until it is finished, such that concurrent calls for these keys wait for it.
+
+        parameters:
+            keys -- distinct identifiers of the computations
+            compute -- function computing the values of a list of keys in the same order
+
+        returns: the values in the order of the keys"""
+        led: list[str] = []
+        calls: dict[str, Future] = {}
+        with self.lock:
+            for key in keys:
+                call = self.calls.get(key)
+                if call is None:
+                    call = Future()
+                    self.calls[key] = call
+                    led.append(key)
+                calls[key] = call
+
+        if len(led) > 0:
+            try:
+                values: list = compute(led)
+                if len(values) != len(led):
+                    raise ValueError(f'Computing {len(led)} keys returned {len(values)} values')
+            except Exception as exception:
+                for key in led:
+                    calls[key].set_exception(exception)
+                raise
+            else:
+                for key, value in zip(led, values):
+                    calls[key].set_result(value)
+            finally:
+                with self.lock:
+                    for key in led:
+                        del self.calls[key]
+
+        # the computations led by other callers are awaited only after the own computation is finished, hence two callers never wait for each other
+        return [calls[key].result() for key in keys]
+
+    def in_flight(self) -> int:
+        """Determine the number of computations currently in flight.
+
+        returns: number of distinct keys currently being computed"""
+        with self.lock:
+            return len(self.calls)
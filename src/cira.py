@@ -1,35 +1,53 @@
 
+import os
 from typing import Tuple
 
 # classifiers
-from src.classifiers.causalitydetection.causalclassifier import CausalClassifier
+from src.classifiers.causalitydetection.causalclassifier import CausalClassifier, BATCH_SIZE
 
 # converters
 from src.converters.sentencetolabels.labeler import Labeler
 from src.converters.labelstograph.graphconverter import GraphConverter
 from src.converters.labelstograph.eventresolver import SimpleResolver
-from src.converters.graphtotestsuite.testsuiteconverter import convert as convert_graph_to_testsuite
+from src.converters.graphtotestsuite.testsuiteconverter import convert as convert_graph_to_testsuite, EXHAUSTIVE
 
 from src.data.labels import Label
 from src.data.graph import Graph
 from src.data.test import Suite
 
+from src.util.bundle import ModelBundle
+from src.util.onnxbackend import BACKENDS, CLASSIFIER_FILE, LABELER_FILE, ONNX, TORCH
+
 
 class CiRAConverter():
 
-    def __init__(self, classifier_causal_model_path: str, converter_s2l_model_path: str, use_GPU: bool = False):
+    def __init__(self, classifier_causal_model_path: str = None, converter_s2l_model_path: str = None, use_GPU: bool = False, from_config: bool = True, bundle_path: str = None, quantize: str = None, backend: str = TORCH, onnx_dir: str = None):
         """Create a converter that exhibits the CiRA functionality (classification, labeling, CEG generation, test case generation).
 
         parameters:
             classifier_causal_model_path -- path to the pre-trained classification model (https://zenodo.org/record/5159501#.Ytq28ITP3-g)
             converter_s2l_model_path -- path to the pre-trained labeling model (https://zenodo.org/record/5550387#.Ytq3QYTP3-g) (use the model named roberta_dropout_linear_layer_multilabel.ckpt for optimal performance)
             use_GPU -- True if the executing system can offer CUDA to accelerate the usage of the language models
+            from_config -- True if the architectures of the language models shall be built from their configuration only, such that only the weights of the fine-tuned models are loaded (False additionally loads the weights of the pre-trained base models, which are overwritten immediately)
+            bundle_path -- path to a model bundle containing both language models and their tokenizers (see src.export_bundle), which replaces the two model paths and is loaded via a memory map without contacting the model hub
+            quantize -- optional quantization mode (e.g., 'int8') applied to the linear layers of both language models, which reduces their memory footprint and accelerates the inference on CPUs (not applicable in combination with use_GPU)
+            backend -- inference backend of the language models, either 'torch' (default) or 'onnx' to execute the models exported to ONNX by ONNX Runtime on the CPU
+            onnx_dir -- directory containing the language models exported to ONNX (see src.export_onnx), required by the 'onnx' backend
         """
+        if backend not in BACKENDS:
+            raise ValueError(f'Unsupported backend "{backend}" (expected one of {BACKENDS})')
+        if backend == ONNX and onnx_dir is None:
+            raise ValueError('The ONNX backend requires the directory containing the exported models')
+
+        bundle = ModelBundle(bundle_path) if bundle_path is not None else None
+        onnx_classifier = os.path.join(onnx_dir, CLASSIFIER_FILE) if backend == ONNX else None
+        onnx_labeler = os.path.join(onnx_dir, LABELER_FILE) if backend == ONNX else None
+
         # initialize classifiers
-        self.classifier_causal = CausalClassifier(model_path=classifier_causal_model_path)
+        self.classifier_causal = CausalClassifier(model_path=classifier_causal_model_path, from_config=from_config, bundle=bundle, quantize=quantize, onnx_model=onnx_classifier)
 
         # initialize converters
-        self.converter_sentencetolabel = Labeler(model_path=converter_s2l_model_path, useGPU=use_GPU)
+        self.converter_sentencetolabel = Labeler(model_path=converter_s2l_model_path, useGPU=use_GPU, from_config=from_config, bundle=bundle, quantize=quantize, onnx_model=onnx_labeler)
         self.converter_labeltograph = GraphConverter(eventresolver=SimpleResolver())
 
     def classify(self, sentence: str) -> Tuple[bool, float]:
@@ -42,6 +60,17 @@ class CiRAConverter():
         causal, confidence = self.classifier_causal.classify(sentence)
         return (causal, confidence)
 
+    def classify_batch(self, sentences: list[str], batch_size: int = BATCH_SIZE) -> list[Tuple[bool, float]]:
+        """Classify a list of natural language sentences regarding whether they are causal or not.
+
+        parameters:
+            sentences -- list of natural language sentences in English
+            batch_size -- maximum number of sentences classified in one forward pass
+
+        returns: list of classifications whether each sentence is causal and the confidence of the classifier, in the order of the input sentences"""
+        classifications: list[Tuple[bool, float]] = self.classifier_causal.classify_batch(sentences, batch_size=batch_size)
+        return classifications
+
     def label(self, sentence: str) -> list[Label]:
         """Label each token contained in a causal, natural language sentence with its respective role in the causal relationship.
 
@@ -53,6 +82,17 @@ class CiRAConverter():
         labels: list[Label] = self.converter_sentencetolabel.label(sentence)
         return labels
 
+    def label_batch(self, sentences: list[str]) -> list[list[Label]]:
+        """Label each token contained in a list of causal, natural language sentences with its respective role in the causal relationship.
+
+        parameters:
+            sentences -- list of natural language sentences in English
+
+        returns: A list of labels for each sentence, in the order of the input sentences
+        """
+        labels: list[list[Label]] = self.converter_sentencetolabel.label_batch(sentences)
+        return labels
+
     def graph(self, sentence: str, labels: list[Label]) -> Graph:
         """Convert a sentence and a list of labels to a cause-effect graph
 
@@ -65,15 +105,16 @@ class CiRAConverter():
         graph: Graph = self.converter_labeltograph.generate_graph(sentence, labels)
         return graph
 
-    def testsuite(self, ceg: Graph) -> Suite:
+    def testsuite(self, ceg: Graph, strategy: str = EXHAUSTIVE) -> Suite:
         """Convert a cause-effect graph into a test suite containing the minimal set of test cases necessary to assert that the requirement is met.
 
         parameters:
             ceg -- cause-effect graph
+            strategy -- strategy to select the test cases (one of STRATEGIES in src.converters.graphtotestsuite.testsuiteconverter), e.g., 'mcdc' for a small test suite satisfying modified condition/decision coverage
 
         returns: a minimal test suite.
         """
-        suite: Suite = convert_graph_to_testsuite(ceg)
+        suite: Suite = convert_graph_to_testsuite(ceg, strategy=strategy)
         return suite
 
     def process(self, sentence: str) -> Tuple[list[Label], Graph, Suite]:
@@ -85,8 +126,18 @@ class CiRAConverter():
         returns: Tuple containing (a) a list of labels, (b) a cause-effect graph, and (c) a minimal test suite.
         """
         labels: list[Label] = self.converter_sentencetolabel.label(sentence)
+        return self.process_labeled(sentence, labels)
+
+    def process_labeled(self, sentence: str, labels: list[Label]) -> Tuple[list[Label], Graph, Suite]:
+        """Process a causal, natural language sentence that has already been labeled and generate (a) a cause-effect graph and (b) a minimal test suite from it.
+
+        parameters:
+            sentence -- natural language sentence in English
+            labels -- list of labels representing the role of each token in the sentence in respect to the causal relationship
+
+        returns: Tuple containing (a) the list of labels, (b) a cause-effect graph, and (c) a minimal test suite.
+        """
         graph: Graph = self.converter_labeltograph.generate_graph(sentence, labels)
         suite: Suite = convert_graph_to_testsuite(graph)
 
         return (labels, graph, suite)
-
@@ -1,11 +1,16 @@
+import json
 from typing import Tuple
 
 import numpy as np
 import torch
 import torch.nn.functional as F
-from transformers import BertTokenizer
+from tokenizers import Tokenizer
+from transformers import BertConfig, BertTokenizer, BertTokenizerFast
 
 from src.classifiers.causalitydetection.classificationmodel import CausalClassificationModel
+from src.util.bundle import CLASSIFIER, ModelBundle
+from src.util.onnxbackend import OnnxModel
+from src.util.quantization import quantize as quantize_model
 
 RANDOM_SEED = 42
 np.random.seed(RANDOM_SEED)
@@ -18,25 +23,58 @@ PRE_TRAINED_MODEL_NAME = 'bert-base-cased'
 DEVICE_CPU = 'cpu'
 DEVICE_GPU = 'cuda:0'
 TENSOR_TYPE_PYTORCH = 'pt'
+MAX_LENGTH = 128
+BATCH_SIZE = 32
 
 class CausalClassifier:
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str = None, from_config: bool = True, bundle: ModelBundle = None, quantize: str = None, onnx_model: str = None):
         """Create a causal detector which wraps the pre-trained classification model.
 
         parameters:
-            path -- path to the binary file of the pre-trained model"""
-
-        self.device = torch.device(DEVICE_GPU if torch.cuda.is_available() else DEVICE_CPU)
-        self.tokenizer = BertTokenizer.from_pretrained(PRE_TRAINED_MODEL_NAME)
-
-        self.model = CausalClassificationModel(len(CLASS_NAMES))
-        if torch.cuda.is_available():
-            self.model.load_state_dict(torch.load(model_path))
+            path -- path to the binary file of the pre-trained model
+            from_config -- True if the BERT architecture shall only be built from its configuration instead of loading the weights of the pre-trained BERT model, which are overwritten by the fine-tuned weights anyway
+            bundle -- model bundle containing the tokenizer, configuration, and weights of the classification model (replaces the model path)
+            quantize -- optional quantization mode (e.g., 'int8') applied to the linear layers of the model, which restricts the inference to the CPU
+            onnx_model -- optional path to the classification model exported to ONNX (see src.export_onnx), which is then executed by ONNX Runtime on the CPU instead of PyTorch (replaces the model path)"""
+
+        # quantized models and ONNX Runtime sessions are only executed on the CPU
+        on_cpu = quantize is not None or onnx_model is not None
+        self.device = torch.device(DEVICE_GPU if torch.cuda.is_available() and not on_cpu else DEVICE_CPU)
+
+        if bundle is not None:
+            # load everything from the bundle without contacting the model hub or unpickling the weights
+            serialized_tokenizer = bundle.tokenizer(CLASSIFIER)
+            # the fast tokenizer replaces the normalizer of the tokenizer object unless its settings are passed explicitly (which would lowercase the input of the cased model)
+            normalizer = json.loads(serialized_tokenizer).get('normalizer') or {}
+            self.tokenizer = BertTokenizerFast(
+                tokenizer_object=Tokenizer.from_str(serialized_tokenizer),
+                do_lower_case=normalizer.get('lowercase', False),
+                strip_accents=normalizer.get('strip_accents'),
+                tokenize_chinese_chars=normalizer.get('handle_chinese_chars', True))
+        else:
+            self.tokenizer = BertTokenizer.from_pretrained(PRE_TRAINED_MODEL_NAME)
+
+        if onnx_model is not None:
+            self.model = OnnxModel(onnx_model)
+        elif bundle is not None:
+            config = BertConfig.from_dict(bundle.config(CLASSIFIER))
+            self.model = CausalClassificationModel(len(CLASS_NAMES), config=config)
+            self.model.load_state_dict(bundle.state_dict(CLASSIFIER))
         else:
-            self.model.load_state_dict(torch.load(model_path, map_location=DEVICE_CPU))
+            self.model = CausalClassificationModel(len(CLASS_NAMES), pre_trained_model_name=PRE_TRAINED_MODEL_NAME, from_pretrained=not from_config)
+            if self.device.type == DEVICE_CPU:
+                self.model.load_state_dict(torch.load(model_path, map_location=DEVICE_CPU))
+            else:
+                self.model.load_state_dict(torch.load(model_path))
 
-        self.model = self.model.to(self.device)
+        if onnx_model is None:
+            self.model = self.model.to(self.device)
 
+            # the model is only used for inference, which deactivates the dropout layer
+            self.model.eval()
+            self.model = quantize_model(self.model, mode=quantize)
+
+    @torch.inference_mode()
     def classify(self, sentence: str) -> Tuple[bool, float]:
         """Classify a natural language sentence regarding whether it is causal or not.
 
@@ -48,7 +86,7 @@ class CausalClassifier:
         # encode input text
         encoded_text = self.tokenizer.encode_plus(
             sentence,
-            max_length=128,
+            max_length=MAX_LENGTH,
             add_special_tokens=True,
             return_token_type_ids=False,
             padding='max_length',
@@ -69,3 +107,41 @@ class CausalClassifier:
         confidence = torch.max(probs, dim=1)[0].item()
         return (is_causal, confidence)
 
+    @torch.inference_mode()
+    def classify_batch(self, sentences: list[str], batch_size: int = BATCH_SIZE) -> list[Tuple[bool, float]]:
+        """Classify a list of natural language sentences regarding whether they are causal or not. The sentences are processed by the classification model in batches of the given size, where each batch is only padded to its longest sentence, which avoids one forward pass per sentence.
+
+        parameters:
+            sentences -- list of natural language sentences in English
+            batch_size -- maximum number of sentences processed by one forward pass of the classification model
+
+        returns: list containing the classification whether the sentence is causal and the confidence of the classifier for each sentence (in the order of the input list)"""
+        if len(sentences) == 0:
+            return []
+
+        classifications: list[Tuple[bool, float]] = []
+        for start in range(0, len(sentences), batch_size):
+            # encode the input texts of the current batch, padded only to its longest sentence
+            encoded_texts = self.tokenizer(
+                sentences[start:start+batch_size],
+                max_length=MAX_LENGTH,
+                add_special_tokens=True,
+                return_token_type_ids=False,
+                padding='longest',
+                return_attention_mask=True,
+                return_tensors=TENSOR_TYPE_PYTORCH,
+                truncation=True
+            )
+
+            # apply classification model to the current batch
+            input_ids = encoded_texts['input_ids'].to(self.device)
+            attention_mask = encoded_texts['attention_mask'].to(self.device)
+            output = self.model(input_ids, attention_mask)
+            probs = F.softmax(output, dim=1)
+            confidences, predictions = torch.max(probs, dim=1)
+
+            # collect both the classification and the confidence of each sentence
+            for prediction, confidence in zip(predictions.tolist(), confidences.tolist()):
+                classifications.append((CLASS_NAMES[prediction] == CAUSAL, confidence))
+
+        return classifications
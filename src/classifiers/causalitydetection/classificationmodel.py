@@ -1,11 +1,18 @@
 import torch
-from transformers import BertModel
+from transformers import BertConfig, BertModel
 
 
 class CausalClassificationModel(torch.nn.Module):
-    def __init__(self, n_classes: int, pre_trained_model_name: str='bert-base-cased'):
+    def __init__(self, n_classes: int, pre_trained_model_name: str='bert-base-cased', from_pretrained: bool=True, config: BertConfig=None):
         super(CausalClassificationModel, self).__init__()
-        self.bert = BertModel.from_pretrained(pre_trained_model_name)
+        if config is not None:
+            # build the architecture from a given configuration without resolving the pre-trained model
+            self.bert = BertModel(config)
+        elif from_pretrained:
+            self.bert = BertModel.from_pretrained(pre_trained_model_name)
+        else:
+            # only build the architecture, as the weights are loaded from a fine-tuned model afterwards
+            self.bert = BertModel(BertConfig.from_pretrained(pre_trained_model_name))
         self.drop = torch.nn.Dropout(p=0.3)
         self.out = torch.nn.Linear(self.bert.config.hidden_size, n_classes)
 
@@ -0,0 +1,85 @@
+from src.data.bdd import BDD
+from src.data.graph import EventNode, Node
+
+
+def get_mcdc_configurations(root: Node) -> list[tuple[dict, bool]]:
+    """Generate a small set of configurations of the leaf (Event) nodes of a cause tree which satisfies modified condition/decision coverage (MC/DC): for every leaf node, the set contains a pair of configurations which only differ in the value of that leaf node and evaluate the root to different values, showing that the leaf node independently affects the outcome. The pairs are selected greedily: every other leaf node takes the same canonical value in all pairs whenever possible, such that the pairs share as many configurations as possible (e.g., a conjunction of n leaf nodes yields n+1 instead of 2n configurations).
+
+    parameters:
+        root -- root node of the cause tree
+
+    returns: list of unique configurations mapping leaf node ids to boolean values together with the value of the root node, where all configurations evaluating the root to True precede the ones evaluating it to False"""
+    canonical_configurations: dict[tuple[str, bool], dict] = {}
+    configurations: dict[frozenset, tuple[dict, bool]] = {}
+    for leaf in [node for node in root.flatten() if type(node) == EventNode]:
+        # walk up from the leaf node to the root and fix the siblings at each junctor to their non-controlling value (true for a conjunction, false for a disjunction), such that the value of the leaf node propagates to the root
+        fixed: dict = {}
+        node = leaf
+        while node is not root:
+            path_edge = node.outgoing[0]
+            parent = path_edge.target
+            for sibling in parent.incoming:
+                if sibling is not path_edge:
+                    fixed.update(get_canonical_configuration(sibling.origin, parent.conjunction != sibling.negated, canonical_configurations))
+            node = parent
+
+        for value in [True, False]:
+            configuration = fixed | {leaf.id: value}
+            key = frozenset(configuration.items())
+            if key not in configurations:
+                configurations[key] = (configuration, root.evaluate(configuration))
+
+    return [configuration for configuration in configurations.values() if configuration[1]] + \
+        [configuration for configuration in configurations.values() if not configuration[1]]
+
+
+def get_canonical_configuration(node: Node, expected_outcome: bool, canonical_configurations: dict) -> dict:
+    """Determine one canonical configuration of the leaf nodes connected to a node which produces the expected outcome, which is the first configuration generated by get_testcase_configuration.
+
+    parameters:
+        node -- node whose configuration is requested
+        expected_outcome -- the boolean value the node is expected to have
+        canonical_configurations -- memo of the canonical configurations determined so far, keyed by node id and expected outcome
+
+    returns: configuration mapping leaf (Event) node ids to boolean values"""
+    key = (node.id, expected_outcome)
+    if key not in canonical_configurations:
+        if type(node) == EventNode:
+            configuration = {node.id: expected_outcome}
+        else:
+            configuration = {}
+            for index, inc in enumerate(node.incoming):
+                # for a conjunction to be true or a disjunction to be false, every incoming node has to have the expected outcome, otherwise the first incoming node is the odd one
+                inc_outcome = (expected_outcome != inc.negated) if (expected_outcome == node.conjunction or index == 0) else (expected_outcome == inc.negated)
+                configuration.update(get_canonical_configuration(inc.origin, inc_outcome, canonical_configurations))
+        canonical_configurations[key] = configuration
+    return canonical_configurations[key]
+
+
+def get_mcdc_configurations_from_decision_diagram(root: Node) -> list[tuple[dict, bool]]:
+    """Generate a set of configurations satisfying modified condition/decision coverage like get_mcdc_configurations, but derive the pair of every leaf (Event) node from the binary decision diagram of the cause tree: the configurations of all other leaf nodes under which the leaf node determines the outcome are exactly the ones satisfying the boolean difference of the function with respect to that leaf node. This does not rely on the tree structure and requires a number of diagram operations linear in the number of leaf nodes. Leaf nodes which cannot affect the outcome at all are skipped, and all other leaf nodes prefer their value in the previous pair, such that the pairs share configurations.
+
+    parameters:
+        root -- root node of the cause tree
+
+    returns: list of unique configurations mapping leaf node ids to boolean values together with the value of the root node, where all configurations evaluating the root to True precede the ones evaluating it to False"""
+    bdd = BDD()
+    function = bdd.compile(root)
+
+    configurations: dict[frozenset, tuple[dict, bool]] = {}
+    fixed = None
+    for variable in bdd.variables:
+        difference = bdd.xor(bdd.restrict(function, variable, True), bdd.restrict(function, variable, False))
+        if not bdd.is_satisfiable(difference):
+            continue
+
+        # prefer the values of the previous pair, such that consecutive pairs share configurations
+        fixed = bdd.pick(difference, preference=fixed)
+        for value in [True, False]:
+            configuration = fixed | {variable: value}
+            key = frozenset(configuration.items())
+            if key not in configurations:
+                configurations[key] = (configuration, bdd.evaluate(function, configuration))
+
+    return [configuration for configuration in configurations.values() if configuration[1]] + \
+        [configuration for configuration in configurations.values() if not configuration[1]]
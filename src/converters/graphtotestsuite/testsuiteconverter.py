@@ -1,13 +1,77 @@
-from src.data.graph import Graph, EventNode
-from src.data.test import Suite, Parameter
+import json
+from typing import Iterator, TextIO
 
-def convert(graph: Graph) -> Suite:
+from src.converters.graphtotestsuite.mcdc import get_mcdc_configurations, get_mcdc_configurations_from_decision_diagram
+from src.data.graph import ConfigurationCache, Graph, EventNode
+from src.data.test import CaseMasks, Suite, Parameter, to_case_masks
+
+# strategies to select the test cases of a test suite
+EXHAUSTIVE = 'exhaustive'
+MCDC = 'mcdc'
+DECISION_DIAGRAM = 'bdd'
+STRATEGIES = [EXHAUSTIVE, MCDC, DECISION_DIAGRAM]
+
+def convert(graph: Graph, compact: bool = False, cache: ConfigurationCache = None, strategy: str = EXHAUSTIVE) -> Suite:
     """Generate a test suite from a cause-effect graph. The test suite contains one parameter per event node (cause-nodes become input-/condition-parameters, effect-nodes become (expected) outcome parameters) and a minimal list of test cases necessary to evaluate the root cause node both to true and false, effectively covering all relevant, unique configurations of parameters which would assert that a system exhibits the behavior entailed by the cause-effect graph.
 
     parameters: 
         graph -- a cause-effect graph representing a causal sentence
+        compact -- True if the test cases shall be generated as bitmasks and held in their compact representation (CaseMasks), which is only expanded into dictionaries on access (e.g., when serializing the test suite)
+        cache -- optional, empty cache memoizing the configurations of the nodes during the generation (a new one is used if omitted), which can be passed to inspect its reuse rate afterwards
+        strategy -- strategy to select the test cases (one of STRATEGIES): either all non-redundant configurations evaluating the root node to true and false (EXHAUSTIVE) or a small set of configurations satisfying modified condition/decision coverage, where each cause node is shown to independently affect the outcome (MCDC), or the same kind of test suite derived from the binary decision diagram of the cause tree, which does not rely on its tree structure (DECISION_DIAGRAM)
 
     returns: a minimal test suite that describes how to assert that a system exhibits the behavior entailed by the graph."""
+    if strategy not in STRATEGIES:
+        raise ValueError(f'Unsupported test case selection strategy "{strategy}" (expected one of {STRATEGIES})')
+
+    parameters_map, conditions, expected, effects = get_parameters(graph=graph)
+    cache = ConfigurationCache() if cache is None else cache
+    if strategy in [MCDC, DECISION_DIAGRAM]:
+        test_cases = generate_mcdc_test_cases(graph=graph, parameters_map=parameters_map, effects=effects, decision_diagram=(strategy == DECISION_DIAGRAM))
+        if compact:
+            bits: dict[str, int] = {parameter.id: index for index, parameter in enumerate(parameters_map.values())}
+            masks = [(sum(1 << bits[id] for id in test_case if test_case[id]), sum(1 << bits[id] for id in test_case)) for test_case in test_cases]
+            test_cases = to_case_masks(parameters=list(bits), masks=masks)
+    elif compact:
+        test_cases = generate_test_case_masks(graph=graph, parameters_map=parameters_map, effects=effects, cache=cache)
+    else:
+        test_cases = list(generate_test_cases(graph=graph, parameters_map=parameters_map, effects=effects, cache=cache))
+
+    return Suite(conditions=conditions, expected=expected, cases=test_cases)
+
+def stream_cases(graph: Graph) -> Iterator[dict]:
+    """Lazily generate the test cases of the test suite generated by convert in the same order. The configurations of the cause nodes are streamed through the graph, such that only the test case currently under construction is held in memory.
+
+    parameters:
+        graph -- a cause-effect graph representing a causal sentence
+
+    returns: iterator over test cases mapping parameter ids to boolean values"""
+    parameters_map, _, _, effects = get_parameters(graph=graph)
+    yield from generate_test_cases(graph=graph, parameters_map=parameters_map, effects=effects, lazy=True)
+
+def dump(graph: Graph, output: TextIO):
+    """Generate a test suite from a cause-effect graph and write it as JSON to an output while streaming the test cases. The written document is identical to the serialized result of convert, but the test suite is never held in memory as a whole.
+
+    parameters:
+        graph -- a cause-effect graph representing a causal sentence
+        output -- text stream to write the test suite to (e.g., an open file)"""
+    parameters_map, conditions, expected, effects = get_parameters(graph=graph)
+    header = Suite(conditions=conditions, expected=expected).to_dict()
+    del header['cases']
+
+    # write all but the closing brace of the parameters, then append the test cases one by one
+    output.write(json.dumps(header)[:-1] + ', "cases": [')
+    for index, test_case in enumerate(generate_test_cases(graph=graph, parameters_map=parameters_map, effects=effects, lazy=True)):
+        output.write((', ' if index > 0 else '') + json.dumps(test_case))
+    output.write(']}')
+
+def get_parameters(graph: Graph) -> tuple[dict, list[Parameter], list[Parameter], list[EventNode]]:
+    """Generate the parameters of a test suite from the event nodes of a cause-effect graph.
+
+    parameters:
+        graph -- a cause-effect graph representing a causal sentence
+
+    returns: a mapping between node ids and parameters, the input parameters (conditions), the output parameters (expected), and the effect nodes"""
     # obtain all event nodes from the graph and generate a mapping from those nodes to parameters
     events = [node for node in graph.nodes if type(node) == EventNode]
     causeids = [event.id for event in events if len(event.incoming) == 0]
@@ -19,21 +83,74 @@ def convert(graph: Graph) -> Suite:
     input_parameters_map: dict = {node: parameters_map[node] for node in parameters_map if node in causeids}
     output_parameters_map: dict = {node: parameters_map[node] for node in parameters_map if node in effectids}
 
-    # generate test cases for the root node being evaluated both to True and False
-    test_cases = []
+    return (parameters_map, list(input_parameters_map.values()), list(output_parameters_map.values()), effects)
+
+def generate_test_cases(graph: Graph, parameters_map: dict, effects: list[EventNode], lazy: bool = False, cache: ConfigurationCache = None) -> Iterator[dict]:
+    """Generate the test cases for the root node of a cause-effect graph being evaluated both to True and False.
+
+    parameters:
+        graph -- a cause-effect graph representing a causal sentence
+        parameters_map -- mapping between node ids and parameters
+        effects -- list of event nodes that represent the effects in the cause-effect-graph
+        lazy -- True if the configurations of the cause nodes shall be streamed through the graph instead of being generated as lists at every intermediate node
+        cache -- optional cache memoizing the configurations of the nodes (not applicable if lazy)
+
+    returns: iterator over test cases mapping parameter ids to boolean values"""
     for root_node_outcome in [True, False]:
         # determine the expected value of each effect node given the root node outcome
         outcome_configuration: dict = get_expected_outcome(root_node_evaluation=root_node_outcome, effects=effects)
         expected_outcome = map_node_to_parameter(configuration=outcome_configuration, parameters_map=parameters_map)
 
         # determine all non-redundant configurations of cause node values able to produce the root node outcome
-        node_configurations: list[dict] = graph.root.get_testcase_configuration(expected_outcome=root_node_outcome)
+        if lazy:
+            node_configurations: Iterator[dict] = graph.root.stream_testcase_configurations(expected_outcome=root_node_outcome)
+        else:
+            node_configurations: list[dict] = graph.root.get_testcase_configuration(expected_outcome=root_node_outcome, cache=cache)
         for config in node_configurations:
             # for each configuration: generate one test case
             test_case = map_node_to_parameter(configuration=config, parameters_map = parameters_map)
-            test_cases.append(test_case | expected_outcome)
+            yield test_case | expected_outcome
+
+def generate_test_case_masks(graph: Graph, parameters_map: dict, effects: list[EventNode], cache: ConfigurationCache = None) -> CaseMasks:
+    """Generate the test cases of generate_test_cases in the same order, but encode them as bitmasks over the parameters, where bit i refers to the i-th parameter.
+
+    parameters:
+        graph -- a cause-effect graph representing a causal sentence
+        parameters_map -- mapping between node ids and parameters
+        effects -- list of event nodes that represent the effects in the cause-effect-graph
+        cache -- optional cache memoizing the bitmasks of the nodes
+
+    returns: the test cases in their compact representation"""
+    bits: dict[str, int] = {node: index for index, node in enumerate(parameters_map)}
+    effects_care = sum(1 << bits[effect.id] for effect in effects)
+
+    masks: list[tuple[int, int]] = []
+    for root_node_outcome in [True, False]:
+        # determine the expected value of each effect node given the root node outcome
+        effects_values = sum(1 << bits[effect.id] for effect in effects if effect.incoming[0].negated != root_node_outcome)
+
+        # determine all non-redundant configurations of cause node values able to produce the root node outcome and add the expected outcome to each of them
+        for values, care in graph.root.get_testcase_bitmasks(expected_outcome=root_node_outcome, bits=bits, cache=cache):
+            masks.append(((values & ~effects_care) | effects_values, care | effects_care))
+
+    return to_case_masks(parameters=[parameter.id for parameter in parameters_map.values()], masks=masks)
+
+def generate_mcdc_test_cases(graph: Graph, parameters_map: dict, effects: list[EventNode], decision_diagram: bool = False) -> list[dict]:
+    """Generate test cases satisfying modified condition/decision coverage (see get_mcdc_configurations), where the test cases evaluating the root node to True precede the ones evaluating it to False.
+
+    parameters:
+        graph -- a cause-effect graph representing a causal sentence
+        parameters_map -- mapping between node ids and parameters
+        effects -- list of event nodes that represent the effects in the cause-effect-graph
+        decision_diagram -- True if the configurations shall be derived from the binary decision diagram of the cause tree (see get_mcdc_configurations_from_decision_diagram)
+
+    returns: list of test cases mapping parameter ids to boolean values"""
+    expected_outcomes = {root_node_outcome: map_node_to_parameter(configuration=get_expected_outcome(root_node_evaluation=root_node_outcome, effects=effects), parameters_map=parameters_map)
+                         for root_node_outcome in [True, False]}
 
-    return Suite(conditions=list(input_parameters_map.values()), expected=list(output_parameters_map.values()), cases=test_cases)
+    select_configurations = get_mcdc_configurations_from_decision_diagram if decision_diagram else get_mcdc_configurations
+    return [map_node_to_parameter(configuration=config, parameters_map=parameters_map) | expected_outcomes[root_node_outcome]
+            for config, root_node_outcome in select_configurations(root=graph.root)]
 
 def generate_parameters(nodes: list[EventNode]) -> dict:
     """Convert every node in the list into a parameter for a test suite
@@ -1,38 +1,67 @@
 import torch
-from transformers import BatchEncoding, RobertaTokenizerFast
+from tokenizers import Tokenizer
+from transformers import BatchEncoding, RobertaConfig, RobertaTokenizerFast
 
 import src.converters.sentencetolabels.labelingconverter as lconv
 import src.util.constants as consts
-from src.converters.sentencetolabels.model import MultiLabelRoBERTaCustomModel
+from src.converters.sentencetolabels.model import MultiLabelRoBERTaCustomModel, OnnxLabelingModel
 from src.data.labels import Label
+from src.util.bundle import LABELER, ModelBundle
+from src.util.quantization import quantize as quantize_model
 
 MODEL_TO_USE = 'roberta-base'
 LABELER_TO_USE = 'bin/multilabel.ckpt'
 DROPOUT_RATE = 0.13780087432114646
+BATCH_SIZE = 16
 
 class Labeler:
 
-    def __init__(self, model_path: str=LABELER_TO_USE, useGPU: bool=False, max_len: int=80, dropout: float=DROPOUT_RATE):
+    def __init__(self, model_path: str=LABELER_TO_USE, useGPU: bool=False, max_len: int=80, dropout: float=DROPOUT_RATE, from_config: bool=True, bundle: ModelBundle=None, quantize: str=None, onnx_model: str=None):
+        if (quantize is not None or onnx_model is not None) and useGPU:
+            raise ValueError('Quantized models and ONNX models can only be executed on the CPU')
+
         # set variables
         self.useGPU = useGPU
         self.max_len = max_len
 
-        # setup model and tokenizer
-        self.tokenizer = RobertaTokenizerFast.from_pretrained(MODEL_TO_USE)
-        self.model = MultiLabelRoBERTaCustomModel.load_from_checkpoint(
-            hyperparams={'dropout': dropout},
-            training_dataset=None,
-            validation_dataset=None,
-            test_dataset=None,
-            labels=consts.LABEL_IDS,
-            model_to_use=MODEL_TO_USE,
-            checkpoint_path=model_path
-        )
-
-        if self.useGPU:
-            self.model.cuda()
-
-        self.model.eval()
+        # setup tokenizer
+        if bundle is not None:
+            # load everything from the bundle without contacting the model hub or unpickling the training checkpoint
+            self.tokenizer = RobertaTokenizerFast(tokenizer_object=Tokenizer.from_str(bundle.tokenizer(LABELER)))
+        else:
+            self.tokenizer = RobertaTokenizerFast.from_pretrained(MODEL_TO_USE)
+
+        # setup model
+        if onnx_model is not None:
+            # the model exported to ONNX is executed by ONNX Runtime instead of PyTorch
+            self.model = OnnxLabelingModel(onnx_model)
+        elif bundle is not None:
+            self.model = MultiLabelRoBERTaCustomModel(
+                hyperparams={'dropout': dropout, 'config': RobertaConfig.from_dict(bundle.config(LABELER))},
+                training_dataset=None,
+                validation_dataset=None,
+                test_dataset=None,
+                labels=consts.LABEL_IDS,
+                model_to_use=MODEL_TO_USE
+            )
+            self.model.load_state_dict(bundle.state_dict(LABELER))
+        else:
+            self.model = MultiLabelRoBERTaCustomModel.load_from_checkpoint(
+                hyperparams={'dropout': dropout, 'from_pretrained': not from_config},
+                training_dataset=None,
+                validation_dataset=None,
+                test_dataset=None,
+                labels=consts.LABEL_IDS,
+                model_to_use=MODEL_TO_USE,
+                checkpoint_path=model_path
+            )
+
+        if onnx_model is None:
+            if self.useGPU:
+                self.model.cuda()
+
+            self.model.eval()
+            self.model = quantize_model(self.model, mode=quantize)
 
     def label(self, sentence: str) -> list[Label]:
         """Label a given sentence with the available label list.
@@ -47,8 +76,70 @@ class Labeler:
             add_special_tokens=True,
             max_length=self.max_len,
             truncation=True,
-            padding='max_length')
+            padding='max_length',
+            return_offsets_mapping=True)
+
+        predictions = self.predict(tokenized_batch)
+
+        # return list of labels
+        labels: list[Label] = lconv.convert(
+            sentence_tokens=tokenized_batch[0].tokens,
+            sentence=sentence,
+            predictions=predictions,
+            offsets=tokenized_batch['offset_mapping'][0])
+        return labels
+
+    def label_batch(self, sentences: list[str], batch_size: int=BATCH_SIZE) -> list[list[Label]]:
+        """Label a list of sentences with the available label list. The sentences are sorted by their number of tokens and grouped into buckets of similar length, where each bucket is only padded to its longest member and processed by one forward pass of the model.
+
+        parameters:
+            sentences -- list of natural language, english sentences that contain a causal relationship
+            batch_size -- maximum number of sentences in one bucket
+
+        returns: list of labels assigned to each sentence (in the order of the input list)"""
+        if len(sentences) == 0:
+            return []
 
+        # determine the number of tokens of each sentence and order the sentences by it
+        token_lengths: list[int] = [len(input_ids) for input_ids in self.tokenizer(
+            text=sentences,
+            add_special_tokens=True,
+            max_length=self.max_len,
+            truncation=True).input_ids]
+        order: list[int] = sorted(range(len(sentences)), key=lambda index: token_lengths[index])
+
+        labels: list[list[Label]] = [None]*len(sentences)
+        for start in range(0, len(order), batch_size):
+            bucket: list[int] = order[start:start+batch_size]
+
+            # tokenize the bucket and pad it to its longest sentence
+            tokenized_batch: BatchEncoding = self.tokenizer(
+                text=[sentences[index] for index in bucket],
+                add_special_tokens=True,
+                max_length=self.max_len,
+                truncation=True,
+                padding='longest',
+                return_offsets_mapping=True)
+            predictions = self.predict(tokenized_batch)
+
+            # convert each row of the bucket into a list of labels at the original position of the sentence
+            for row, index in enumerate(bucket):
+                labels[index] = lconv.convert(
+                    sentence_tokens=tokenized_batch[row].tokens,
+                    sentence=sentences[index],
+                    predictions=predictions[row:row+1],
+                    offsets=tokenized_batch['offset_mapping'][row])
+
+        return labels
+
+    @torch.inference_mode()
+    def predict(self, tokenized_batch: BatchEncoding) -> torch.Tensor:
+        """Apply the labeling model to a batch of tokenized sentences.
+
+        parameters:
+            tokenized_batch -- batch of tokenized sentences, all padded to the same length
+
+        returns: tensor of predictions (one row per sentence, one column per label for each token)"""
         # attention mask
         input_ids = torch.tensor(tokenized_batch.input_ids, dtype=torch.long)
         attention_mask = torch.tensor(tokenized_batch.attention_mask, dtype=torch.long)
@@ -66,11 +157,5 @@ class Labeler:
         sigmoid_outputs = torch.sigmoid(logits)
         predictions = (sigmoid_outputs >= 0.5).int()
         predictions = predictions.cpu()
-
-        # return list of labels
-        labels: list[Label] = lconv.convert(
-            sentence_tokens=tokenized_batch[0].tokens,
-            sentence=sentence,
-            predictions=predictions)
-        return labels
+        return predictions
 
@@ -1,11 +1,12 @@
 import re
 from dataclasses import dataclass
 
+import numpy as np
 from torch import Tensor
 
 import src.util.constants as consts
 from src.converters.sentencetolabels.labelrecovery import recover_labels
-from src.data.labels import EventLabel, Label, SubLabel
+from src.data.labels import EventLabel, Label, LabelIndex, SubLabel
 
 TOKEN_PREFIX = 'Ġ'
 TOKEN_INIT = '<s>'
@@ -18,20 +19,25 @@ class TokenLabel:
     event: bool
     name: str
 
-def convert(sentence_tokens: list[str], sentence: str, predictions: Tensor) -> list[Label]:
+def convert(sentence_tokens: list[str], sentence: str, predictions: Tensor, offsets: list[tuple[int, int]] = None) -> list[Label]:
     """Convert the list of sentence tokens and the list of predictions into a list of label objects
 
     parameters:
         sentence_tokens -- list of tokens of the labeled sentence (words) as produced by the labeler
         sentence -- actual sentence
         predictions -- matrix of predictions (valid labels for each token)
+        offsets -- optional character offsets (begin, end) of each token in the sentence as produced by a fast tokenizer (offset mapping), which replace locating the tokens in the sentence
 
     returns: list of actual labels on the sentence"""
-    # convert the list of sentence tokens, predictions, and labels into a list of token labels, where each token is associated with up to two labels
-    token_labels = get_token_labeling(sentence_tokens=sentence_tokens, sentence=sentence, predictions=predictions)
+    if offsets is not None:
+        # decode the spans of all labels directly from the prediction matrix
+        labels: list[Label] = decode(predictions=np.asarray(predictions[0]), offsets=np.asarray(offsets))
+    else:
+        # convert the list of sentence tokens, predictions, and labels into a list of token labels, where each token is associated with up to two labels
+        token_labels = get_token_labeling(sentence_tokens=sentence_tokens, sentence=sentence, predictions=predictions)
 
-    # merge all adjacent labels
-    labels: list[Label] = merge_labels(token_labels=token_labels)
+        # merge all adjacent labels
+        labels: list[Label] = merge_labels(token_labels=token_labels)
 
     # connect first-level and second-level labels with each other
     connect_labels(labels)
@@ -91,6 +97,39 @@ def get_token_labeling(sentence_tokens: list[str], sentence: str, predictions: T
 
     return token_labels
 
+def get_token_labeling_from_offsets(offsets: list[tuple[int, int]], predictions: Tensor) -> list[TokenLabel]:
+    """Convert the character offsets of each token and the predictions into a list of tokens associated to all available labels. In contrast to get_token_labeling, the position of each token does not need to be searched in the sentence, which takes linear instead of quadratic time and is robust against repeated substrings.
+
+    parameters:
+        offsets -- character offsets (begin, end) of each token in the sentence as produced by a fast tokenizer (offset mapping), where special tokens have empty offsets
+        predictions -- list of predictions for each token, associating each available label with a weight within [0;1]
+
+    returns: list of token labels, containing one object for each token label (max 2 per token)
+    """
+    token_labels: list[TokenLabel] = []
+
+    for (begin, end), token_prediction in zip(offsets, predictions[0]):
+        # skip special tokens (initializing, finalizing, and padding tokens), which do not cover any character of the sentence
+        if begin == end:
+            continue
+
+        # get all labels associated to a token
+        for label_prediction_idx, label_prediction in enumerate(token_prediction):
+            if label_prediction != 1:
+                continue
+
+            label = consts.LABEL_IDS_VERBOSE[label_prediction_idx]
+            if label == consts.NOTRELEVANT:
+                continue
+
+            token_labels.append(TokenLabel(
+                begin=begin,
+                end=end,
+                event = consts.is_event(label),
+                name=label))
+
+    return token_labels
+
 def merge_labels(token_labels: list[TokenLabel]) -> list[Label]:
     """Convert the list of token labels, where every single token is associated to up to two labels, to a list of merged labels, where each label spans all tokens that belong to the same label.
 
@@ -102,36 +141,86 @@ def merge_labels(token_labels: list[TokenLabel]) -> list[Label]:
         list of merged labels
     """
     merged_labels: list[Label] = []
-    id_counter = 0
     # keep track of event borders (begin and end of an event label)
-    event_borders = []
+    event_borders: set[int] = set()
+
+    # group the token labels by their type in a single pass, which retains the order of the tokens within each type
+    token_labels_by_type: dict[str, list[TokenLabel]] = {}
+    for tl in token_labels:
+        token_labels_by_type.setdefault(tl.name, []).append(tl)
 
     for ltype in consts.LABEL_IDS_VERBOSE:
-        # get all labels of that type in the list of token labels
-        all_of_type = [tl for tl in token_labels if tl.name==ltype]
+        all_of_type = token_labels_by_type.get(ltype, [])
 
         # merge adjacent token labels with one exception: if two second-level labels (Variable or Condition) are adjacent, but both belong to two different first-level (event) labels (Cause1/2/3, Event1/2/3), don't merge them
-        if len(all_of_type) > 1:
-            for index in range(len(all_of_type)-1, 0, -1):
-                if all_of_type[index].begin - all_of_type[index-1].end <= 1 and \
-                        all_of_type[index].begin not in event_borders and \
-                        all_of_type[index-1].end not in event_borders:
-                    b = all_of_type.pop(index)
-                    a = all_of_type.pop(index-1)
-                    merged = TokenLabel(begin=a.begin, end=b.end, event=a.event, name=a.name)
-                    all_of_type.insert(index-1, merged)
-
-        for l in all_of_type:
-            idv = f'L{id_counter}'
+        spans: list[list[int]] = []
+        for tl in all_of_type:
+            if len(spans) > 0 and \
+                    tl.begin - spans[-1][1] <= 1 and \
+                    tl.begin not in event_borders and \
+                    spans[-1][1] not in event_borders:
+                spans[-1][1] = tl.end
+            else:
+                spans.append([tl.begin, tl.end])
+
+        is_event = consts.is_event(ltype[:-1])
+        for begin, end in spans:
+            idv = f'L{len(merged_labels)}'
             label: Label = None
-            label_trimmed = l.name[:-1]
-            if consts.is_event(label_trimmed):
-                label = EventLabel(id=idv, name=l.name, begin=l.begin, end=l.end)
-                event_borders.extend([l.begin, l.end])
+            if is_event:
+                label = EventLabel(id=idv, name=ltype, begin=begin, end=end)
             else:
-                label = SubLabel(id=idv, name=l.name, begin=l.begin, end=l.end)
+                label = SubLabel(id=idv, name=ltype, begin=begin, end=end)
             merged_labels.append(label)
-            id_counter += 1
+
+        if is_event:
+            event_borders.update(border for span in spans for border in span)
+
+    return merged_labels
+
+def decode(predictions: np.ndarray, offsets: np.ndarray) -> list[Label]:
+    """Decode the merged labels of a sentence directly from the prediction matrix of the labeler. The result is identical to merging the token labels produced by get_token_labeling_from_offsets via merge_labels, but the runs of adjacent tokens sharing a label are determined with array operations per label instead of comparing every single prediction in Python.
+
+    parameters:
+        predictions -- matrix of predictions with one row per token and one column per label (in the order of LABEL_IDS_VERBOSE)
+        offsets -- matrix of character offsets with one row (begin, end) per token, where special tokens have empty offsets
+
+    returns: list of merged labels"""
+    begins, ends = offsets[:, 0], offsets[:, 1]
+    # special tokens (initializing, finalizing, and padding tokens) do not cover any character of the sentence
+    assigned = (predictions == 1) & (begins != ends)[:, np.newaxis]
+
+    merged_labels: list[Label] = []
+    # keep track of event borders (begin and end of an event label)
+    event_borders = np.empty(0, dtype=begins.dtype)
+
+    for column, ltype in enumerate(consts.LABEL_IDS_VERBOSE):
+        if ltype == consts.NOTRELEVANT:
+            continue
+
+        tokens = np.flatnonzero(assigned[:, column])
+        if len(tokens) == 0:
+            continue
+        token_begins, token_ends = begins[tokens], ends[tokens]
+
+        # two subsequent tokens of the same label are merged if they are at most one character apart and neither touches the border of an event
+        separated = (token_begins[1:] - token_ends[:-1] > 1) | \
+            np.isin(token_begins[1:], event_borders) | \
+            np.isin(token_ends[:-1], event_borders)
+        run_starts = np.concatenate(([0], np.flatnonzero(separated) + 1))
+        run_ends = np.concatenate((np.flatnonzero(separated), [len(tokens) - 1]))
+        label_begins, label_ends = token_begins[run_starts].tolist(), token_ends[run_ends].tolist()
+
+        is_event = consts.is_event(ltype[:-1])
+        for begin, end in zip(label_begins, label_ends):
+            idv = f'L{len(merged_labels)}'
+            if is_event:
+                merged_labels.append(EventLabel(id=idv, name=ltype, begin=begin, end=end))
+            else:
+                merged_labels.append(SubLabel(id=idv, name=ltype, begin=begin, end=end))
+
+        if is_event:
+            event_borders = np.concatenate((event_borders, label_begins, label_ends))
 
     return merged_labels
 
@@ -142,9 +231,10 @@ def connect_labels(labels: list[Label]) -> None:
         labels -- list of unconnected labels (both EventLabels and SubLabels)
     """
     event_labels: list[EventLabel] = [label for label in labels if type(label) == EventLabel]
+    label_index = LabelIndex(labels)
 
     for event_label in event_labels:
-        children = [label for label in labels if (type(label) == SubLabel and label.begin >= event_label.begin and label.end <= event_label.end)]
+        children = [label for label in label_index.within(event_label.begin, event_label.end) if type(label) == SubLabel]
         for child in children:
             event_label.add_child(child)
 
@@ -152,7 +242,7 @@ def connect_labels(labels: list[Label]) -> None:
     event_labels.sort(key=(lambda l: l.begin), reverse=False)
     overruled_precedence = False
     for index, _ in enumerate(event_labels[:-1]):
-        junctors: list[SubLabel] = get_junctors_between(labels=labels, first=event_labels[index], second=event_labels[index+1])
+        junctors: list[SubLabel] = get_junctors_between(labels=labels, first=event_labels[index], second=event_labels[index+1], index=label_index)
         junctor: str = None
         if len(junctors) == 1:
             junctor = consts.AND if junctors[0].name == consts.CONJUNCTION else consts.OR
@@ -174,17 +264,20 @@ def connect_labels(labels: list[Label]) -> None:
         event_labels[index].set_successor(successor=event_labels[index+1], junctor=junctor)
 
 
-def get_junctors_between(labels: list[Label], first: EventLabel, second: EventLabel) -> list[SubLabel]:
+def get_junctors_between(labels: list[Label], first: EventLabel, second: EventLabel, index: LabelIndex = None) -> list[SubLabel]:
     """Retrieve all junctors between the first and second event label
 
     parameters:
         labels -- list of all labels
         first -- event label from whose end point the search begins
         second -- event label where the search ends
+        index -- optional index over the list of labels, which avoids scanning all labels
 
     returns: all conjunctions and disjunctions between the two event labels"""
+    if index is None:
+        index = LabelIndex(labels)
 
-    junctors: list[SubLabel] = [label for label in labels if (label.begin >= first.end and label.end <= second.begin and consts.is_junctor(label.name))]
+    junctors: list[SubLabel] = [label for label in index.within(first.end, second.begin) if consts.is_junctor(label.name)]
 
     return junctors
 
@@ -1,7 +1,24 @@
 import re
 
 import src.util.constants as consts
-from src.data.labels import Label, SubLabel, get_label_by_type_and_position
+from src.data.labels import Label, LabelIndex, SubLabel
+
+
+def compile_clauses(clauses: list[str]) -> re.Pattern:
+    """Compile a list of (potentially multi-word) phrases into a single, case-insensitive pattern which matches all phrases in one pass over a sentence. Phrases only match whole words and the words of multi-word phrases may be separated by any whitespace. Longer phrases take precedence over phrases they start with (e.g., "except when" over "except").
+
+    parameters:
+        clauses -- list of phrases (e.g., ['unless', 'except when'])
+
+    returns: compiled pattern matching any of the phrases (which never matches if there are no phrases)"""
+    alternatives = [r'\s+'.join(re.escape(word) for word in clause.split()) for clause in sorted(clauses, key=len, reverse=True) if len(clause.split()) > 0]
+    if len(alternatives) == 0:
+        # an empty alternative would match the empty string at every word boundary
+        return re.compile(r'(?!)')
+    return re.compile(r'\b(?:' + '|'.join(alternatives) + r')\b', re.IGNORECASE)
+
+
+EXCEPTIVE_CLAUSE_PATTERN = compile_clauses(consts.EXCEPTIVE_CLAUSES)
 
 
 def recover_labels(sentence: str, labels: list[Label]) -> list[Label]:
@@ -13,27 +30,27 @@ def recover_labels(sentence: str, labels: list[Label]) -> list[Label]:
 
     return labels
 
-def label_exceptive_clauses(sentence: str, labels: list[Label]) -> list[SubLabel]:
+def label_exceptive_clauses(sentence: str, labels: list[Label], pattern: re.Pattern = EXCEPTIVE_CLAUSE_PATTERN) -> list[SubLabel]:
     """Identify all instances of exceptive clauses (determined by the list of words above) that have not been labeled. Because exceptive clauses like this are very rare they have apparently not been picked up by the BERT-based labeler. Because they convey important information ("Unless A then B" translates to "If not A then B") they need to be recovered. This method generates a negation for each exceptive clause that does not yet contain one.
 
     parameters:
         sentence -- natural language sentence
         labels -- list of labels already associated with the sentence
+        pattern -- compiled pattern matching all exceptive clauses (see compile_clauses), by default the clauses in consts.EXCEPTIVE_CLAUSES
 
     returns: list of labels for previously unlabeled exceptive clauses"""
 
     additional_labels: list[SubLabel] = []
 
-    exceptive_instances = []
-    for exclause in consts.EXCEPTIVE_CLAUSES:
-        iter = re.finditer(exclause, sentence.lower())
-        exceptive_instances += [m.span() for m in iter]
+    # find all exceptive clauses in a single pass over the sentence
+    exceptive_instances = [m.span() for m in pattern.finditer(sentence)]
 
-    for index, instance in enumerate(exceptive_instances):
-        label = get_label_by_type_and_position(labels, type=consts.NEGATION, begin=instance[0], end=instance[1])
+    label_index = LabelIndex(labels)
+    for instance_index, instance in enumerate(exceptive_instances):
+        label = label_index.at(type=consts.NEGATION, begin=instance[0], end=instance[1])
         if label is None:
             additional_labels.append(
-                SubLabel(id=f'AEX{index}', name=consts.NEGATION, begin=instance[0], end=instance[1])
+                SubLabel(id=f'AEX{instance_index}', name=consts.NEGATION, begin=instance[0], end=instance[1])
             )
 
     return additional_labels
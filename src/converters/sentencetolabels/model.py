@@ -4,9 +4,11 @@ import pytorch_lightning as pl
 import torch
 from torch import nn
 from torch.nn import BCEWithLogitsLoss
-from transformers import RobertaModel
+from transformers import RobertaConfig, RobertaModel
 from transformers.modeling_outputs import TokenClassifierOutput
 
+from src.util.onnxbackend import OnnxModel
+
 
 class CustomModel(pl.LightningModule):
 
@@ -47,7 +49,14 @@ class MultiLabelRoBERTaCustomModel(CustomModel):
 
     def define_model(self, model_to_use, num_labels):
         self.num_labels = num_labels
-        self.bert = RobertaModel.from_pretrained(model_to_use)
+        if self.hyperparams.get('config') is not None:
+            # build the architecture from a given configuration without resolving the pre-trained model
+            self.bert = RobertaModel(self.hyperparams['config'])
+        elif self.hyperparams.get('from_pretrained', True):
+            self.bert = RobertaModel.from_pretrained(model_to_use)
+        else:
+            # only build the architecture, as the weights are loaded from a fine-tuned checkpoint afterwards
+            self.bert = RobertaModel(RobertaConfig.from_pretrained(model_to_use))
         self.dropout = nn.Dropout(self.hyperparams["dropout"])
         self.classifier = nn.Linear(
             self.bert.config.hidden_size, self.num_labels)
@@ -84,3 +93,24 @@ class MultiLabelRoBERTaCustomModel(CustomModel):
             hidden_states=outputs.hidden_states,
             attentions=outputs.attentions,
         )
+
+
+class LogitsModel(nn.Module):
+
+    def __init__(self, model: MultiLabelRoBERTaCustomModel):
+        """Wrap a labeling model such that it maps token ids and an attention mask directly to logits, which is the interface required to export it to ONNX.
+
+        parameters:
+            model -- labeling model"""
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model(input_ids, attention_mask, token_type_ids=None, labels=None).logits
+
+
+class OnnxLabelingModel(OnnxModel):
+
+    def __call__(self, input_ids, attention_mask, token_type_ids=None, labels=None) -> TokenClassifierOutput:
+        """Apply the labeling model exported to ONNX with the same interface as the PyTorch model (the token type ids and labels are ignored)."""
+        return TokenClassifierOutput(logits=super().__call__(input_ids, attention_mask))
@@ -0,0 +1,285 @@
+from typing import Callable, Hashable, Iterator
+
+from src.data.graph import EventNode, Graph, Node
+
+# ids of the two terminal nodes of every decision diagram
+FALSE = 0
+TRUE = 1
+
+
+class BDD:
+
+    def __init__(self):
+        """Create a manager of reduced ordered binary decision diagrams (BDDs), which represent boolean functions over the event nodes of cause-effect graphs. Every decision node is identified by an integer and stored only once (in a unique table), such that two functions managed by the same manager are equivalent if and only if they are represented by the same node. The variables are ordered by their first occurrence, which for the cause trees of cause-effect graphs keeps the diagrams linear in the number of events."""
+        # variable keys in the order of their levels and the level of each key
+        self.variables: list[Hashable] = []
+        self.levels: dict[Hashable, int] = {}
+        # each node is a triple of its level, the node if the variable is false, and the node if it is true (the terminals are placed below all levels)
+        self.nodes: list[tuple[int, int, int]] = [(float('inf'), FALSE, FALSE), (float('inf'), TRUE, TRUE)]
+        self.unique: dict[tuple[int, int, int], int] = {}
+        self.ite_cache: dict[tuple[int, int, int], int] = {}
+
+    def make(self, level: int, low: int, high: int) -> int:
+        """Obtain the node testing the variable of the given level, omitting the test if both branches are equal.
+
+        parameters:
+            level -- level of the tested variable
+            low -- node reached if the variable is false
+            high -- node reached if the variable is true
+
+        returns: id of the (possibly existing) node"""
+        if low == high:
+            return low
+        key = (level, low, high)
+        if key not in self.unique:
+            self.unique[key] = len(self.nodes)
+            self.nodes.append(key)
+        return self.unique[key]
+
+    def declare(self, key: Hashable) -> int:
+        """Declare a variable, which is placed below all previously declared variables.
+
+        parameters:
+            key -- key identifying the variable (e.g., the id of an event node)
+
+        returns: the level of the variable"""
+        if key not in self.levels:
+            self.levels[key] = len(self.variables)
+            self.variables.append(key)
+        return self.levels[key]
+
+    def variable(self, key: Hashable) -> int:
+        """Obtain the function which is true if and only if the variable is true.
+
+        parameters:
+            key -- key identifying the variable
+
+        returns: id of the node representing the variable"""
+        return self.make(self.declare(key), FALSE, TRUE)
+
+    def ite(self, f: int, g: int, h: int) -> int:
+        """Combine three functions to "if f then g else h", from which all binary operations are derived.
+
+        parameters:
+            f -- condition
+            g -- function if the condition is true
+            h -- function if the condition is false
+
+        returns: id of the node representing the combined function"""
+        if f == TRUE:
+            return g
+        if f == FALSE:
+            return h
+        if g == h:
+            return g
+        if g == TRUE and h == FALSE:
+            return f
+
+        key = (f, g, h)
+        if key not in self.ite_cache:
+            level = min(self.nodes[f][0], self.nodes[g][0], self.nodes[h][0])
+            low = self.ite(*[self.cofactor(node, level, False) for node in key])
+            high = self.ite(*[self.cofactor(node, level, True) for node in key])
+            self.ite_cache[key] = self.make(level, low, high)
+        return self.ite_cache[key]
+
+    def cofactor(self, f: int, level: int, value: bool) -> int:
+        """Restrict a function to a value of the variable at the given level, assuming that the function does not depend on variables above that level.
+
+        parameters:
+            f -- function to restrict
+            level -- level of the restricted variable
+            value -- value of the restricted variable
+
+        returns: id of the node representing the restricted function"""
+        node_level, low, high = self.nodes[f]
+        if node_level != level:
+            return f
+        return high if value else low
+
+    def conjoin(self, f: int, g: int) -> int:
+        return self.ite(f, g, FALSE)
+
+    def disjoin(self, f: int, g: int) -> int:
+        return self.ite(f, TRUE, g)
+
+    def negate(self, f: int) -> int:
+        """Negate a function by swapping the terminals. The nodes are processed in the order of their creation, which is a topological order (every node is created after its branches), to avoid a recursion as deep as the number of variables.
+
+        parameters:
+            f -- function to negate
+
+        returns: id of the node representing the negated function"""
+        negated = {FALSE: TRUE, TRUE: FALSE}
+        for node in self.reachable(f):
+            if node not in negated:
+                level, low, high = self.nodes[node]
+                negated[node] = self.make(level, negated[low], negated[high])
+        return negated[f]
+
+    def restrict(self, f: int, key: Hashable, value: bool) -> int:
+        """Restrict a function to a value of one of its variables (the cofactor of the function).
+
+        parameters:
+            f -- function to restrict
+            key -- key identifying the restricted variable
+            value -- value of the restricted variable
+
+        returns: id of the node representing the restricted function"""
+        restricted = {FALSE: FALSE, TRUE: TRUE}
+        for node in self.reachable(f):
+            if node not in restricted:
+                level, low, high = self.nodes[node]
+                if level == self.levels[key]:
+                    restricted[node] = high if value else low
+                else:
+                    restricted[node] = self.make(level, restricted[low], restricted[high])
+        return restricted[f]
+
+    def xor(self, f: int, g: int) -> int:
+        return self.ite(f, self.negate(g), g)
+
+    def reachable(self, f: int) -> list[int]:
+        """Determine all nodes reachable from the node of a function.
+
+        parameters:
+            f -- function
+
+        returns: ids of the reachable nodes (including the terminals and f) in topological order from the terminals to f"""
+        visited = {f}
+        stack = [f]
+        while len(stack) > 0:
+            _, low, high = self.nodes[stack.pop()]
+            for branch in [low, high]:
+                if branch not in visited:
+                    visited.add(branch)
+                    stack.append(branch)
+        return sorted(visited)
+
+    def compile(self, node: Node, key: Callable[[EventNode], Hashable] = None) -> int:
+        """Compile the cause tree rooted in a node of a cause-effect graph into a decision diagram. Variables are declared in the order in which the event nodes appear in the tree, and the incoming nodes of each junctor are combined from the last to the first one, such that each combination only descends into the diagram of a single incoming node.
+
+        parameters:
+            node -- root of the cause tree (e.g., the root of a graph)
+            key -- function mapping an event node to the key of its variable (defaults to the id of the node), e.g., the variable and condition of an event node to compare the trees of different graphs
+
+        returns: id of the node representing the function of the cause tree"""
+        key = (lambda event: event.id) if key is None else key
+        for event in [node for node in node.flatten() if type(node) == EventNode]:
+            self.declare(key(event))
+
+        compiled: dict[str, int] = {}
+        # process the nodes in reverse pre-order, such that all incoming nodes are compiled before the node itself
+        for current in reversed(node.flatten()):
+            if type(current) == EventNode:
+                compiled[current.id] = self.variable(key(current))
+            else:
+                function = TRUE if current.conjunction else FALSE
+                for inc in reversed(current.incoming):
+                    inc_function = self.negate(compiled[inc.origin.id]) if inc.negated else compiled[inc.origin.id]
+                    function = self.conjoin(inc_function, function) if current.conjunction else self.disjoin(inc_function, function)
+                compiled[current.id] = function
+        return compiled[node.id]
+
+    def is_satisfiable(self, f: int) -> bool:
+        """Determine whether at least one configuration of the variables satisfies a function.
+
+        parameters:
+            f -- function
+
+        returns: True if the function is satisfiable"""
+        return f != FALSE
+
+    def is_equivalent(self, f: int, g: int) -> bool:
+        """Determine whether two functions of this manager are satisfied by the same configurations.
+
+        parameters:
+            f -- first function
+            g -- second function
+
+        returns: True if the functions are equivalent"""
+        return f == g
+
+    def count(self, f: int) -> int:
+        """Count the configurations of all variables declared in this manager which satisfy a function, without enumerating them.
+
+        parameters:
+            f -- function
+
+        returns: number of satisfying configurations"""
+        levels = len(self.variables)
+
+        def level_of(node: int) -> int:
+            return min(self.nodes[node][0], levels)
+
+        # number of satisfying configurations of the variables from the level of each node downwards
+        counts = {FALSE: 0, TRUE: 1}
+        for node in self.reachable(f):
+            if node not in counts:
+                level, low, high = self.nodes[node]
+                counts[node] = counts[low] * 2**(level_of(low) - level - 1) + counts[high] * 2**(level_of(high) - level - 1)
+        return counts[f] * 2**level_of(f)
+
+    def paths(self, f: int) -> Iterator[dict]:
+        """Enumerate the paths from the node of a function to the true terminal. Each path is a partial configuration in which all variables not tested on the path are "don't care", and the paths are disjoint, i.e., each satisfying configuration extends exactly one path.
+
+        parameters:
+            f -- function
+
+        returns: iterator over partial configurations mapping variable keys to boolean values"""
+        stack: list[tuple[int, dict]] = [(f, {})]
+        while len(stack) > 0:
+            node, configuration = stack.pop()
+            if node == TRUE:
+                yield configuration
+            elif node != FALSE:
+                level, low, high = self.nodes[node]
+                # push the false branch last, such that it is explored first
+                stack.append((high, configuration | {self.variables[level]: True}))
+                stack.append((low, configuration | {self.variables[level]: False}))
+
+    def pick(self, f: int, preference: dict = None) -> dict:
+        """Pick one configuration of all variables declared in this manager which satisfies a function. Every variable takes its preferred value unless this makes the function unsatisfiable, which is decided while descending the diagram once (in a reduced diagram, every node other than the false terminal leads to the true terminal).
+
+        parameters:
+            f -- satisfiable function
+            preference -- optional mapping from variable keys to their preferred values (variables without preference prefer False)
+
+        returns: satisfying configuration mapping variable keys to boolean values"""
+        configuration = {variable: False for variable in self.variables} | (preference or {})
+        node = f
+        while node not in [FALSE, TRUE]:
+            level, low, high = self.nodes[node]
+            value = configuration[self.variables[level]]
+            if (high if value else low) == FALSE:
+                value = not value
+            configuration[self.variables[level]] = value
+            node = high if value else low
+        return configuration
+
+    def evaluate(self, f: int, configuration: dict) -> bool:
+        """Evaluate a function given the values of its variables.
+
+        parameters:
+            f -- function
+            configuration -- mapping from variable keys to boolean values
+
+        returns: the value of the function"""
+        node = f
+        while node not in [FALSE, TRUE]:
+            level, low, high = self.nodes[node]
+            node = high if configuration[self.variables[level]] else low
+        return node == TRUE
+
+
+def are_equivalent(graph: Graph, other: Graph) -> bool:
+    """Determine whether the cause trees of two cause-effect graphs are logically equivalent, where event nodes are identified by their variable and condition. Unlike the structural comparison of graphs, this recognizes equivalent trees of different shape (e.g., NOT (A AND B) and NOT A OR NOT B).
+
+    parameters:
+        graph -- first cause-effect graph
+        other -- second cause-effect graph
+
+    returns: True if both cause trees represent the same boolean function"""
+    bdd = BDD()
+    key = (lambda event: (event.variable, event.condition))
+    return bdd.is_equivalent(bdd.compile(graph.root, key=key), bdd.compile(other.root, key=key))
@@ -1,7 +1,8 @@
 from abc import abstractmethod
 from dataclasses import dataclass, field
 import itertools
-from functools import cmp_to_key
+from functools import cmp_to_key, partial
+from typing import Callable, Iterator
 
 from src.data.labels import EventLabel, SubLabel
 
@@ -40,7 +41,19 @@ class Node:
         return self.outgoing[0].target.get_root()
 
     @abstractmethod
-    def get_testcase_configuration(self, expected_outcome: bool) -> list[dict]:
+    def get_testcase_configuration(self, expected_outcome: bool, cache: 'ConfigurationCache' = None) -> list[dict]:
+        pass
+
+    @abstractmethod
+    def stream_testcase_configurations(self, expected_outcome: bool) -> Iterator[dict]:
+        pass
+
+    @abstractmethod
+    def get_testcase_bitmasks(self, expected_outcome: bool, bits: dict[str, int], cache: 'ConfigurationCache' = None) -> list[tuple[int, int]]:
+        pass
+
+    @abstractmethod
+    def evaluate(self, configuration: dict) -> bool:
         pass
 
     @abstractmethod
@@ -122,9 +135,19 @@ class EventNode(Node):
     def flatten(self) -> list['Node']:
         return [self]
 
-    def get_testcase_configuration(self, expected_outcome: bool) -> list[dict]:
+    def get_testcase_configuration(self, expected_outcome: bool, cache: 'ConfigurationCache' = None) -> list[dict]:
         return [{self.id: expected_outcome}]
 
+    def stream_testcase_configurations(self, expected_outcome: bool) -> Iterator[dict]:
+        yield {self.id: expected_outcome}
+
+    def get_testcase_bitmasks(self, expected_outcome: bool, bits: dict[str, int], cache: 'ConfigurationCache' = None) -> list[tuple[int, int]]:
+        bit = 1 << bits[self.id]
+        return [(bit if expected_outcome else 0, bit)]
+
+    def evaluate(self, configuration: dict) -> bool:
+        return configuration[self.id]
+
     def is_equal(self, other, incoming: bool) -> bool:
         if type(other) != EventNode:
             return False
@@ -182,29 +205,74 @@ class IntermediateNode(Node):
             result = result + child.origin.flatten()
         return result
 
-    def get_testcase_configuration(self, expected_outcome: bool) -> list[dict]:
+    def get_testcase_configuration(self, expected_outcome: bool, cache: 'ConfigurationCache' = None) -> list[dict]:
         """Generate a map of configurations which determines the value that each leaf node connected to this intermediate node needs to have in order to produce the expected outcome.
 
         parameters:
             expected_outcome -- the boolean value this intermediate node is expected to have
+            cache -- optional cache which memoizes the configurations of the incoming nodes, such that every incoming node is only evaluated once per expected outcome
 
         returns: list of configurations mapping leaf (Event) node ids to boolean values
         """
         if (expected_outcome == self.conjunction):
             # for a conjunction to be evaluated to true or a disjunction to false only one configuration is possible: every incoming node has to have the same expected outcome (negated if necessary)
-            inc_configs = [inc.origin.get_testcase_configuration(
-                expected_outcome != inc.negated) for inc in self.incoming]
+            inc_configs = [get_configuration(inc.origin, expected_outcome != inc.negated, cache) for inc in self.incoming]
             return permute_configurations(inc_configs=inc_configs)
         else:
             # for a conjunction to be evaluated to false or disjunction to true, generate one configuration per incoming edge, where all other incoming nodes are evaluated to the opposite value (conjunction: true, disjunction: false) and only the respective incoming node is evaluated to the expected value (conjunction: false, disjunction: true) (adjust for negations)
             configurations = []
             for oddone in self.incoming:
-                inc_configs = [inc.origin.get_testcase_configuration((expected_outcome == inc.negated) if (
-                    inc != oddone) else (expected_outcome != inc.negated)) for inc in self.incoming]
-                configurations = configurations + \
-                    permute_configurations(inc_configs=inc_configs)
+                inc_configs = [get_configuration(inc.origin, (expected_outcome == inc.negated) if (
+                    inc != oddone) else (expected_outcome != inc.negated), cache) for inc in self.incoming]
+                configurations.extend(permute_configurations(inc_configs=inc_configs))
             return configurations
 
+    def stream_testcase_configurations(self, expected_outcome: bool) -> Iterator[dict]:
+        """Lazily generate the configurations of get_testcase_configuration in the same order. Only the configuration currently under construction is held in memory, such that arbitrarily large sets of configurations can be consumed one by one.
+
+        parameters:
+            expected_outcome -- the boolean value this intermediate node is expected to have
+
+        returns: iterator over configurations mapping leaf (Event) node ids to boolean values"""
+        if (expected_outcome == self.conjunction):
+            inc_streams = [partial(inc.origin.stream_testcase_configurations, expected_outcome != inc.negated) for inc in self.incoming]
+            yield from stream_permuted_configurations(inc_streams=inc_streams)
+        else:
+            for oddone in self.incoming:
+                inc_streams = [partial(inc.origin.stream_testcase_configurations, (expected_outcome == inc.negated) if (
+                    inc != oddone) else (expected_outcome != inc.negated)) for inc in self.incoming]
+                yield from stream_permuted_configurations(inc_streams=inc_streams)
+
+    def get_testcase_bitmasks(self, expected_outcome: bool, bits: dict[str, int], cache: 'ConfigurationCache' = None) -> list[tuple[int, int]]:
+        """Generate the configurations of get_testcase_configuration in the same order, but encode each configuration as a pair of bitmasks over a fixed ordering of the event nodes: the first bitmask contains the values of the event nodes, the second one marks the event nodes which are part of the configuration (all other event nodes are "don't care").
+
+        parameters:
+            expected_outcome -- the boolean value this intermediate node is expected to have
+            bits -- mapping from the ids of the event nodes to their position in the bitmasks
+            cache -- optional cache which memoizes the bitmasks of the incoming nodes, such that every incoming node is only evaluated once per expected outcome
+
+        returns: list of configurations as pairs of a value and a care bitmask"""
+        if (expected_outcome == self.conjunction):
+            inc_masks = [get_bitmasks(inc.origin, expected_outcome != inc.negated, bits, cache) for inc in self.incoming]
+            return permute_bitmasks(inc_masks=inc_masks)
+        else:
+            masks = []
+            for oddone in self.incoming:
+                inc_masks = [get_bitmasks(inc.origin, (expected_outcome == inc.negated) if (
+                    inc != oddone) else (expected_outcome != inc.negated), bits, cache) for inc in self.incoming]
+                masks.extend(permute_bitmasks(inc_masks=inc_masks))
+            return masks
+
+    def evaluate(self, configuration: dict) -> bool:
+        """Evaluate this intermediate node given the values of the leaf nodes connected to it.
+
+        parameters:
+            configuration -- mapping from leaf (Event) node ids to boolean values
+
+        returns: the boolean value of this node"""
+        inc_values = (inc.origin.evaluate(configuration) != inc.negated for inc in self.incoming)
+        return all(inc_values) if self.conjunction else any(inc_values)
+
     def is_equal(self, other, incoming: bool) -> bool:
         """Determine whether this node is equal to another node.
 
@@ -247,6 +315,70 @@ class IntermediateNode(Node):
         return result
 
 
+class ConfigurationCache:
+
+    def __init__(self):
+        """Create a cache which memoizes the configurations generated for a node given an expected outcome during one generation of test cases. Incoming nodes are evaluated repeatedly with the same expected outcome (e.g., once per sibling by a conjunction expected to be false), which the cache reduces to a single evaluation per node and expected outcome. The cached configurations are shared and must not be modified."""
+        self.configurations: dict[tuple[str, bool], list] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, node: Node, expected_outcome: bool, generate: Callable[[], list]) -> list:
+        """Obtain the configurations of a node given an expected outcome, generating them only if they are not cached yet.
+
+        parameters:
+            node -- node whose configurations are requested
+            expected_outcome -- the boolean value the node is expected to have
+            generate -- function generating the configurations in case they are not cached yet
+
+        returns: the (possibly cached) configurations of the node"""
+        key = (node.id, expected_outcome)
+        if key in self.configurations:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.configurations[key] = generate()
+        return self.configurations[key]
+
+    @property
+    def reuse_rate(self) -> float:
+        """Share of requests answered from the cache.
+
+        returns: share of cache hits among all requests between 0 and 1 (0 if the cache was never requested)"""
+        requests = self.hits + self.misses
+        return self.hits / requests if requests > 0 else 0.0
+
+
+def get_configuration(node: Node, expected_outcome: bool, cache: ConfigurationCache = None) -> list[dict]:
+    """Obtain the configurations of a node given an expected outcome via the cache, if one is given.
+
+    parameters:
+        node -- node whose configurations are requested
+        expected_outcome -- the boolean value the node is expected to have
+        cache -- optional cache memoizing the configurations
+
+    returns: list of configurations mapping leaf (Event) node ids to boolean values"""
+    # the configuration of an event node is cheaper to generate than to look up
+    if cache is None or type(node) == EventNode:
+        return node.get_testcase_configuration(expected_outcome)
+    return cache.get(node, expected_outcome, partial(node.get_testcase_configuration, expected_outcome, cache))
+
+
+def get_bitmasks(node: Node, expected_outcome: bool, bits: dict[str, int], cache: ConfigurationCache = None) -> list[tuple[int, int]]:
+    """Obtain the configurations of a node given an expected outcome as pairs of bitmasks via the cache, if one is given.
+
+    parameters:
+        node -- node whose configurations are requested
+        expected_outcome -- the boolean value the node is expected to have
+        bits -- mapping from the ids of the event nodes to their position in the bitmasks
+        cache -- optional cache memoizing the bitmasks (must not be shared with get_configuration)
+
+    returns: list of configurations as pairs of a value and a care bitmask"""
+    if cache is None or type(node) == EventNode:
+        return node.get_testcase_bitmasks(expected_outcome, bits)
+    return cache.get(node, expected_outcome, partial(node.get_testcase_bitmasks, expected_outcome, bits, cache))
+
+
 def permute_configurations(inc_configs: list) -> list[dict]:
     """Permute an automatically generated list of individual configurations for incoming nodes of an intermediate node. Every incoming node has 1..n individual configurations (at max 2^n, where n is the number of connected leaf nodes) which are permuted with all other individual configurations
 
@@ -255,6 +387,16 @@ def permute_configurations(inc_configs: list) -> list[dict]:
 
     returns: harmonized, permuted set of configurations of all incoming nodes"""
 
+    if len(inc_configs) > 1 and all(len(inc_config) > 0 for inc_config in inc_configs):
+        # merge each combination of individual configurations at once instead of merging the growing, partial configurations with every further incoming node
+        configurations = []
+        for combination in itertools.product(*inc_configs):
+            merged = {}
+            for config in combination:
+                merged.update(config)
+            configurations.append(merged)
+        return configurations
+
     configurations = []
     for inc_config in inc_configs:
         if len(configurations) == 0:
@@ -268,6 +410,52 @@ def permute_configurations(inc_configs: list) -> list[dict]:
     return configurations
 
 
+def permute_bitmasks(inc_masks: list[list[tuple[int, int]]]) -> list[tuple[int, int]]:
+    """Permute the individual configurations of the incoming nodes of an intermediate node like permute_configurations, where each configuration is encoded as a pair of a value and a care bitmask. Merging two configurations becomes a bitwise operation, where the values of the latter configuration take precedence (like in a merge of dictionaries).
+
+    parameters:
+        inc_masks -- individual configurations of the incoming nodes as pairs of bitmasks
+
+    returns: harmonized, permuted set of configurations of all incoming nodes as pairs of bitmasks"""
+    masks = []
+    for inc_mask in inc_masks:
+        if len(masks) == 0:
+            masks = inc_mask
+        else:
+            masks = [((values & ~inc_care) | inc_values, care | inc_care)
+                     for (values, care), (inc_values, inc_care) in itertools.product(masks, inc_mask)]
+    return masks
+
+
+def stream_permuted_configurations(inc_streams: list[Callable[[], Iterator[dict]]]) -> Iterator[dict]:
+    """Lazily permute the individual configurations of the incoming nodes of an intermediate node in the same order as permute_configurations. Instead of materializing the product of all individual configurations, the configurations of an incoming node are generated anew for every combination of configurations of the preceding incoming nodes, which trades repeated computation for constant memory.
+
+    parameters:
+        inc_streams -- one function per incoming node which starts a new iteration over its individual configurations
+
+    returns: iterator over the harmonized, permuted set of configurations of all incoming nodes"""
+    if len(inc_streams) == 0:
+        return
+
+    # maintain one iterator per incoming node whose configurations are currently iterated and the merged configuration of all preceding incoming nodes
+    iterators = [inc_streams[0]()]
+    prefixes = [{}]
+    while len(iterators) > 0:
+        configuration = next(iterators[-1], None)
+        if configuration is None:
+            # the configurations of the current incoming node are exhausted, continue with the next configuration of the preceding one
+            iterators.pop()
+            prefixes.pop()
+            continue
+
+        merged = prefixes[-1] | configuration
+        if len(iterators) == len(inc_streams):
+            yield merged
+        else:
+            iterators.append(inc_streams[len(iterators)]())
+            prefixes.append(merged)
+
+
 @dataclass
 class Edge:
     origin: Node = field(default=None)
@@ -291,17 +479,27 @@ class Graph:
     edges: list[Edge] = field(default_factory=list)
 
     def get_node(self, id: str):
-        """Find and return the node of this graph with the given id.
+        """Find and return the node of this graph with the given id. The node is looked up in an index of the positions of the nodes by their id, which is built on the first lookup and rebuilt whenever the list of nodes has been replaced or changed its length, the indexed position does not hold a node with the id anymore, or the id is missing from the index. Hence, the index never goes stale when the list of nodes is replaced or mutated in place.
 
         parameters:
             id -- identifier used by the node in question
 
         returns: the node within this graph with the given id, None if it does not exist"""
-        candidates = [node for node in self.nodes if node.id == id]
-        if len(candidates) == 0:
+        nodes: list[Node] = self.nodes if self.nodes is not None else []
+        index: dict[str, int] = getattr(self, '_node_index', None)
+        position = None
+        if index is not None and self._indexed_nodes is nodes and self._indexed_length == len(nodes):
+            position = index.get(id)
+
+        if position is None or nodes[position].id != id:
+            index = index_nodes(nodes)
+            self._node_index, self._indexed_nodes, self._indexed_length = index, nodes, len(nodes)
+            position = index.get(id)
+
+        if position is None:
             print(f'No node with id {id} found in {self.nodes}')
             return None
-        return candidates[0]
+        return nodes[position]
 
     def to_dict(self) -> dict:
         """Convert a graph into a dictionary object, effectively also replacing all cyclic dependencies (caused by edges) by references.
@@ -354,18 +552,34 @@ def from_dict(dict_graph: dict) -> Graph:
         else:
             nodes.append(EventNode(
                 id=node['id'], variable=node['variable'], condition=node['condition']))
+    graph = Graph(nodes=nodes, root=None, edges=[])
 
     # recover the edges
-    edges = []
     for edge in dict_graph['edges']:
-        origin = get_node_from_list(nodes, edge['origin'])
-        target = get_node_from_list(nodes, edge['target'])
-        edges.append(target.add_incoming(origin, negated=edge['negated']))
+        origin = graph.get_node(edge['origin'])
+        target = graph.get_node(edge['target'])
+        graph.edges.append(target.add_incoming(origin, negated=edge['negated']))
 
     # recover the root
-    root = get_node_from_list(nodes, dict_graph['root'])
+    graph.root = graph.get_node(dict_graph['root'])
+
+    return graph
+
+
+def index_nodes(nodelist: list[Node]) -> dict[str, int]:
+    """Index a list of nodes by their id. In case multiple nodes share the same id, the first one is indexed (as in get_node_from_list).
 
-    return Graph(nodes=nodes, root=root, edges=edges)
+    parameters:
+        nodelist -- list of nodes
+
+    returns: dictionary mapping the id of each node to its position in the list"""
+    index: dict[str, int] = {}
+    for position, node in enumerate(nodelist):
+        if node.id in index:
+            print(f'Warning: multiple nodes with the id {node.id} found')
+        else:
+            index[node.id] = position
+    return index
 
 
 def get_node_from_list(nodelist: list[Node], id: str):
@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
 
 
@@ -181,11 +182,74 @@ class EventLabel(Label):
         return f'[{self.begin}> ({self.id}) {self.name} {neighbor}: {children} <{self.end}]'
 
 
-def from_dict(serialized: list[dict]) -> list[Label]:
-    """Deserialization method converting a list of labels that are represented by dictionaries back into a list of of actual EventLabel and SubLabel objects. This process restores the cyclic relationships from the references in the dictionaries (i.e., recovers both parent-child and predecessor-successor relationships).
+class LabelIndex:
+
+    def __init__(self, labels: list[Label]):
+        """Create an index over the labels of a sentence, which sorts the labels by their position and thereby answers range queries (e.g., all labels contained within an event) in logarithmic instead of linear time. The index does not reflect changes to the list of labels after its creation.
+
+        parameters:
+            labels -- list of labels of a sentence"""
+        # remember the original position of each label to return query results in the order of the list of labels
+        self.order: dict[int, int] = {id(label): position for position, label in enumerate(labels)}
+        self.labels: list[Label] = sorted(labels, key=lambda label: label.begin)
+        self.begins: list[int] = [label.begin for label in self.labels]
+        self.positions: dict[tuple[str, int, int], list[Label]] = {}
+        for label in labels:
+            self.positions.setdefault((label.name, label.begin, label.end), []).append(label)
+
+    def within(self, begin: int, end: int) -> list[Label]:
+        """Obtain all labels which are contained within a range of the sentence.
+
+        parameters:
+            begin -- the starting index of the range
+            end -- the ending index of the range
+
+        returns: all labels starting at or after the beginning and ending at or before the end of the range (in the order of the list of labels)"""
+        candidates = self.labels[bisect_left(self.begins, begin):bisect_right(self.begins, end)]
+        return sorted([label for label in candidates if label.end <= end], key=lambda label: self.order[id(label)])
+
+    def at(self, type: str, begin: int, end: int) -> Label:
+        """Obtain a label by both its type and its position (begin and end), like get_label_by_type_and_position.
+
+        parameters:
+            type -- the name of the label (e.g., 'Condition', 'Negation', etc.)
+            begin -- the starting index of the label in the sentence
+            end -- the ending index of the label in the sentence
+
+        returns:
+            label -- label with the requested type and position if it exists,
+            None -- otherwise"""
+        candidates = self.positions.get((type, begin, end), [])
+        if len(candidates) == 0:
+            return None
+        if len(candidates) > 1:
+            print(f'Warning: searching for a {type} label at position [{begin}, {end}] yielded multiple results.')
+        return candidates[0]
+
+
+class LabelReferenceError(ValueError):
+
+    def __init__(self, reason: str, id: str):
+        """Create an error describing an invalid reference between serialized labels.
+
+        parameters:
+            reason -- either 'duplicate' (the id is used by multiple labels) or 'dangling' (the id is referenced but does not exist)
+            id -- the affected label id"""
+        super().__init__(f'{reason} label id {id}')
+        self.reason = reason
+        self.id = id
+
+
+DUPLICATE = 'duplicate'
+DANGLING = 'dangling'
+
+
+def from_dict(serialized: list[dict], strict: bool = False) -> list[Label]:
+    """Deserialization method converting a list of labels that are represented by dictionaries back into a list of of actual EventLabel and SubLabel objects. This process restores the cyclic relationships from the references in the dictionaries (i.e., recovers both parent-child and predecessor-successor relationships). All references are resolved via an index of the label ids, which takes linear time.
 
     parameters:
         serialized -- list of labels serialized to dictionaries
+        strict -- True if duplicate ids or references to non-existing ids shall raise a LabelReferenceError, otherwise the first label with a duplicate id is used and a warning is printed
 
     returns: list of actual Labels"""
 
@@ -198,18 +262,35 @@ def from_dict(serialized: list[dict]) -> list[Label]:
         else:
             labels.append(SubLabel(id=ser['id'], name=ser['name'], begin=ser['begin'], end=ser['end']))
 
+    # index both the serialized and the actual labels by their id, where the first label with an id takes precedence
+    serialized_by_id: dict[str, dict] = {}
+    labels_by_id: dict[str, Label] = {}
+    for ser, label in zip(serialized, labels):
+        if label.id in labels_by_id:
+            if strict:
+                raise LabelReferenceError(reason=DUPLICATE, id=label.id)
+            print(f'Warning: label id {label.id} is used by multiple labels')
+            continue
+        serialized_by_id[label.id] = ser
+        labels_by_id[label.id] = label
+
+    def resolve(id: str) -> Label:
+        if strict and id not in labels_by_id:
+            raise LabelReferenceError(reason=DANGLING, id=id)
+        return labels_by_id.get(id)
+
     # connect parents with their children
     for parent in [label for label in labels if type(label) == EventLabel]:
-        child_ids = get_serialized_label_by_id(serialized, parent.id)['children']
+        child_ids = serialized_by_id[parent.id]['children']
         for cid in child_ids:
-            child = get_label_by_id(labels, cid)
+            child = resolve(cid)
             parent.add_child(child)
 
     # connect events with their neighbors
     for event in [label for label in labels if type(label) == EventLabel]:
-        successor_info = get_serialized_label_by_id(serialized, event.id)['successor']
+        successor_info = serialized_by_id[event.id]['successor']
         if successor_info != None:
-            successor = get_label_by_id(labels, successor_info['id'])
+            successor = resolve(successor_info['id'])
             junctor = successor_info['junctor']
             event.set_successor(successor, junctor)
 
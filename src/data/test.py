@@ -1,4 +1,7 @@
 from dataclasses import dataclass, field, asdict
+from typing import Iterator
+
+import numpy as np
 from tabulate import tabulate
 
 
@@ -12,17 +15,72 @@ class Parameter:
         return self.variable == other.variable and self.condition == other.condition
 
 
+@dataclass
+class CaseMasks:
+    """Compact representation of a list of test cases, where each test case is encoded as a bitmask over a fixed ordering of parameters. The values bitmask contains the value of each parameter and the care bitmask marks the parameters which are part of the test case. Both bitmasks are stored as rows of bits packed into bytes (with the first parameter in the lowest bit), such that the number of parameters is not limited by the width of an integer type. The test cases behave like a list of dictionaries mapping parameter ids to boolean values, which are only expanded on access."""
+    parameters: list[str]
+    values: np.ndarray
+    care: np.ndarray
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def __getitem__(self, index: int | slice) -> dict | list[dict]:
+        if isinstance(index, slice):
+            return self.expand(self.values[index], self.care[index])
+        # normalize negative indices and reject indices out of range like a list
+        index = range(len(self))[index]
+        return self.expand(self.values[index:index+1], self.care[index:index+1])[0]
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.expand(self.values, self.care))
+
+    def expand(self, values: np.ndarray, care: np.ndarray) -> list[dict]:
+        """Expand packed bitmasks into test cases.
+
+        parameters:
+            values -- packed values bitmasks (one row per test case)
+            care -- packed care bitmasks (one row per test case)
+
+        returns: list of test cases mapping parameter ids to boolean values"""
+        values = np.unpackbits(values, axis=1, count=len(self.parameters), bitorder='little').astype(bool)
+        care = np.unpackbits(care, axis=1, count=len(self.parameters), bitorder='little').astype(bool)
+        return [{self.parameters[index]: bool(case_values[index]) for index in np.flatnonzero(case_care)}
+                for case_values, case_care in zip(values, care)]
+
+
+def to_case_masks(parameters: list[str], masks: list[tuple[int, int]]) -> CaseMasks:
+    """Pack test cases encoded as pairs of integer bitmasks into a compact representation.
+
+    parameters:
+        parameters -- ids of the parameters in the order of the bits
+        masks -- test cases as pairs of a values and a care bitmask, where bit i refers to the i-th parameter
+
+    returns: the test cases as a CaseMasks object"""
+    width = max((len(parameters) + 7) // 8, 1)
+    values = np.frombuffer(b''.join(value.to_bytes(width, 'little') for value, _ in masks), dtype=np.uint8).reshape(len(masks), width)
+    care = np.frombuffer(b''.join(care.to_bytes(width, 'little') for _, care in masks), dtype=np.uint8).reshape(len(masks), width)
+    return CaseMasks(parameters=parameters, values=values, care=care)
+
+
 @dataclass
 class Suite:
     conditions: list[Parameter] = field(default_factory=list)
     expected: list[Parameter] = field(default_factory=list)
 
-    cases: list[dict] = field(default_factory=list)
+    # the test cases are either a list of dictionaries or their compact representation (which is expanded on access)
+    cases: list[dict] | CaseMasks = field(default_factory=list)
 
     def to_dict(self) -> dict:
         """Convert a dataclass object into a simple dictionary
 
         returns: test suite as a dictionary"""
+        if isinstance(self.cases, CaseMasks):
+            return {
+                'conditions': [asdict(parameter) for parameter in self.conditions],
+                'expected': [asdict(parameter) for parameter in self.expected],
+                'cases': list(self.cases)
+            }
         return asdict(self)
 
     def get_parameter(self, id: str) -> Parameter:
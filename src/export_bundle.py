@@ -0,0 +1,71 @@
+import argparse
+import os
+
+import dotenv
+from transformers import BertTokenizerFast
+
+import src.util.constants as consts
+from src.classifiers.causalitydetection.causalclassifier import CausalClassifier, CLASS_NAMES, PRE_TRAINED_MODEL_NAME
+from src.converters.sentencetolabels.labeler import Labeler, DROPOUT_RATE, MODEL_TO_USE
+from src.util.bundle import CLASSIFIER, LABELER, write_bundle
+
+DEFAULT_OUTPUT = 'model/cira.safetensors'
+
+
+def export(classifier_path: str, labeler_path: str, output: str = DEFAULT_OUTPUT):
+    """Pack the fine-tuned classification and labeling models, their tokenizers, and a manifest into one model bundle, which can be loaded by the CiRAConverter without unpickling the checkpoints or contacting the model hub.
+
+    parameters:
+        classifier_path -- path to the pre-trained classification model
+        labeler_path -- path to the pre-trained labeling model
+        output -- location of the bundle file"""
+    classifier = CausalClassifier(model_path=classifier_path)
+    labeler = Labeler(model_path=labeler_path)
+
+    # the classifier uses the slow tokenizer, which does not have a serializable counterpart, hence the equivalent fast tokenizer is exported
+    classifier_tokenizer = BertTokenizerFast.from_pretrained(PRE_TRAINED_MODEL_NAME)
+
+    manifest = {
+        CLASSIFIER: {
+            'base_model': PRE_TRAINED_MODEL_NAME,
+            'checkpoint': os.path.basename(classifier_path),
+            'classes': CLASS_NAMES
+        },
+        LABELER: {
+            'base_model': MODEL_TO_USE,
+            'checkpoint': os.path.basename(labeler_path),
+            'labels': consts.LABEL_IDS,
+            'dropout': DROPOUT_RATE
+        }
+    }
+
+    write_bundle(output, manifest=manifest, components={
+        CLASSIFIER: (
+            classifier.model.state_dict(),
+            classifier.model.bert.config.to_json_string(),
+            classifier_tokenizer.backend_tokenizer.to_str()),
+        LABELER: (
+            labeler.model.state_dict(),
+            labeler.model.bert.config.to_json_string(),
+            labeler.tokenizer.backend_tokenizer.to_str())
+    })
+
+
+def main():
+    dotenv.load_dotenv()
+
+    parser = argparse.ArgumentParser(description='Export the CiRA language models into a single model bundle')
+    parser.add_argument('--classifier', default=os.getenv('MODEL_CLASSIFICATION'), help='path to the classification model (default: MODEL_CLASSIFICATION)')
+    parser.add_argument('--labeler', default=os.getenv('MODEL_LABELING'), help='path to the labeling model (default: MODEL_LABELING)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help=f'location of the bundle file (default: {DEFAULT_OUTPUT})')
+    args = parser.parse_args()
+
+    if args.classifier is None or args.labeler is None:
+        parser.error('the locations of both the classification and the labeling model are required')
+
+    export(classifier_path=args.classifier, labeler_path=args.labeler, output=args.output)
+    print(f'Exported model bundle to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
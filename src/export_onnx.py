@@ -0,0 +1,58 @@
+import argparse
+import os
+
+import dotenv
+
+from src.classifiers.causalitydetection.causalclassifier import CausalClassifier, MAX_LENGTH, TENSOR_TYPE_PYTORCH
+from src.converters.sentencetolabels.labeler import Labeler
+from src.converters.sentencetolabels.model import LogitsModel
+from src.util.bundle import ModelBundle
+from src.util.onnxbackend import CLASSIFIER_FILE, DEFAULT_DIR, LABELER_FILE, export as export_model
+
+# sentences only used to trace the models, their batch size and length are dynamic in the exported models
+EXAMPLE_SENTENCES = [
+    'If the button is pressed, the system shuts down.',
+    'The system shall display a warning unless the user is an administrator.'
+]
+
+
+def export(classifier_path: str = None, labeler_path: str = None, bundle_path: str = None, output: str = DEFAULT_DIR):
+    """Export the fine-tuned classification and labeling models to ONNX, such that they can be executed by ONNX Runtime via the 'onnx' backend of the CiRAConverter.
+
+    parameters:
+        classifier_path -- path to the pre-trained classification model
+        labeler_path -- path to the pre-trained labeling model
+        bundle_path -- path to a model bundle containing both models (replaces the two model paths)
+        output -- directory of the exported models"""
+    bundle = ModelBundle(bundle_path) if bundle_path is not None else None
+    classifier = CausalClassifier(model_path=classifier_path, bundle=bundle)
+    labeler = Labeler(model_path=labeler_path, bundle=bundle)
+
+    os.makedirs(output, exist_ok=True)
+
+    encoded = classifier.tokenizer(EXAMPLE_SENTENCES, max_length=MAX_LENGTH, padding='longest', truncation=True, return_token_type_ids=False, return_tensors=TENSOR_TYPE_PYTORCH)
+    export_model(classifier.model.cpu(), os.path.join(output, CLASSIFIER_FILE), encoded['input_ids'], encoded['attention_mask'])
+
+    encoded = labeler.tokenizer(EXAMPLE_SENTENCES, max_length=labeler.max_len, padding='longest', truncation=True, return_tensors=TENSOR_TYPE_PYTORCH)
+    export_model(LogitsModel(labeler.model.cpu()), os.path.join(output, LABELER_FILE), encoded['input_ids'], encoded['attention_mask'], token_logits=True)
+
+
+def main():
+    dotenv.load_dotenv()
+
+    parser = argparse.ArgumentParser(description='Export the CiRA language models to ONNX')
+    parser.add_argument('--classifier', default=os.getenv('MODEL_CLASSIFICATION'), help='path to the classification model (default: MODEL_CLASSIFICATION)')
+    parser.add_argument('--labeler', default=os.getenv('MODEL_LABELING'), help='path to the labeling model (default: MODEL_LABELING)')
+    parser.add_argument('--bundle', default=os.getenv('MODEL_BUNDLE'), help='path to a model bundle containing both models (default: MODEL_BUNDLE)')
+    parser.add_argument('--output', default=DEFAULT_DIR, help=f'directory of the exported models (default: {DEFAULT_DIR})')
+    args = parser.parse_args()
+
+    if args.bundle is None and (args.classifier is None or args.labeler is None):
+        parser.error('either a model bundle or the locations of both the classification and the labeling model are required')
+
+    export(classifier_path=args.classifier, labeler_path=args.labeler, bundle_path=args.bundle, output=args.output)
+    print(f'Exported ONNX models to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -16,6 +16,19 @@ def __load_model_env(model: str) -> str:
     raise NameError(f'Unable to locate model from env {model}')
 
 
+def __load_optional_model_env(model: str) -> str:
+    try:
+        return __load_model_env(model)
+    except NameError:
+        return None
+
+
 dotenv.load_dotenv()
-LABELING = __load_model_env('MODEL_LABELING')
-CLASSIFICATION = __load_model_env('MODEL_CLASSIFICATION')
+# a model bundle contains both models, which makes the individual models optional
+BUNDLE = __load_optional_model_env('MODEL_BUNDLE')
+if BUNDLE is None:
+    LABELING = __load_model_env('MODEL_LABELING')
+    CLASSIFICATION = __load_model_env('MODEL_CLASSIFICATION')
+else:
+    LABELING = __load_optional_model_env('MODEL_LABELING')
+    CLASSIFICATION = __load_optional_model_env('MODEL_CLASSIFICATION')
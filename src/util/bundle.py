@@ -0,0 +1,78 @@
+import json
+
+import torch
+from safetensors import safe_open
+from safetensors.torch import save_file
+
+BUNDLE_VERSION = 1
+MANIFEST = 'manifest'
+
+# components contained in a bundle
+CLASSIFIER = 'classifier'
+LABELER = 'labeler'
+
+
+class ModelBundle:
+
+    def __init__(self, path: str):
+        """Open a model bundle, i.e., a single safetensors file containing the weights of the fine-tuned language models together with their configurations, their tokenizers, and a manifest. The tensors are read via a memory map and no pickled objects are involved.
+
+        parameters:
+            path -- location of the bundle file"""
+        self.path = path
+        with safe_open(path, framework='pt') as bundle:
+            self.metadata: dict = bundle.metadata() or {}
+
+        if MANIFEST not in self.metadata:
+            raise ValueError(f'{path} is not a CiRA model bundle (missing manifest)')
+        self.manifest: dict = json.loads(self.metadata[MANIFEST])
+        if self.manifest.get('bundle_version') != BUNDLE_VERSION:
+            raise ValueError(f'Unsupported bundle version {self.manifest.get("bundle_version")} in {path} (expected {BUNDLE_VERSION})')
+
+    def state_dict(self, component: str) -> dict[str, torch.Tensor]:
+        """Obtain the weights of one component of the bundle.
+
+        parameters:
+            component -- name of the component (e.g., 'classifier' or 'labeler')
+
+        returns: state dict of the component's model"""
+        prefix = f'{component}.'
+        with safe_open(self.path, framework='pt', device='cpu') as bundle:
+            return {key[len(prefix):]: bundle.get_tensor(key) for key in bundle.keys() if key.startswith(prefix)}
+
+    def config(self, component: str) -> dict:
+        """Obtain the configuration of the transformer model of one component.
+
+        parameters:
+            component -- name of the component (e.g., 'classifier' or 'labeler')
+
+        returns: model configuration as a dictionary"""
+        return json.loads(self.metadata[f'{component}.config'])
+
+    def tokenizer(self, component: str) -> str:
+        """Obtain the tokenizer of one component.
+
+        parameters:
+            component -- name of the component (e.g., 'classifier' or 'labeler')
+
+        returns: serialized tokenizer (content of a tokenizer.json file)"""
+        return self.metadata[f'{component}.tokenizer']
+
+
+def write_bundle(path: str, manifest: dict, components: dict[str, tuple[dict, str, str]]):
+    """Write a model bundle to a single safetensors file.
+
+    parameters:
+        path -- location of the bundle file
+        manifest -- information about the bundle and its components (the bundle version is added automatically)
+        components -- mapping from the name of each component to its state dict, its model configuration (as JSON), and its serialized tokenizer"""
+    tensors: dict[str, torch.Tensor] = {}
+    metadata: dict[str, str] = {MANIFEST: json.dumps(manifest | {'bundle_version': BUNDLE_VERSION})}
+
+    for component, (state_dict, config, tokenizer) in components.items():
+        for key, tensor in state_dict.items():
+            tensors[f'{component}.{key}'] = tensor.detach().cpu().contiguous()
+        metadata[f'{component}.config'] = config
+        metadata[f'{component}.tokenizer'] = tokenizer
+
+    save_file(tensors, path, metadata=metadata)
@@ -0,0 +1,67 @@
+import numpy as np
+import torch
+
+# inference backends of the language models
+TORCH = 'torch'
+ONNX = 'onnx'
+BACKENDS = [TORCH, ONNX]
+
+INPUT_NAMES = ['input_ids', 'attention_mask']
+OUTPUT_NAME = 'logits'
+OPSET_VERSION = 14
+CPU_PROVIDER = 'CPUExecutionProvider'
+
+DEFAULT_DIR = 'model/onnx'
+# files of the exported models within the ONNX directory
+CLASSIFIER_FILE = 'classifier.onnx'
+LABELER_FILE = 'labeler.onnx'
+
+
+def export(model: torch.nn.Module, path: str, input_ids: torch.Tensor, attention_mask: torch.Tensor, token_logits: bool = False):
+    """Export a model which maps token ids and an attention mask to logits to the ONNX format. The batch and sequence dimensions of the inputs and outputs remain dynamic, such that the exported model accepts any number of sentences of any length.
+
+    parameters:
+        model -- model used for inference only
+        path -- location of the ONNX file
+        input_ids -- exemplary token ids (only used to trace the model)
+        attention_mask -- exemplary attention mask (only used to trace the model)
+        token_logits -- True if the model produces logits for every token (e.g., the labeling model) rather than for every sentence (e.g., the classification model)"""
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in INPUT_NAMES}
+    dynamic_axes[OUTPUT_NAME] = {0: 'batch', 1: 'sequence'} if token_logits else {0: 'batch'}
+    model.eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (input_ids, attention_mask),
+            path,
+            input_names=INPUT_NAMES,
+            output_names=[OUTPUT_NAME],
+            dynamic_axes=dynamic_axes,
+            opset_version=OPSET_VERSION)
+
+
+class OnnxModel:
+
+    def __init__(self, path: str):
+        """Load a model exported to the ONNX format into an ONNX Runtime session using the CPU execution provider. The model can be called like the original PyTorch model, i.e., with tensors of token ids and an attention mask.
+
+        parameters:
+            path -- location of the ONNX file"""
+        # onnxruntime is an optional dependency which is only required for this backend
+        import onnxruntime
+        self.session = onnxruntime.InferenceSession(path, providers=[CPU_PROVIDER])
+
+    def __call__(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        """Apply the model to a batch of tokenized sentences.
+
+        parameters:
+            input_ids -- token ids (one row per sentence)
+            attention_mask -- attention mask (one row per sentence)
+
+        returns: the logits produced by the model"""
+        inputs = {
+            'input_ids': input_ids.cpu().numpy().astype(np.int64),
+            'attention_mask': attention_mask.cpu().numpy().astype(np.int64)
+        }
+        logits, = self.session.run([OUTPUT_NAME], inputs)
+        return torch.from_numpy(logits)
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from src.api.batcher import MicroBatcher
+
+
+class Recorder:
+    def __init__(self):
+        self.batches = []
+
+    async def process(self, items: list) -> list:
+        self.batches.append(items)
+        return [item*2 for item in items]
+
+
+@pytest.mark.unit
+def test_single_item():
+    recorder = Recorder()
+    batcher = MicroBatcher(recorder.process, window=0.001, max_batch_size=4)
+
+    result = asyncio.run(batcher.submit(1))
+    assert result == 2
+    assert recorder.batches == [[1]]
+
+
+@pytest.mark.unit
+def test_window():
+    # concurrent items submitted within the window are processed in one batch and each caller receives its own result
+    recorder = Recorder()
+    batcher = MicroBatcher(recorder.process, window=0.05, max_batch_size=16)
+
+    async def submit_all():
+        return await asyncio.gather(*[batcher.submit(item) for item in range(5)])
+
+    results = asyncio.run(submit_all())
+    assert results == [0, 2, 4, 6, 8]
+    assert recorder.batches == [[0, 1, 2, 3, 4]]
+
+
+@pytest.mark.unit
+def test_max_batch_size():
+    # a batch is processed as soon as it reaches its maximum size
+    recorder = Recorder()
+    batcher = MicroBatcher(recorder.process, window=10, max_batch_size=2)
+
+    async def submit_all():
+        return await asyncio.wait_for(asyncio.gather(*[batcher.submit(item) for item in range(4)]), timeout=1)
+
+    results = asyncio.run(submit_all())
+    assert results == [0, 2, 4, 6]
+    assert recorder.batches == [[0, 1], [2, 3]]
+
+
+@pytest.mark.unit
+def test_exception():
+    # a failure during the processing of a batch is propagated to every caller of that batch
+    async def fail(items: list) -> list:
+        raise ValueError('failed')
+
+    batcher = MicroBatcher(fail, window=0.001, max_batch_size=4)
+
+    async def submit_all():
+        return await asyncio.gather(*[batcher.submit(item) for item in range(2)], return_exceptions=True)
+
+    results = asyncio.run(submit_all())
+    assert all(type(result) == ValueError for result in results)
+
+
+@pytest.mark.unit
+def test_result_count_mismatch():
+    # a batch function returning fewer results than items must not leave any caller waiting
+    async def drop_last(items: list) -> list:
+        return items[:-1]
+
+    batcher = MicroBatcher(drop_last, window=0.001, max_batch_size=4)
+
+    async def submit_all():
+        return await asyncio.wait_for(asyncio.gather(*[batcher.submit(item) for item in range(3)], return_exceptions=True), timeout=1)
+
+    results = asyncio.run(submit_all())
+    assert all(type(result) == ValueError for result in results)
+
+
+@pytest.mark.unit
+def test_tasks_released():
+    # running batches are referenced by the batcher until they are done
+    recorder = Recorder()
+    batcher = MicroBatcher(recorder.process, window=0.001, max_batch_size=4)
+
+    async def submit_all():
+        results = await asyncio.gather(*[batcher.submit(item) for item in range(2)])
+        await asyncio.sleep(0)
+        return results
+
+    assert asyncio.run(submit_all()) == [0, 2]
+    assert batcher.tasks == set()
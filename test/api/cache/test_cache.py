@@ -0,0 +1,82 @@
+import pytest
+
+from src.api.cache import LRUCache, SQLiteCache, ResultCache, key, fingerprint
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def cache(request, tmp_path) -> ResultCache:
+    if request.param == 'memory':
+        return LRUCache(max_size=10)
+    return SQLiteCache(path=str(tmp_path / 'cache.sqlite'))
+
+
+@pytest.mark.unit
+def test_key():
+    # keys are deterministic and depend on every content
+    assert key('sentence', 'model') == key('sentence', 'model')
+    assert key('sentence', 'model') != key('sentence', 'other model')
+    assert key('sentence', 'model') != key('other sentence', 'model')
+    assert key({'a': 1, 'b': 2}) == key({'b': 2, 'a': 1})
+
+
+@pytest.mark.unit
+def test_fingerprint(tmp_path):
+    checkpoint = tmp_path / 'model.bin'
+    checkpoint.write_bytes(b'weights')
+    original = fingerprint(str(checkpoint))
+
+    # replacing the checkpoint changes its fingerprint
+    checkpoint.write_bytes(b'other weights')
+    assert fingerprint(str(checkpoint)) != original
+
+
+@pytest.mark.unit
+def test_get_put(cache: ResultCache):
+    assert cache.get('labels', 'k') is None
+
+    cache.put('labels', 'k', [{'id': 'L0', 'name': 'Cause1', 'begin': 0, 'end': 5}])
+    assert cache.get('labels', 'k') == [{'id': 'L0', 'name': 'Cause1', 'begin': 0, 'end': 5}]
+
+
+@pytest.mark.unit
+def test_stages_independent(cache: ResultCache):
+    # the same key can be used by different stages without interfering
+    cache.put('labels', 'k', [])
+    cache.put('graph', 'k', {'nodes': []})
+
+    assert cache.get('labels', 'k') == []
+    assert cache.get('graph', 'k') == {'nodes': []}
+    assert cache.get('suite', 'k') is None
+
+
+@pytest.mark.unit
+def test_statistics(cache: ResultCache):
+    cache.get('classify', 'k')
+    cache.put('classify', 'k', [True, 0.99])
+    cache.get('classify', 'k')
+    cache.get('classify', 'k')
+
+    assert cache.statistics() == {'hits': {'classify': 2}, 'misses': {'classify': 1}, 'size': 1}
+
+
+@pytest.mark.unit
+def test_lru_eviction():
+    cache = LRUCache(max_size=2)
+    cache.put('labels', 'a', 1)
+    cache.put('labels', 'b', 2)
+
+    # accessing an entry makes it the most recently used one
+    cache.get('labels', 'a')
+    cache.put('labels', 'c', 3)
+
+    assert cache.get('labels', 'a') == 1
+    assert cache.get('labels', 'b') is None
+    assert cache.get('labels', 'c') == 3
+
+
+@pytest.mark.unit
+def test_sqlite_persistent(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    SQLiteCache(path=path).put('suite', 'k', {'cases': []})
+
+    assert SQLiteCache(path=path).get('suite', 'k') == {'cases': []}
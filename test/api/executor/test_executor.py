@@ -0,0 +1,143 @@
+import asyncio
+import gc
+import threading
+
+import pytest
+
+from src.api.executor import InferenceExecutor, InferenceQueueFullError
+
+
+@pytest.mark.unit
+def test_run():
+    executor = InferenceExecutor(workers=1, queue_depth=0)
+    result = asyncio.run(executor.run(lambda a, b: a + b, 1, b=2))
+    assert result == 3
+
+
+@pytest.mark.unit
+def test_run_exception():
+    # an exception raised by the function is propagated to the caller and frees the slot of the call
+    def fail():
+        raise ValueError('failed')
+
+    executor = InferenceExecutor(workers=1, queue_depth=0)
+    with pytest.raises(ValueError):
+        asyncio.run(executor.run(fail))
+    assert asyncio.run(executor.run(lambda: True))
+
+
+@pytest.mark.unit
+def test_queue_full():
+    # once all workers are busy and the queue is full, further calls are rejected immediately
+    release = threading.Event()
+
+    async def saturate():
+        executor = InferenceExecutor(workers=1, queue_depth=1)
+        running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(InferenceQueueFullError):
+            await executor.run(lambda: True)
+
+        release.set()
+        await asyncio.gather(*running)
+
+        # after the calls have finished, the executor accepts new calls again
+        return await executor.run(lambda: True)
+
+    assert asyncio.run(saturate())
+
+
+@pytest.mark.unit
+def test_event_loop_responsive():
+    # while the only worker is blocked, the event loop keeps processing other coroutines
+    release = threading.Event()
+
+    async def blocked():
+        executor = InferenceExecutor(workers=1, queue_depth=0)
+        running = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.01)
+
+        responsive = not running.done()
+        release.set()
+        await running
+        return responsive
+
+    assert asyncio.run(blocked())
+
+
+@pytest.mark.unit
+def test_stream():
+    # an iteration occupies one slot from its start to its end
+    executor = InferenceExecutor(workers=1, queue_depth=0)
+
+    async def consume():
+        items = []
+        async for item in executor.stream(iter(range(3))):
+            items.append(item)
+            with pytest.raises(InferenceQueueFullError):
+                await executor.run(lambda: True)
+        return items
+
+    assert asyncio.run(consume()) == [0, 1, 2]
+    assert asyncio.run(executor.run(lambda: True))
+
+
+@pytest.mark.unit
+def test_stream_queue_full():
+    # a full queue rejects the iteration before any item is produced
+    executor = InferenceExecutor(workers=1, queue_depth=0)
+    executor.slots.acquire()
+
+    with pytest.raises(InferenceQueueFullError):
+        executor.stream(iter(range(3)))
+
+    executor.slots.release()
+
+
+@pytest.mark.unit
+def test_stream_exception():
+    # an exception raised by the iterator is propagated to the consumer and frees the slot of the iteration
+    def fail():
+        yield 1
+        raise ValueError('failed')
+
+    executor = InferenceExecutor(workers=1, queue_depth=0)
+
+    async def consume():
+        return [item async for item in executor.stream(fail())]
+
+    with pytest.raises(ValueError):
+        asyncio.run(consume())
+    assert asyncio.run(executor.run(lambda: True))
+
+
+@pytest.mark.unit
+def test_stream_never_iterated():
+    # a stream which is closed or discarded before its first item still frees its slot
+    executor = InferenceExecutor(workers=1, queue_depth=0)
+
+    async def close():
+        await executor.stream(iter(range(3))).aclose()
+        return await executor.run(lambda: True)
+
+    assert asyncio.run(close())
+
+    executor.stream(iter(range(3)))
+    gc.collect()
+    assert asyncio.run(executor.run(lambda: True))
+
+
+@pytest.mark.unit
+def test_stream_closed_early():
+    # a stream which is closed after some items frees its slot exactly once
+    executor = InferenceExecutor(workers=1, queue_depth=1)
+
+    async def consume():
+        stream = executor.stream(iter(range(3)))
+        assert await stream.__anext__() == 0
+        await stream.aclose()
+        await stream.aclose()
+        return await asyncio.gather(executor.run(lambda: 1), executor.run(lambda: 2))
+
+    assert asyncio.run(consume()) == [1, 2]
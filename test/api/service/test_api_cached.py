@@ -0,0 +1,144 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import unittest.mock as mock
+from unittest.mock import patch
+
+from src.api.service import CiRAServiceImpl
+from src.api.cache import LRUCache
+
+from src.data.labels import SubLabel
+from src.data.graph import Graph, EventNode
+from src.data.test import Suite, Parameter
+
+sentence = "If the button is pressed then the system shuts down."
+
+labels = [SubLabel(id='L1', name='Variable', begin=10, end=15)]
+labels_serialized = [{'id': 'L1', 'name': 'Variable', 'begin': 10, 'end': 15, 'parent': None}]
+
+nodes = [EventNode(id='c', variable='the button', condition='is pressed'), EventNode(
+    id='e', variable='the system', condition='shuts down')]
+edge = nodes[1].add_incoming(nodes[0])
+graph = Graph(nodes=nodes, root=nodes[0], edges=[edge])
+
+suite = Suite(
+    conditions=[Parameter(id='c', variable='the button', condition='is pressed')],
+    expected=[Parameter(id='e', variable='the system', condition='shuts down')],
+    cases=[{'c': True, 'e': True}, {'c': False, 'e': False}]
+)
+
+
+@pytest.fixture
+@patch('src.api.service.CiRAConverter', autospec=True)
+def cachedService(converter) -> CiRAServiceImpl:
+    # mock the CiRAConverter to count how often each stage is actually computed
+    mockedConverter = mock.MagicMock()
+    mockedConverter.classify.return_value = (True, 0.84)
+    mockedConverter.classify_batch.side_effect = lambda sentences: [(True, 0.84) for _ in sentences]
+    mockedConverter.label.return_value = labels
+    mockedConverter.label_batch.side_effect = lambda sentences: [labels for _ in sentences]
+    mockedConverter.graph.return_value = graph
+    mockedConverter.testsuite.return_value = suite
+    mockedConverter.process_labeled.return_value = (labels, graph, suite)
+
+    converter.return_value = mockedConverter
+    return CiRAServiceImpl(model_classification=None, model_labeling=None, cache=LRUCache())
+
+
+@pytest.mark.unit
+def test_classify_cached(cachedService):
+    first = cachedService.classify(sentence)
+    second = cachedService.classify(sentence)
+
+    assert first == second == (True, 0.84)
+    assert cachedService.cira.classify.call_count == 1
+    assert cachedService.cache_statistics()['hits'] == {'classify': 1}
+
+
+@pytest.mark.unit
+def test_classify_batch_only_misses(cachedService):
+    cachedService.classify(sentence)
+    classifications = cachedService.classify_batch([sentence, 'Another sentence.'])
+
+    assert classifications == [(True, 0.84), (True, 0.84)]
+    # only the sentence which was not yet cached is classified
+    cachedService.cira.classify_batch.assert_called_once_with(['Another sentence.'])
+
+
+@pytest.mark.unit
+def test_labels_reused_by_graph(cachedService):
+    assert cachedService.sentence_to_labels(sentence) == labels_serialized
+    cachedService.sentence_to_graph(sentence, labels=None)
+    cachedService.sentence_to_graph(sentence, labels=None)
+
+    # the graph reuses the cached labels and is only generated once
+    assert cachedService.cira.label.call_count == 1
+    assert cachedService.cira.graph.call_count == 1
+
+
+@pytest.mark.unit
+def test_graph_keyed_by_labels(cachedService):
+    cachedService.sentence_to_graph(sentence, labels=labels_serialized)
+    cachedService.sentence_to_graph(sentence, labels=labels)
+    cachedService.sentence_to_graph(sentence, labels=[{'id': 'L1', 'name': 'Variable', 'begin': 10, 'end': 16, 'parent': None}])
+
+    # serialized and actual labels share the same entry, different labels produce a new entry
+    assert cachedService.cira.graph.call_count == 2
+
+
+@pytest.mark.unit
+def test_suite_cached(cachedService):
+    first = cachedService.graph_to_test(graph=graph, sentence=sentence)
+    second = cachedService.graph_to_test(graph=graph.to_dict(), sentence=sentence)
+
+    assert first == second == suite.to_dict()
+    assert cachedService.cira.testsuite.call_count == 1
+
+
+@pytest.mark.unit
+def test_process_stream_cached(cachedService):
+    first = cachedService.process_batch([sentence])
+    second = cachedService.process_batch([sentence])
+
+    assert first == second
+    # the second run is completely served from the cache
+    assert cachedService.cira.classify_batch.call_count == 1
+    assert cachedService.cira.process_labeled.call_count == 1
+
+    # the individual stages are reusable by the single-sentence methods
+    assert cachedService.sentence_to_labels(sentence) == labels_serialized
+    assert cachedService.cira.label.call_count == 0
+
+
+@pytest.mark.unit
+def test_duplicates_in_batch(cachedService):
+    # identical sentences within one batch are only labeled once
+    labels = cachedService.sentences_to_labels([sentence, 'Another sentence.', sentence])
+
+    assert labels == [labels_serialized]*3
+    cachedService.cira.label_batch.assert_called_once_with([sentence, 'Another sentence.'])
+
+
+@pytest.mark.unit
+def test_concurrent_requests_coalesced(cachedService):
+    # concurrent requests for the same sentence and stage share one computation
+    release = threading.Event()
+
+    def label(sentence):
+        release.wait()
+        return labels
+    cachedService.cira.label.side_effect = label
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(cachedService.sentence_to_labels, sentence)
+        while cachedService.flights.in_flight() == 0:
+            time.sleep(0.001)
+        followers = [pool.submit(cachedService.sentence_to_labels, sentence) for _ in range(3)]
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in [leader] + followers]
+
+    assert results == [labels_serialized]*4
+    assert cachedService.cira.label.call_count == 1
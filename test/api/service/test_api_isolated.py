@@ -4,7 +4,7 @@ from unittest.mock import patch
 
 from src.api.service import CiRAServiceImpl
 
-from src.data.labels import SubLabel
+from src.data.labels import LabelReferenceError, SubLabel
 from src.data.graph import Graph, EventNode
 from src.data.test import Suite, Parameter
 
@@ -49,9 +49,12 @@ def isolatedService(converter) -> CiRAServiceImpl:
     # mock the CiRAConverter to isolate the system under test from it
     mockedConverter = mock.MagicMock()
     mockedConverter.classify.return_value = classification
+    mockedConverter.classify_batch.side_effect = lambda sentences: [classification if candidate == sentence else (False, 0.91) for candidate in sentences]
     mockedConverter.label.return_value = labels
+    mockedConverter.label_batch.return_value = [labels, []]
     mockedConverter.graph.return_value = graph
     mockedConverter.testsuite.return_value = suite
+    mockedConverter.process_labeled.return_value = (labels, graph, suite)
 
     # plug the mocked converter into the SUT
     converter.return_value = mockedConverter
@@ -71,6 +74,18 @@ def test_sentence_to_labels(isolatedService):
     assert labels == labels_serialized
 
 
+@pytest.mark.unit
+def test_classify_batch(isolatedService):
+    classifications = isolatedService.classify_batch([sentence, sentence])
+    assert classifications == [classification, classification]
+
+
+@pytest.mark.unit
+def test_sentences_to_labels(isolatedService):
+    labels = isolatedService.sentences_to_labels([sentence, 'The system uses a broker pattern.'])
+    assert labels == [labels_serialized, []]
+
+
 @pytest.mark.unit
 def test_sentence_to_graph_unlabeled(isolatedService):
     graph = isolatedService.sentence_to_graph(sentence, labels=None)
@@ -101,3 +116,41 @@ def test_graph_to_test_from_graph(isolatedService):
 def test_graph_to_test_from_dictgraph(isolatedService):
     generated_suite = isolatedService.graph_to_test(graph=graph_serialized, sentence=sentence)
     assert generated_suite == suite_serialized
+
+
+@pytest.mark.unit
+def test_process_batch(isolatedService):
+    results = isolatedService.process_batch([sentence, 'The system uses a broker pattern.'])
+    assert results == [
+        {'sentence': sentence, 'causal': True, 'confidence': 0.84, 'labels': labels_serialized, 'graph': graph_serialized, 'suite': suite_serialized, 'error': None},
+        {'sentence': 'The system uses a broker pattern.', 'causal': False, 'confidence': 0.91, 'labels': None, 'graph': None, 'suite': None, 'error': None}
+    ]
+
+
+@pytest.mark.unit
+def test_process_batch_failing_sentence(isolatedService):
+    # a sentence whose graph cannot be generated is reported without failing the other sentences
+    with patch.object(isolatedService.cira, 'process_labeled', side_effect=[LabelReferenceError(reason='dangling', id='L9'), (labels, graph, suite)]):
+        results = isolatedService.process_batch([sentence, 'The system uses a broker pattern.', sentence])
+
+    assert results[0] == {'sentence': sentence, 'causal': True, 'confidence': 0.84, 'labels': labels_serialized, 'graph': None, 'suite': None, 'error': 'LabelReferenceError: dangling label id L9'}
+    assert results[1]['error'] is None
+    assert results[2]['suite'] == suite_serialized
+
+
+@pytest.mark.unit
+def test_process_stream(isolatedService):
+    results = isolatedService.process_stream([sentence, 'The system uses a broker pattern.'])
+    assert next(results)['causal'] == True
+    assert next(results)['causal'] == False
+    assert next(results, None) is None
+
+
+@pytest.mark.unit
+def test_sentence_to_graph_dangling_label(isolatedService):
+    # labels supplied by a client are deserialized strictly
+    dangling = [{'id': 'L2', 'name': 'Cause1', 'begin': 3, 'end': 24, 'children': ['L9'], 'successor': None}]
+
+    with pytest.raises(LabelReferenceError) as error:
+        isolatedService.sentence_to_graph(sentence, labels=dangling)
+    assert (error.value.reason, error.value.id) == ('dangling', 'L9')
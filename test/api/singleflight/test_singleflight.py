@@ -0,0 +1,106 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.api.singleflight import SingleFlight
+
+
+@pytest.mark.unit
+def test_do():
+    flights = SingleFlight()
+    assert flights.do('k', lambda: 42) == 42
+    assert flights.in_flight() == 0
+
+
+@pytest.mark.unit
+def test_coalesce():
+    # concurrent calls with the same key share one computation
+    flights = SingleFlight()
+    release = threading.Event()
+    computations = []
+
+    def compute():
+        computations.append(1)
+        release.wait()
+        return 'result'
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(flights.do, 'k', compute)
+        # wait until the first computation is in flight before the other callers arrive
+        while flights.in_flight() == 0:
+            time.sleep(0.001)
+        followers = [pool.submit(flights.do, 'k', compute) for _ in range(3)]
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in [leader] + followers]
+
+    assert results == ['result']*4
+    assert len(computations) == 1
+    assert flights.in_flight() == 0
+
+
+@pytest.mark.unit
+def test_different_keys():
+    # calls with different keys are computed independently
+    flights = SingleFlight()
+    assert flights.do('a', lambda: 1) == 1
+    assert flights.do('b', lambda: 2) == 2
+
+
+@pytest.mark.unit
+def test_exception():
+    # a failed computation is propagated and does not block subsequent calls
+    flights = SingleFlight()
+
+    def fail():
+        raise ValueError('failed')
+
+    with pytest.raises(ValueError):
+        flights.do('k', fail)
+    assert flights.do('k', lambda: 1) == 1
+
+
+@pytest.mark.unit
+def test_do_batch():
+    flights = SingleFlight()
+    assert flights.do_batch(['a', 'b'], lambda keys: [key.upper() for key in keys]) == ['A', 'B']
+    assert flights.in_flight() == 0
+
+
+@pytest.mark.unit
+def test_do_batch_coalesce():
+    # a batch only computes the keys which are not already in flight and awaits the others
+    flights = SingleFlight()
+    release = threading.Event()
+    computed = []
+
+    def compute(keys):
+        computed.append(keys)
+        release.wait()
+        return [key.upper() for key in keys]
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flights.do, 'a', lambda: compute(['a'])[0])
+        while flights.in_flight() == 0:
+            time.sleep(0.001)
+        follower = pool.submit(flights.do_batch, ['a', 'b'], compute)
+        time.sleep(0.05)
+        release.set()
+
+        assert leader.result() == 'A'
+        assert follower.result() == ['A', 'B']
+
+    assert computed == [['a'], ['b']]
+    assert flights.in_flight() == 0
+
+
+@pytest.mark.unit
+def test_do_batch_exception():
+    # a failed or incomplete batch is propagated and does not block subsequent calls
+    flights = SingleFlight()
+
+    with pytest.raises(ValueError):
+        flights.do_batch(['a', 'b'], lambda keys: keys[:1])
+    assert flights.do_batch(['a'], lambda keys: [1]) == [1]
@@ -143,3 +143,28 @@ def test_suite_missing_graph(client):
 
     body = response.json()
     assert body['suite'] == suite
+
+
+@pytest.mark.system
+def test_process_batch(client):
+    non_causal = "The architecture of the system utilizes a broker pattern."
+    response = client.put(
+        f'{API_URL}process/batch', json={"sentences": [sentence, non_causal]})
+
+    assert response.status_code == status.HTTP_200_OK
+
+    results = response.json()['results']
+    assert len(results) == 2
+
+    assert results[0]['sentence'] == sentence
+    assert results[0]['causal'] == True
+    assert results[0]['labels'] == labels
+    assert results[0]['graph'] == graph
+    assert results[0]['suite'] == suite
+
+    # non-causal sentences are not processed any further
+    assert results[1]['sentence'] == non_causal
+    assert results[1]['causal'] == False
+    assert results[1]['labels'] is None
+    assert results[1]['graph'] is None
+    assert results[1]['suite'] is None
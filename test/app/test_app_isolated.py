@@ -1,3 +1,6 @@
+import asyncio
+import json
+import threading
 import pytest
 
 import pkg_resources
@@ -6,7 +9,10 @@ from fastapi.testclient import TestClient
 from fastapi import status
 
 import app
-from src.api.service import CiraServiceMock
+from src.api.service import CiraServiceMock, CiRAServiceImpl
+from src.api.batcher import MicroBatcher
+from src.api.executor import InferenceExecutor
+from src.data.labels import LabelReferenceError, SubLabel
 
 sentence = "If the button is pressed then the system shuts down."
 API_URL = 'http://localhost:8000/api/'
@@ -86,3 +92,162 @@ def test_suite(client):
         'expected': [{'id': 'c', 'variable': 'the system', 'condition': 'shuts down'}],
         'cases': [{'c': True, 'e': True}, {'c': False, 'e': False}]
     }}
+
+
+@pytest.mark.unit
+def test_process_batch(client):
+    response = client.put(
+        f'{API_URL}process/batch', json={"sentences": [sentence, sentence]})
+
+    assert response.status_code == status.HTTP_200_OK
+
+    results = response.json()['results']
+    assert len(results) == 2
+    assert results[0] == results[1]
+    assert results[0]['sentence'] == sentence
+    assert results[0]['causal'] == True
+    assert results[0]['labels'] == [{'id': 'L1', 'name': 'Variable', 'begin': 10, 'end': 20, 'parent': None}]
+
+
+@pytest.mark.unit
+def test_process_batch_stream(client):
+    response = client.put(
+        f'{API_URL}process/batch', params={"stream": True}, json={"sentences": [sentence, sentence, sentence]})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+
+    # every line contains the result of one sentence
+    lines = response.text.splitlines()
+    assert len(lines) == 3
+
+    results = [json.loads(line) for line in lines]
+    expected = client.put(
+        f'{API_URL}process/batch', json={"sentences": [sentence, sentence, sentence]}).json()['results']
+    assert results == expected
+
+
+@pytest.mark.unit
+def test_process_batch_stream_exception(client, mocker):
+    # a failure after the first result has been emitted is reported in a final line
+    def fail(sentences):
+        yield {'sentence': sentences[0], 'causal': False, 'confidence': 0.9, 'labels': None, 'graph': None, 'suite': None, 'error': None}
+        raise RuntimeError('model unavailable')
+    mocker.patch.object(app.cira, 'process_stream', side_effect=fail)
+
+    response = client.put(
+        f'{API_URL}process/batch', params={"stream": True}, json={"sentences": [sentence, sentence]})
+
+    assert response.status_code == status.HTTP_200_OK
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 2
+    assert lines[0]['sentence'] == sentence
+    assert lines[1] == {'error': 'RuntimeError: model unavailable'}
+
+
+@pytest.mark.unit
+def test_process_batch_stream_queue_full(client):
+    # a stream is rejected as a whole before it starts if the inference executor is saturated
+    original_executor = app.executor
+    app.executor = InferenceExecutor(workers=1, queue_depth=0)
+    app.executor.slots.acquire()
+    try:
+        response = client.put(
+            f'{API_URL}process/batch', params={"stream": True}, json={"sentences": [sentence]})
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    finally:
+        app.executor.slots.release()
+        app.executor = original_executor
+
+
+@pytest.mark.unit
+def test_queue_full(client):
+    # requests that exceed the capacity of the inference executor are rejected as unavailable
+    original_executor = app.executor
+    app.executor = InferenceExecutor(workers=1, queue_depth=0)
+    app.executor.slots.acquire()
+    try:
+        response = client.put(
+            f'{API_URL}classify', json={"sentence": sentence})
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+        # light requests are not affected by the saturated executor
+        response = client.get(f'{API_URL}health')
+        assert response.status_code == status.HTTP_200_OK
+    finally:
+        app.executor.slots.release()
+        app.executor = original_executor
+
+
+@pytest.mark.unit
+def test_cache(client):
+    response = client.get(f'{API_URL}cache')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {'hits': {}, 'misses': {}, 'size': 0}
+
+
+@pytest.mark.unit
+def test_invalid_label_reference(client, mocker):
+    # invalid references between labels supplied by the client are reported as unprocessable
+    mocker.patch.object(app.cira, 'sentence_to_graph', side_effect=LabelReferenceError(reason='dangling', id='L9'))
+
+    response = client.put(
+        f'{API_URL}graph', json={"sentence": sentence, "labels": [{'id': 'L1'}]})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json() == {'detail': 'dangling label id L9', 'reason': 'dangling', 'id': 'L9'}
+
+
+@pytest.mark.unit
+def test_setup_shuts_down_previous_executor(client, mocker):
+    # replacing the executor releases the worker threads of the previous one
+    mocker.patch('app.CiRAServiceImpl')
+    mocker.patch('app.setup_cache', return_value=None)
+    original_cira, original_executor = app.cira, app.executor
+    try:
+        app.setup_cira()
+
+        assert original_executor.pool._shutdown
+        assert not app.executor.pool._shutdown
+    finally:
+        app.cira = original_cira
+
+
+@pytest.mark.unit
+def test_concurrent_labels_coalesced(client, mocker):
+    # concurrent requests for the same sentence in different micro-batches share one forward pass of the labeling model
+    release = threading.Event()
+
+    def label_batch(sentences):
+        release.wait()
+        return [[SubLabel(id='L1', name='Variable', begin=3, end=13)] for _ in sentences]
+
+    converter = mocker.patch('src.api.service.CiRAConverter').return_value
+    converter.label_batch.side_effect = label_batch
+    service = CiRAServiceImpl(model_classification=None, model_labeling=None)
+
+    original = (app.cira, app.executor, app.labeling_batcher)
+    app.cira = service
+    app.executor = InferenceExecutor(workers=2, queue_depth=0)
+    app.labeling_batcher = MicroBatcher(app.sentences_to_labels, max_batch_size=1)
+
+    async def label_twice():
+        requests = [asyncio.ensure_future(app.create_labels(app.SentenceRequest(sentence=sentence))) for _ in range(2)]
+        # wait until the first batch is in flight, but not forever if nothing is coalesced
+        deadline = asyncio.get_running_loop().time() + 5
+        while service.flights.in_flight() == 0 and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.wait_for(asyncio.gather(*requests), timeout=5)
+
+    try:
+        first, second = asyncio.run(label_twice())
+    finally:
+        release.set()
+        app.executor.shutdown()
+        app.cira, app.executor, app.labeling_batcher = original
+
+    assert first == second
+    assert converter.label_batch.call_count == 1
@@ -1,4 +1,5 @@
 import pytest
+import torch
 
 from src import model_locator
 from src.classifiers.causalitydetection.causalclassifier import CausalClassifier
@@ -14,4 +15,73 @@ def sut() -> CausalClassifier:
 ])
 def test_classifier(sut: CausalClassifier, sentence, causal):
     classification, confidence = sut.classify(sentence=sentence)
-    assert classification == causal
\ No newline at end of file
+    assert classification == causal
+
+@pytest.mark.system
+def test_classifier_batch(sut: CausalClassifier):
+    sentences = [
+        'If the red button is pushed the system shuts down.',
+        'The architecture of the system utilizes a broker pattern.',
+        'When the user logs in, the dashboard is displayed.']
+    classifications = sut.classify_batch(sentences=sentences, batch_size=2)
+
+    # the batched classification has to agree with the classification of each individual sentence
+    assert len(classifications) == len(sentences)
+    for sentence, (causal, confidence) in zip(sentences, classifications):
+        expected_causal, expected_confidence = sut.classify(sentence=sentence)
+        assert causal == expected_causal
+        assert confidence == pytest.approx(expected_confidence, abs=1e-4)
+
+
+@pytest.mark.system
+def test_classifier_batch_empty(sut: CausalClassifier):
+    assert sut.classify_batch(sentences=[]) == []
+
+
+@pytest.mark.system
+def test_classifier_eval_mode(sut: CausalClassifier):
+    # the dropout layer of the classification model must not be active during inference
+    assert not sut.model.training
+
+
+@pytest.mark.system
+def test_classifier_stable(sut: CausalClassifier):
+    # repeated classifications of the same sentence have to yield the exact same confidence
+    sentence = 'If the red button is pushed the system shuts down.'
+    classifications = [sut.classify(sentence=sentence) for _ in range(3)]
+    assert len(set(classifications)) == 1
+
+
+@pytest.mark.system
+def test_classifier_no_activations_saved(sut: CausalClassifier):
+    """Test that a classification does not keep any activations alive for a backward pass. The memory held by tensors saved for autograd is measured once for a plain forward pass of the model (baseline) and once for the classification."""
+    sentence = 'If the red button is pushed the system shuts down.'
+    saved_bytes = []
+
+    def pack(tensor):
+        saved_bytes[-1] += tensor.element_size()*tensor.nelement()
+        return tensor
+
+    encoded_text = sut.tokenizer(sentence, return_tensors='pt')
+    with torch.autograd.graph.saved_tensors_hooks(pack, lambda tensor: tensor):
+        saved_bytes.append(0)
+        sut.model(encoded_text['input_ids'].to(sut.device), encoded_text['attention_mask'].to(sut.device))
+
+        saved_bytes.append(0)
+        sut.classify(sentence=sentence)
+
+    baseline, classification = saved_bytes
+    assert baseline > 0
+    assert classification == 0
+
+
+@pytest.mark.system
+def test_classifier_from_config(sut: CausalClassifier):
+    # building the architecture from its configuration yields the same classifier as loading the pre-trained base model first
+    from_pretrained = CausalClassifier(model_locator.CLASSIFICATION, from_config=False)
+
+    sentence = 'If the red button is pushed the system shuts down.'
+    causal, confidence = sut.classify(sentence=sentence)
+    expected_causal, expected_confidence = from_pretrained.classify(sentence=sentence)
+    assert causal == expected_causal
+    assert confidence == pytest.approx(expected_confidence, abs=1e-6)
@@ -0,0 +1,128 @@
+import pytest
+
+from src.converters.graphtotestsuite.mcdc import get_mcdc_configurations, get_mcdc_configurations_from_decision_diagram, get_canonical_configuration
+from src.converters.graphtotestsuite.testsuiteconverter import convert, DECISION_DIAGRAM, MCDC
+from src.data.graph import EventNode, IntermediateNode, Node
+from src.util.loader import load_sentence
+import src.util.constants as constants
+
+
+def satisfies_mcdc(root: Node, configurations: list[tuple[dict, bool]]) -> bool:
+    """Check that for every leaf node there is a pair of configurations which only differ in the value of that leaf node and evaluate the root to different values."""
+    leaves = [node.id for node in root.flatten() if type(node) == EventNode]
+    for leaf in leaves:
+        pairs = [(first, second) for first, first_outcome in configurations for second, second_outcome in configurations
+                 if first_outcome != second_outcome and first[leaf] != second[leaf] and all(first[other] == second[other] for other in leaves if other != leaf)]
+        if len(pairs) == 0:
+            return False
+    return True
+
+
+def junctor(id: str, conjunction: bool, children: list[Node], negated: list[bool] = None) -> IntermediateNode:
+    node = IntermediateNode(id=id, conjunction=conjunction)
+    for index, child in enumerate(children):
+        node.add_incoming(child, negated=(negated is not None and negated[index]))
+    return node
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('conjunction', [True, False])
+def test_flat(conjunction):
+    # a conjunction or disjunction of n events requires n+1 test cases
+    root = junctor('i0', conjunction, [EventNode(id=f'c{index}') for index in range(5)], negated=[False, True, False, False, True])
+    configurations = get_mcdc_configurations(root=root)
+
+    assert len(configurations) == 6
+    assert satisfies_mcdc(root, configurations)
+    assert all(root.evaluate(configuration) == outcome for configuration, outcome in configurations)
+
+
+@pytest.mark.unit
+def test_nested():
+    # (c0 OR c1) AND NOT (c2 AND (c3 OR NOT c4))
+    events = [EventNode(id=f'c{index}') for index in range(5)]
+    disjunction = junctor('i1', False, [events[3], events[4]], negated=[False, True])
+    conjunction = junctor('i2', True, [events[2], disjunction])
+    root = junctor('i0', True, [junctor('i3', False, events[:2]), conjunction], negated=[False, True])
+    configurations = get_mcdc_configurations(root=root)
+
+    assert len(configurations) == 6
+    assert satisfies_mcdc(root, configurations)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('conjunction', [True, False])
+def test_decision_diagram(conjunction):
+    # (c0 OR c1) AND NOT (c2 AND (c3 OR NOT c4)), and the same with swapped junctors
+    events = [EventNode(id=f'c{index}') for index in range(5)]
+    inner = junctor('i1', not conjunction, [events[3], events[4]], negated=[False, True])
+    middle = junctor('i2', conjunction, [events[2], inner])
+    root = junctor('i0', conjunction, [junctor('i3', not conjunction, events[:2]), middle], negated=[False, True])
+    configurations = get_mcdc_configurations_from_decision_diagram(root=root)
+
+    assert satisfies_mcdc(root, configurations)
+    assert all(root.evaluate(configuration) == outcome for configuration, outcome in configurations)
+    assert [outcome for _, outcome in configurations] == sorted([outcome for _, outcome in configurations], reverse=True)
+
+
+@pytest.mark.unit
+def test_decision_diagram_masked():
+    # c0 AND (c0 OR c1): c1 cannot affect the outcome and is skipped
+    c0, c1 = EventNode(id='c0'), EventNode(id='c1')
+    disjunction = junctor('i1', False, [c0, c1])
+    root = IntermediateNode(id='i0', conjunction=True)
+    root.add_incoming(c0)
+    root.add_incoming(disjunction)
+
+    assert get_mcdc_configurations_from_decision_diagram(root=root) == [({'c0': True, 'c1': False}, True), ({'c0': False, 'c1': False}, False)]
+
+
+@pytest.mark.unit
+def test_single_event():
+    event = EventNode(id='c0')
+
+    assert get_mcdc_configurations(root=event) == [({'c0': True}, True), ({'c0': False}, False)]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('expected_outcome', [True, False])
+def test_canonical_configuration(expected_outcome):
+    events = [EventNode(id=f'c{index}') for index in range(4)]
+    root = junctor('i0', False, [junctor('i1', True, events[:2]), junctor('i2', True, events[2:], negated=[True, False])])
+
+    canonical = get_canonical_configuration(root, expected_outcome, {})
+    assert canonical == root.get_testcase_configuration(expected_outcome=expected_outcome)[0]
+
+
+@pytest.fixture
+def graph(id: str):
+    _, _, _, graph, _ = load_sentence(filename=f'{constants.SENTENCES_PATH}/sentence-{id}.json')
+    return graph
+
+
+@pytest.mark.system
+@pytest.mark.parametrize('id', ['1', '1b', '1c', '2', '3', '4', '5', '6', '6b', '7', '8', '10', '11', '12', '13', '14', '16', '17', '18'])
+def test_system(graph):
+    """Generate an MC/DC test suite, which must not be larger than the exhaustive one and must be a subset of it."""
+    exhaustive = convert(graph)
+    mcdc = convert(graph, strategy=MCDC)
+
+    assert len(mcdc.cases) <= len(exhaustive.cases)
+    assert all(case in exhaustive.cases for case in mcdc.cases)
+    assert list(convert(graph, strategy=MCDC, compact=True).cases) == mcdc.cases
+
+
+@pytest.mark.system
+@pytest.mark.parametrize('id', ['1', '1b', '1c', '2', '3', '4', '5', '6', '6b', '7', '8', '10', '11', '12', '13', '14', '16', '17', '18'])
+def test_system_decision_diagram(graph):
+    """Generate an MC/DC test suite from the decision diagram, which must satisfy MC/DC and must not be larger than the exhaustive one."""
+    suite = convert(graph, strategy=DECISION_DIAGRAM)
+
+    assert len(suite.cases) <= len(convert(graph).cases)
+    assert satisfies_mcdc(graph.root, get_mcdc_configurations_from_decision_diagram(root=graph.root))
+
+
+@pytest.mark.unit
+def test_unsupported_strategy():
+    with pytest.raises(ValueError):
+        convert(None, strategy='random')
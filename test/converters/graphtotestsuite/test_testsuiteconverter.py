@@ -1,6 +1,8 @@
+import io
+import json
 import pytest
 
-from src.converters.graphtotestsuite.testsuiteconverter import convert
+from src.converters.graphtotestsuite.testsuiteconverter import convert, dump, stream_cases
 
 from src.util.loader import load_sentence
 import src.util.constants as constants
@@ -24,3 +26,29 @@ def test_system(sentence):
     """Automatically generate a test suite from a graph and compare it to a manually generated one."""
     testsuite: Suite = convert(sentence['graph'])
     assert sentence['testsuite'] == testsuite
+
+
+@pytest.mark.system
+@pytest.mark.parametrize('id', ['1', '1b', '1c', '2', '3', '4', '5', '6', '6b', '7', '8', '10', '11', '12', '13', '14', '16', '17', '18'])
+def test_stream_cases(sentence):
+    """Lazily generate the test cases from a graph and compare them to the eagerly generated ones."""
+    testsuite: Suite = convert(sentence['graph'])
+    assert list(stream_cases(sentence['graph'])) == testsuite.cases
+
+
+@pytest.mark.system
+@pytest.mark.parametrize('id', ['1', '6', '17'])
+def test_dump(sentence):
+    """Write a test suite with streamed test cases and compare it to the serialized test suite."""
+    output = io.StringIO()
+    dump(sentence['graph'], output)
+    assert json.loads(output.getvalue()) == convert(sentence['graph']).to_dict()
+
+
+@pytest.mark.system
+@pytest.mark.parametrize('id', ['1', '1b', '1c', '2', '3', '4', '5', '6', '6b', '7', '8', '10', '11', '12', '13', '14', '16', '17', '18'])
+def test_compact(sentence):
+    """Generate the test cases as bitmasks and compare them to the test cases generated as dictionaries."""
+    testsuite: Suite = convert(sentence['graph'], compact=True)
+    assert list(testsuite.cases) == convert(sentence['graph']).cases
+    assert sentence['testsuite'] == testsuite
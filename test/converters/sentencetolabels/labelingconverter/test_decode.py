@@ -0,0 +1,64 @@
+import glob
+import re
+
+import numpy as np
+import pytest
+import torch
+
+import src.converters.sentencetolabels.labelingconverter as lc
+import src.util.constants as consts
+from src.util.loader import load_sentence
+
+FILENAMES = sorted(glob.glob(f'{consts.SENTENCES_PATH}/*.json'))
+
+
+def tokenize(sentence: str) -> tuple[list[str], list[tuple[int, int]]]:
+    """Split a sentence into tokens in the style of the RoBERTa tokenizer and determine their character offsets (including the initializing and finalizing token and some padding)."""
+    tokens, offsets = [lc.TOKEN_INIT], [(0, 0)]
+    for match in re.finditer(r'\w+|[^\w\s]', sentence):
+        prefix = lc.TOKEN_PREFIX if match.start() > 0 and sentence[match.start()-1] == ' ' else ''
+        tokens.append(prefix + match.group())
+        offsets.append(match.span())
+    tokens.extend(lc.TOKENS_END[:2] + ['<pad>']*3)
+    offsets.extend([(0, 0)]*5)
+    return tokens, offsets
+
+
+def predict(offsets: list[tuple[int, int]], labels: list[dict]) -> np.ndarray:
+    """Generate the prediction matrix which a perfect labeler would produce for the manually annotated labels."""
+    predictions = np.zeros((len(offsets), len(consts.LABEL_IDS_VERBOSE)), dtype=np.int32)
+    for row, (begin, end) in enumerate(offsets):
+        for label in labels:
+            if label['begin'] <= begin and end <= label['end'] and begin != end:
+                predictions[row, consts.LABEL_IDS_VERBOSE.index(label['name'])] = 1
+        if not predictions[row].any():
+            predictions[row, consts.LABEL_IDS_VERBOSE.index(consts.NOTRELEVANT)] = 1
+    return predictions
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('filename', FILENAMES)
+def test_convert_identical(filename: str):
+    file, sentence, _, _, _ = load_sentence(filename=filename)
+    tokens, offsets = tokenize(sentence)
+    predictions = torch.tensor(np.array([predict(offsets, file['labels'])]))
+
+    expected = lc.convert(sentence_tokens=tokens, sentence=sentence, predictions=predictions)
+    labels = lc.convert(sentence_tokens=tokens, sentence=sentence, predictions=predictions, offsets=offsets)
+
+    assert [label.to_dict() for label in labels] == [label.to_dict() for label in expected]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('seed', range(10))
+def test_decode_random_predictions(seed: int):
+    # arbitrary predictions produce labels which are interrupted or touch event borders
+    _, sentence, _, _, _ = load_sentence(filename=FILENAMES[0])
+    _, offsets = tokenize(sentence)
+    predictions = (np.random.default_rng(seed).random((len(offsets), len(consts.LABEL_IDS_VERBOSE))) > 0.6).astype(np.int32)
+
+    expected = lc.merge_labels(token_labels=lc.get_token_labeling_from_offsets(offsets=offsets, predictions=[predictions]))
+    labels = lc.decode(predictions=predictions, offsets=np.array(offsets))
+
+    assert [(label.id, type(label), label.name, label.begin, label.end) for label in labels] == \
+        [(label.id, type(label), label.name, label.begin, label.end) for label in expected]
@@ -35,4 +35,37 @@ def test_merge1():
     condition = [label for label in labels if label.name=='Condition']
     assert len(condition) == 1
     assert condition[0].begin == 18
-    assert condition[0].end == 28
\ No newline at end of file
+    assert condition[0].end == 28
+
+@pytest.mark.unit
+def test_merge_at_event_border():
+    sentence = "If the button is pressed and the light is on"
+    token_labels = [
+        TokenLabel(begin=3, end=6, event=True, name='Cause1'),
+        TokenLabel(begin=3, end=6, event=False, name='Variable'),
+        TokenLabel(begin=7, end=13, event=True, name='Cause1'),
+        TokenLabel(begin=7, end=13, event=False, name='Variable'),
+        TokenLabel(begin=14, end=24, event=True, name='Cause1'),
+        TokenLabel(begin=14, end=24, event=False, name='Condition'),
+        TokenLabel(begin=25, end=28, event=False, name='Conjunction'),
+        TokenLabel(begin=29, end=32, event=True, name='Cause2'),
+        TokenLabel(begin=29, end=32, event=False, name='Condition'),
+        TokenLabel(begin=33, end=38, event=True, name='Cause2'),
+        TokenLabel(begin=33, end=38, event=False, name='Variable'),
+        TokenLabel(begin=39, end=44, event=True, name='Cause2'),
+        TokenLabel(begin=39, end=44, event=False, name='Condition')
+    ]
+
+    labels = lc.merge_labels(token_labels=token_labels)
+
+    assert [(label.name, label.begin, label.end) for label in labels] == [
+        ('Cause1', 3, 24),
+        ('Cause2', 29, 44),
+        ('Conjunction', 25, 28),
+        ('Variable', 3, 13),
+        ('Variable', 33, 38),
+        ('Condition', 14, 24),
+        ('Condition', 29, 32),
+        ('Condition', 39, 44)
+    ]
+    assert [label.id for label in labels] == [f'L{index}' for index in range(len(labels))]
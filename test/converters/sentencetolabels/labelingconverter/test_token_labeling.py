@@ -92,4 +92,22 @@ def test_token_labels():
     token_labels = lc.get_token_labeling(sentence_tokens=tokens, sentence=sentence, predictions=predictions)
     
     for tl in token_labels:
-        assert " " not in sentence[tl.begin:tl.end]
\ No newline at end of file
+        assert " " not in sentence[tl.begin:tl.end]
+
+offsets = [(0, 0), (0, 2), (3, 6), (7, 10), (11, 17), (18, 20), (21, 28), (28, 29), (30, 33), (34, 40), (41, 46), (47, 51), (51, 52), (0, 0)] + [(0, 0)]*(len(tokens)-14)
+
+@pytest.mark.unit
+def test_token_labels_from_offsets():
+    # the offset mapping of the tokenizer yields the same token labels as locating each token in the sentence
+    expected = lc.get_token_labeling(sentence_tokens=tokens, sentence=sentence, predictions=predictions)
+    token_labels = lc.get_token_labeling_from_offsets(offsets=offsets, predictions=predictions)
+
+    assert token_labels == expected
+
+@pytest.mark.unit
+def test_token_labels_from_offsets_skip_special_tokens():
+    # the predictions for the padding tokens must not produce any label
+    token_labels = lc.get_token_labeling_from_offsets(offsets=offsets, predictions=predictions)
+
+    assert all(tl.end <= len(sentence) for tl in token_labels)
+    assert len([tl for tl in token_labels if tl.begin == 0]) == 0
@@ -1,6 +1,6 @@
 import pytest
 
-from src.converters.sentencetolabels.labelrecovery import label_exceptive_clauses
+from src.converters.sentencetolabels.labelrecovery import compile_clauses, label_exceptive_clauses
 
 from src.data.labels import Label, EventLabel, SubLabel
 
@@ -30,4 +30,45 @@ def test_existing():
 
     additional_labels = label_exceptive_clauses(sentence, labels)
 
-    assert additional_labels == []
\ No newline at end of file
+    assert additional_labels == []
+
+@pytest.mark.unit
+def test_word_boundaries():
+    # exceptive clauses are only recognized as whole words
+    sentence = "The unlessened button is pressed."
+
+    additional_labels = label_exceptive_clauses(sentence, [])
+
+    assert additional_labels == []
+
+@pytest.mark.unit
+def test_multiple_instances():
+    sentence = "The light is on unless the door is open, UNLESS the alarm is off."
+
+    additional_labels = label_exceptive_clauses(sentence, [])
+
+    expected = [
+        SubLabel(id='AEX0', name='Negation', begin=16, end=22),
+        SubLabel(id='AEX1', name='Negation', begin=41, end=47)
+    ]
+    assert additional_labels == expected
+
+@pytest.mark.unit
+def test_multi_word_clauses():
+    pattern = compile_clauses(['unless', 'except', 'except when', 'other than if'])
+    sentence = "The light is on except  when the door is open or other than if the alarm is off."
+
+    additional_labels = label_exceptive_clauses(sentence, [], pattern=pattern)
+
+    expected = [
+        SubLabel(id='AEX0', name='Negation', begin=16, end=28),
+        SubLabel(id='AEX1', name='Negation', begin=49, end=62)
+    ]
+    assert additional_labels == expected
+
+@pytest.mark.unit
+def test_no_clauses():
+    sentence = "Unless the button is pressed the light is off."
+
+    for clauses in [[], ['', '  ']]:
+        assert label_exceptive_clauses(sentence, [], pattern=compile_clauses(clauses)) == []
@@ -1,4 +1,5 @@
 import pytest
+import torch
 
 from src import model_locator
 from src.converters.sentencetolabels.labeler import Labeler
@@ -32,6 +33,53 @@ def test_labeler(sentence, labeler):
 
     assert equals(expected=sentence['labels'], generated=labels_gen)
 
+@pytest.mark.system
+def test_labeler_batch(labeler):
+    """Test that labeling a batch of sentences produces the same labels as labeling each sentence individually, in the order of the input sentences."""
+    ids = ['1', '2', '6b', '10', '17']
+    sentences = [load_sentence(filename=f'{constants.SENTENCES_PATH}/sentence-{id}.json')[1] for id in ids]
+
+    labels_batch = labeler.label_batch(sentences=sentences, batch_size=2)
+    assert len(labels_batch) == len(sentences)
+
+    for sentence, labels_gen in zip(sentences, labels_batch):
+        assert equals(expected=labeler.label(sentence=sentence), generated=labels_gen)
+
+@pytest.mark.system
+def test_labeler_eval_mode(labeler):
+    # the dropout layer of the labeling model must not be active during inference
+    assert not labeler.model.training
+
+@pytest.mark.system
+def test_labeler_no_activations_saved(labeler):
+    """Test that labeling a sentence does not keep any activations alive for a backward pass. The memory held by tensors saved for autograd is measured once for a plain forward pass of the model (baseline) and once for the labeling."""
+    sentence = 'If the red button is pushed the system shuts down.'
+    saved_bytes = []
+
+    def pack(tensor):
+        saved_bytes[-1] += tensor.element_size()*tensor.nelement()
+        return tensor
+
+    tokenized_batch = labeler.tokenizer(text=[sentence], return_tensors='pt')
+    with torch.autograd.graph.saved_tensors_hooks(pack, lambda tensor: tensor):
+        saved_bytes.append(0)
+        labeler.model(tokenized_batch['input_ids'], tokenized_batch['attention_mask'], token_type_ids=None, labels=None)
+
+        saved_bytes.append(0)
+        labeler.label(sentence=sentence)
+
+    baseline, labeling = saved_bytes
+    assert baseline > 0
+    assert labeling == 0
+
+@pytest.mark.system
+def test_labeler_from_config(labeler):
+    # building the architecture from its configuration yields the same labeler as loading the pre-trained base model first
+    from_pretrained = Labeler(model_path=model_locator.LABELING, useGPU=False, from_config=False)
+
+    sentence = 'If the red button is pushed the system shuts down.'
+    assert equals(expected=from_pretrained.label(sentence=sentence), generated=labeler.label(sentence=sentence))
+
 def equals(expected: list[Label], generated: list[Label]) -> bool:
     """Determine whether two list of labels are equal. They count as equal if they have the same length and every label in the expected list has exactly one equivalent in the generated list.
     
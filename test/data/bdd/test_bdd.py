@@ -0,0 +1,144 @@
+import itertools
+import random
+
+import pytest
+
+from src.data.bdd import BDD, FALSE, TRUE, are_equivalent
+from src.data.graph import EventNode, Graph, IntermediateNode, Node
+
+
+def generate_tree(seed: int, events: int = 8) -> Node:
+    """Generate a random cause tree with the given number of events, junctors of random type, and random negations."""
+    generator = random.Random(seed)
+    nodes: list[Node] = [EventNode(id=f'c{index}', variable=f'v{index}', condition='holds') for index in range(events)]
+    index = 0
+    while len(nodes) > 1:
+        width = min(generator.randint(2, 3), len(nodes))
+        junctor = IntermediateNode(id=f'i{index}', conjunction=generator.random() < 0.5)
+        for child in nodes[:width]:
+            junctor.add_incoming(child, negated=generator.random() < 0.3)
+        nodes = nodes[width:] + [junctor]
+        index += 1
+    return nodes[0]
+
+
+def configurations(keys: list) -> list[dict]:
+    return [dict(zip(keys, values)) for values in itertools.product([False, True], repeat=len(keys))]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('seed', range(10))
+def test_compile(seed):
+    root = generate_tree(seed)
+    bdd = BDD()
+    function = bdd.compile(root)
+
+    for configuration in configurations(bdd.variables):
+        assert bdd.evaluate(function, configuration) == root.evaluate(configuration)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('seed', range(10))
+def test_count(seed):
+    root = generate_tree(seed)
+    bdd = BDD()
+    function = bdd.compile(root)
+    satisfying = [configuration for configuration in configurations(bdd.variables) if root.evaluate(configuration)]
+
+    assert bdd.count(function) == len(satisfying)
+    assert bdd.count(bdd.negate(function)) == 2**len(bdd.variables) - len(satisfying)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('seed', range(10))
+def test_paths(seed):
+    root = generate_tree(seed)
+    bdd = BDD()
+    function = bdd.compile(root)
+    paths = list(bdd.paths(function))
+
+    # every satisfying configuration extends exactly one path
+    for configuration in configurations(bdd.variables):
+        extended = [path for path in paths if all(configuration[key] == value for key, value in path.items())]
+        assert len(extended) == (1 if root.evaluate(configuration) else 0)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('seed', range(10))
+def test_restrict(seed):
+    root = generate_tree(seed)
+    bdd = BDD()
+    function = bdd.compile(root)
+    restricted = bdd.restrict(function, 'c3', False)
+
+    for configuration in configurations(bdd.variables):
+        assert bdd.evaluate(restricted, configuration) == root.evaluate(configuration | {'c3': False})
+
+
+@pytest.mark.unit
+def test_pick():
+    bdd = BDD()
+    # (a OR b) AND NOT c
+    function = bdd.conjoin(bdd.disjoin(bdd.variable('a'), bdd.variable('b')), bdd.negate(bdd.variable('c')))
+
+    assert bdd.pick(function) == {'a': False, 'b': True, 'c': False}
+    assert bdd.pick(function, preference={'a': True, 'b': True, 'c': True}) == {'a': True, 'b': True, 'c': False}
+
+
+@pytest.mark.unit
+def test_satisfiability():
+    bdd = BDD()
+    a = bdd.variable('a')
+
+    assert bdd.is_satisfiable(a)
+    assert not bdd.is_satisfiable(bdd.conjoin(a, bdd.negate(a)))
+    assert bdd.disjoin(a, bdd.negate(a)) == TRUE
+    assert bdd.xor(a, a) == FALSE
+
+
+@pytest.mark.unit
+def test_equivalence():
+    bdd = BDD()
+    a, b = bdd.variable('a'), bdd.variable('b')
+
+    # De Morgan: NOT (a AND b) == NOT a OR NOT b
+    assert bdd.is_equivalent(bdd.negate(bdd.conjoin(a, b)), bdd.disjoin(bdd.negate(a), bdd.negate(b)))
+    assert not bdd.is_equivalent(bdd.conjoin(a, b), bdd.disjoin(a, b))
+
+
+@pytest.mark.unit
+def test_wide():
+    # the size of a junctor is not limited by the recursion depth
+    root = IntermediateNode(id='i0', conjunction=True)
+    for index in range(3000):
+        root.add_incoming(EventNode(id=f'c{index}'), negated=(index % 2 == 1))
+    bdd = BDD()
+    function = bdd.compile(root)
+
+    assert bdd.count(function) == 1
+    assert bdd.count(bdd.negate(function)) == 2**3000 - 1
+
+
+def graph_of(root: Node) -> Graph:
+    effect = EventNode(id='e0', variable='the system', condition='shuts down')
+    effect.add_incoming(root)
+    return Graph(nodes=root.flatten() + [effect], root=root, edges=[])
+
+
+@pytest.mark.unit
+def test_equivalent_graphs():
+    # NOT (a AND b) and (NOT a OR NOT b) with different node ids
+    a1, b1 = EventNode(id='c1', variable='a', condition='holds'), EventNode(id='c2', variable='b', condition='holds')
+    conjunction = IntermediateNode(id='i1', conjunction=True)
+    conjunction.add_incoming(a1)
+    conjunction.add_incoming(b1)
+    root1 = IntermediateNode(id='i0', conjunction=False)
+    root1.add_incoming(conjunction, negated=True)
+
+    a2, b2 = EventNode(id='x', variable='a', condition='holds'), EventNode(id='y', variable='b', condition='holds')
+    root2 = IntermediateNode(id='j0', conjunction=False)
+    root2.add_incoming(b2, negated=True)
+    root2.add_incoming(a2, negated=True)
+
+    assert are_equivalent(graph_of(root1), graph_of(root2))
+    assert not are_equivalent(graph_of(root1), graph_of(generate_tree(0)))
@@ -23,4 +23,63 @@ def test_nonexisting_output(capsys):
 
     graph.get_node(id='n10')
     captured = capsys.readouterr()
-    assert f'No node with id n10 found in {nodes}' in captured.out
\ No newline at end of file
+    assert f'No node with id n10 found in {nodes}' in captured.out
+
+@pytest.mark.unit
+def test_added_node():
+    nodes = [Node(id=f'n{i}') for i in range(5)]
+    graph = Graph(nodes=nodes, root=None, edges=None)
+    assert graph.get_node(id='n5') == None
+    added = Node(id='n5')
+    graph.nodes.append(added)
+
+    assert graph.get_node(id='n5') == added
+
+@pytest.mark.unit
+def test_removed_node():
+    nodes = [Node(id=f'n{i}') for i in range(5)]
+    graph = Graph(nodes=nodes, root=None, edges=None)
+    assert graph.get_node(id='n0') == nodes[0]
+    graph.nodes.remove(nodes[0])
+
+    assert graph.get_node(id='n0') == None
+
+@pytest.mark.unit
+def test_replaced_nodes():
+    graph = Graph(nodes=[Node(id=f'n{i}') for i in range(5)], root=None, edges=None)
+    nodes = [Node(id=f'm{i}') for i in range(5)]
+    graph.nodes = nodes
+
+    assert graph.get_node(id='m0') == nodes[0]
+    assert graph.get_node(id='n0') == None
+
+@pytest.mark.unit
+def test_duplicate_id():
+    nodes = [Node(id='n0'), Node(id='n0')]
+    graph = Graph(nodes=nodes, root=None, edges=None)
+
+    assert graph.get_node(id='n0') is nodes[0]
+
+@pytest.mark.unit
+def test_removed_duplicate_id():
+    first, second = Node(id='n0'), Node(id='n0')
+    graph = Graph(nodes=[first, second], root=None, edges=None)
+    assert graph.get_node(id='n0') is first
+    graph.nodes.remove(first)
+
+    assert graph.get_node(id='n0') is second
+
+@pytest.mark.unit
+def test_node_replaced_in_place():
+    nodes = [Node(id=f'n{i}') for i in range(5)]
+    graph = Graph(nodes=nodes, root=None, edges=None)
+    assert graph.get_node(id='n2') == nodes[2]
+
+    # replacing a node at the same position neither changes the list nor its length
+    replacement, renamed = Node(id='n2'), Node(id='m3')
+    graph.nodes[2] = replacement
+    graph.nodes[3] = renamed
+
+    assert graph.get_node(id='n2') is replacement
+    assert graph.get_node(id='n3') == None
+    assert graph.get_node(id='m3') is renamed
@@ -0,0 +1,46 @@
+import pytest
+
+from src.data.graph import EventNode, IntermediateNode
+
+@pytest.fixture
+def root() -> IntermediateNode:
+    # (c0 AND NOT c1 AND c2) OR (c3 AND c4) OR NOT (c5 OR c6)
+    events = [EventNode(id=f'c{index}') for index in range(7)]
+    conjunction1 = IntermediateNode(id='i1', conjunction=True)
+    conjunction1.add_incoming(events[0])
+    conjunction1.add_incoming(events[1], negated=True)
+    conjunction1.add_incoming(events[2])
+    conjunction2 = IntermediateNode(id='i2', conjunction=True)
+    conjunction2.add_incoming(events[3])
+    conjunction2.add_incoming(events[4])
+    disjunction = IntermediateNode(id='i3', conjunction=False)
+    disjunction.add_incoming(events[5])
+    disjunction.add_incoming(events[6])
+
+    root = IntermediateNode(id='i0', conjunction=False)
+    root.add_incoming(conjunction1)
+    root.add_incoming(conjunction2)
+    root.add_incoming(disjunction, negated=True)
+    return root
+
+@pytest.mark.unit
+@pytest.mark.parametrize('expected_outcome', [True, False])
+def test_stream_like_list(root, expected_outcome):
+    streamed = root.stream_testcase_configurations(expected_outcome=expected_outcome)
+
+    assert list(streamed) == root.get_testcase_configuration(expected_outcome=expected_outcome)
+
+@pytest.mark.unit
+def test_event_node():
+    event = EventNode(id='c0')
+
+    assert list(event.stream_testcase_configurations(expected_outcome=False)) == [{'c0': False}]
+
+@pytest.mark.unit
+@pytest.mark.parametrize('expected_outcome', [True, False])
+def test_bitmasks_like_list(root, expected_outcome):
+    bits = {f'c{index}': index for index in range(7)}
+    masks = root.get_testcase_bitmasks(expected_outcome=expected_outcome, bits=bits)
+    decoded = [{id: bool(values & (1 << bit)) for id, bit in bits.items() if care & (1 << bit)} for values, care in masks]
+
+    assert decoded == root.get_testcase_configuration(expected_outcome=expected_outcome)
@@ -0,0 +1,42 @@
+import pytest
+
+from src.data.graph import ConfigurationCache, EventNode, IntermediateNode
+
+@pytest.fixture
+def root() -> IntermediateNode:
+    # (c0 OR NOT c1) AND (c2 OR c3) AND (c4 OR c5)
+    root = IntermediateNode(id='i0', conjunction=True)
+    for index in range(3):
+        disjunction = IntermediateNode(id=f'i{index+1}', conjunction=False)
+        disjunction.add_incoming(EventNode(id=f'c{2*index}'))
+        disjunction.add_incoming(EventNode(id=f'c{2*index+1}'), negated=(index == 0))
+        root.add_incoming(disjunction)
+    return root
+
+@pytest.mark.unit
+@pytest.mark.parametrize('expected_outcome', [True, False])
+def test_configurations_unchanged(root, expected_outcome):
+    cached = root.get_testcase_configuration(expected_outcome=expected_outcome, cache=ConfigurationCache())
+
+    assert cached == root.get_testcase_configuration(expected_outcome=expected_outcome)
+
+@pytest.mark.unit
+@pytest.mark.parametrize('expected_outcome', [True, False])
+def test_bitmasks_unchanged(root, expected_outcome):
+    bits = {f'c{index}': index for index in range(6)}
+    cached = root.get_testcase_bitmasks(expected_outcome=expected_outcome, bits=bits, cache=ConfigurationCache())
+
+    assert cached == root.get_testcase_bitmasks(expected_outcome=expected_outcome, bits=bits)
+
+@pytest.mark.unit
+def test_reuse_rate(root):
+    cache = ConfigurationCache()
+    root.get_testcase_configuration(expected_outcome=False, cache=cache)
+
+    # every disjunction is requested once as the odd one (False) and twice as a sibling (True), of which only the first request of each outcome is generated
+    assert (cache.hits, cache.misses) == (3, 6)
+    assert cache.reuse_rate == pytest.approx(1/3)
+
+@pytest.mark.unit
+def test_reuse_rate_unused():
+    assert ConfigurationCache().reuse_rate == 0.0
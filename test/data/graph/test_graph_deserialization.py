@@ -136,4 +136,19 @@ def test_graph_multi():
     edges.append(e2.add_incoming(i, negated=True))
     expected = Graph(nodes=[c1, c2, i, e1, e2], root=i, edges=edges)
     
-    assert deserialized == expected
\ No newline at end of file
+    assert deserialized == expected
+
+@pytest.mark.unit
+def test_graph_enumeration_roundtrip():
+    causes = [EventNode(id=f'c{i}', variable=f'cause{i}', condition='occurs') for i in range(100)]
+    i = IntermediateNode(id='i1', conjunction=True)
+    e = EventNode(id='e1', variable='event', condition='happens')
+    edges = [i.add_incoming(cause) for cause in causes]
+    edges.append(e.add_incoming(i))
+    expected = Graph(nodes=causes+[i, e], root=i, edges=edges)
+
+    deserialized = from_dict(expected.to_dict())
+
+    assert deserialized == expected
+    assert deserialized.to_dict() == expected.to_dict()
+    assert deserialized.get_node('c42').variable == 'cause42'
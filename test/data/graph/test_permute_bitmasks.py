@@ -0,0 +1,22 @@
+import pytest
+
+from src.data.graph import permute_bitmasks
+
+@pytest.mark.unit
+def test_permute_none():
+    masks = [[(0b01, 0b11), (0b10, 0b11)]]
+
+    assert permute_bitmasks(inc_masks=masks) == masks[0]
+
+@pytest.mark.unit
+def test_permute_two():
+    masks = [[(0b01, 0b11), (0b10, 0b11)], [(0b100, 0b100), (0b000, 0b100)]]
+
+    assert permute_bitmasks(inc_masks=masks) == [(0b101, 0b111), (0b001, 0b111), (0b110, 0b111), (0b010, 0b111)]
+
+@pytest.mark.unit
+def test_permute_overlap():
+    # like in a merge of dictionaries, the values of the latter configuration take precedence
+    masks = [[(0b01, 0b11)], [(0b10, 0b11)], [(0b000, 0b001)]]
+
+    assert permute_bitmasks(inc_masks=masks) == [(0b10, 0b11)]
@@ -0,0 +1,44 @@
+import pytest
+
+from src.data.graph import permute_configurations, stream_permuted_configurations
+
+def streams(configurations: list[list[dict]]) -> list:
+    return [(lambda inc_config=inc_config: iter(inc_config)) for inc_config in configurations]
+
+@pytest.mark.unit
+def test_stream_none():
+    configurations = [[{'n1': True, 'n2': False}, {'n1': False, 'n2': True}]]
+    permutations = stream_permuted_configurations(inc_streams=streams(configurations))
+
+    assert list(permutations) == configurations[0]
+
+@pytest.mark.unit
+def test_stream_empty():
+    assert list(stream_permuted_configurations(inc_streams=[])) == []
+
+@pytest.mark.unit
+def test_stream_like_permute():
+    configurations = [
+        [{'n1': True, 'n2': False}, {'n1': False, 'n2': True}],
+        [{'n3': True}],
+        [{'n4': True}, {'n4': False}],
+        [{'n5': False, 'n6': False}, {'n5': True, 'n6': False}, {'n5': False, 'n6': True}]]
+    permutations = stream_permuted_configurations(inc_streams=streams(configurations))
+
+    assert list(permutations) == permute_configurations(inc_configs=configurations)
+
+@pytest.mark.unit
+def test_stream_is_lazy():
+    configurations = [[{'n1': True}, {'n1': False}], [{'n2': True}, {'n2': False}]]
+    permutations = stream_permuted_configurations(inc_streams=streams(configurations))
+
+    assert next(permutations) == {'n1': True, 'n2': True}
+    assert next(permutations) == {'n1': True, 'n2': False}
+
+@pytest.mark.unit
+def test_stream_wide():
+    # the number of incoming nodes is not limited by the recursion depth
+    configurations = [[{f'n{index}': True}] for index in range(5000)]
+    permutations = list(stream_permuted_configurations(inc_streams=streams(configurations)))
+
+    assert permutations == [{f'n{index}': True for index in range(5000)}]
@@ -0,0 +1,46 @@
+import pytest
+
+from src.data.labels import EventLabel, LabelIndex, SubLabel
+
+
+@pytest.fixture
+def labels() -> list:
+    # labels ordered by type (like the labels produced by the labeler) rather than by position
+    return [
+        EventLabel(id='L0', name='Cause1', begin=3, end=24),
+        EventLabel(id='L1', name='Effect1', begin=30, end=50),
+        SubLabel(id='L2', name='Conjunction', begin=25, end=28),
+        SubLabel(id='L3', name='Variable', begin=10, end=24),
+        SubLabel(id='L4', name='Variable', begin=30, end=40),
+        SubLabel(id='L5', name='Condition', begin=3, end=9),
+        SubLabel(id='L6', name='Condition', begin=41, end=50)
+    ]
+
+
+@pytest.mark.unit
+def test_within(labels):
+    index = LabelIndex(labels)
+
+    assert [label.id for label in index.within(3, 24)] == ['L0', 'L3', 'L5']
+    assert [label.id for label in index.within(24, 30)] == ['L2']
+    assert [label.id for label in index.within(30, 49)] == ['L4']
+    assert index.within(51, 60) == []
+
+
+@pytest.mark.unit
+def test_within_equals_scan(labels):
+    index = LabelIndex(labels)
+
+    for begin in range(0, 52, 3):
+        for end in range(begin, 52, 2):
+            expected = [label for label in labels if label.begin >= begin and label.end <= end]
+            assert index.within(begin, end) == expected
+
+
+@pytest.mark.unit
+def test_at(labels):
+    index = LabelIndex(labels)
+
+    assert index.at(type='Variable', begin=30, end=40) == labels[4]
+    assert index.at(type='Condition', begin=30, end=40) is None
+    assert index.at(type='Variable', begin=30, end=41) is None
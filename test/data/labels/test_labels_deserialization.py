@@ -1,6 +1,6 @@
 import pytest
 
-from src.data.labels import EventLabel, SubLabel, from_dict
+from src.data.labels import EventLabel, LabelReferenceError, SubLabel, from_dict
 
 
 @pytest.mark.unit
@@ -167,4 +167,41 @@ def test_eventlabel_deserialization():
     l1.set_successor(l2, junctor='AND')
     l2.set_successor(l3, junctor='OR')
     expected = [l1, l11, l12, l2, l3]
-    assert deserialized == expected
\ No newline at end of file
+    assert deserialized == expected
+
+@pytest.mark.unit
+def test_deserialization_duplicate_id():
+    serialized = [
+        {'id': 'L1', 'name': 'Variable', 'begin': 10, 'end': 15, 'parent': None},
+        {'id': 'L1', 'name': 'Condition', 'begin': 16, 'end': 20, 'parent': None}
+    ]
+
+    # the first label with an id takes precedence unless the deserialization is strict
+    deserialized = from_dict(serialized)
+    assert len(deserialized) == 2
+
+    with pytest.raises(LabelReferenceError) as error:
+        from_dict(serialized, strict=True)
+    assert (error.value.reason, error.value.id) == ('duplicate', 'L1')
+
+
+@pytest.mark.unit
+def test_deserialization_dangling_successor():
+    serialized = [
+        {'id': 'L1', 'name': 'Cause1', 'begin': 0, 'end': 10, 'children': [], 'successor': {'id': 'L5', 'junctor': 'AND'}}
+    ]
+
+    with pytest.raises(LabelReferenceError) as error:
+        from_dict(serialized, strict=True)
+    assert (error.value.reason, error.value.id) == ('dangling', 'L5')
+
+
+@pytest.mark.unit
+def test_deserialization_strict_valid():
+    serialized = [
+        {'id': 'L1', 'name': 'Variable', 'begin': 10, 'end': 15, 'parent': 'L2'},
+        {'id': 'L2', 'name': 'Cause1', 'begin': 10, 'end': 30, 'children': ['L1'], 'successor': {'id': 'L3', 'junctor': 'OR'}},
+        {'id': 'L3', 'name': 'Cause2', 'begin': 35, 'end': 50, 'children': [], 'successor': None}
+    ]
+
+    assert from_dict(serialized, strict=True) == from_dict(serialized)
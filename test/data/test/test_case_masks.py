@@ -0,0 +1,56 @@
+import pytest
+
+from src.data.test import Suite, Parameter, to_case_masks
+
+@pytest.mark.unit
+def test_expand():
+    # bit 0 refers to c1, bit 1 to c2, and bit 2 to e
+    cases = to_case_masks(parameters=['c1', 'c2', 'e'], masks=[(0b101, 0b111), (0b000, 0b101)])
+
+    assert len(cases) == 2
+    assert list(cases) == [{'c1': True, 'c2': False, 'e': True}, {'c1': False, 'e': False}]
+    assert cases[1] == {'c1': False, 'e': False}
+
+@pytest.mark.unit
+def test_negative_index():
+    cases = to_case_masks(parameters=['P0', 'P1'], masks=[(1, 3), (2, 3)])
+
+    assert cases[-1] == {'P0': False, 'P1': True}
+    assert cases[-2] == {'P0': True, 'P1': False}
+    with pytest.raises(IndexError):
+        cases[2]
+    with pytest.raises(IndexError):
+        cases[-3]
+
+@pytest.mark.unit
+def test_slice():
+    cases = to_case_masks(parameters=['P0', 'P1'], masks=[(1, 3), (2, 3), (0, 1)])
+
+    assert cases[1:] == [{'P0': False, 'P1': True}, {'P0': False}]
+    assert cases[::-2] == [{'P0': False}, {'P0': True, 'P1': False}]
+    assert cases[5:] == []
+
+@pytest.mark.unit
+def test_wide():
+    # the number of parameters is not limited by the width of an integer type
+    parameters = [f'P{index}' for index in range(100)]
+    cases = to_case_masks(parameters=parameters, masks=[(1 << 99, (1 << 100) - 1)])
+
+    assert list(cases) == [{f'P{index}': index == 99 for index in range(100)}]
+
+@pytest.mark.unit
+def test_suite_serialization():
+    cause = Parameter(id='c', variable='cause', condition='occurs')
+    effect = Parameter(id='e', variable='effect', condition='happens')
+    suite = Suite(conditions=[cause], expected=[effect], cases=to_case_masks(parameters=['c', 'e'], masks=[(0b00, 0b11), (0b11, 0b11)]))
+
+    expected = {
+        'conditions': [{'id': 'c', 'variable': 'cause', 'condition': 'occurs'}],
+        'expected': [{'id': 'e', 'variable': 'effect', 'condition': 'happens'}],
+        'cases': [
+            {'c': False, 'e': False},
+            {'c': True, 'e': True}
+        ]
+    }
+    assert suite.to_dict() == expected
+    assert suite == Suite(conditions=[cause], expected=[effect], cases=expected['cases'])
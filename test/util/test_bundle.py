@@ -0,0 +1,132 @@
+import json
+
+import pytest
+import torch
+from safetensors.torch import save_file
+from tokenizers import Tokenizer, models, normalizers, pre_tokenizers, processors
+from transformers import BertConfig
+
+from src.classifiers.causalitydetection.causalclassifier import CausalClassifier, CLASS_NAMES
+from src.classifiers.causalitydetection.classificationmodel import CausalClassificationModel
+from src.util.bundle import CLASSIFIER, ModelBundle, write_bundle
+
+VOCABULARY = ['[PAD]', '[UNK]', '[CLS]', '[SEP]', 'if', 'the', 'button', 'is', 'pressed', 'then', 'system', 'shuts', 'down', '.']
+
+
+@pytest.fixture
+def tiny_classifier() -> tuple[CausalClassificationModel, BertConfig, Tokenizer]:
+    """Generate a tiny, randomly initialized classification model and a matching tokenizer, which do not require the model hub."""
+    config = BertConfig(vocab_size=len(VOCABULARY), hidden_size=8, num_hidden_layers=1, num_attention_heads=2, intermediate_size=16)
+    model = CausalClassificationModel(len(CLASS_NAMES), config=config)
+
+    tokenizer = Tokenizer(models.WordLevel(vocab={token: index for index, token in enumerate(VOCABULARY)}, unk_token='[UNK]'))
+    tokenizer.pre_tokenizer = pre_tokenizers.WhitespaceSplit()
+    return model, config, tokenizer
+
+
+@pytest.mark.unit
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'bundle.safetensors')
+    weights = {'layer.weight': torch.arange(6, dtype=torch.float32).reshape(2, 3), 'layer.bias': torch.ones(2)}
+
+    write_bundle(path, manifest={CLASSIFIER: {'checkpoint': 'model.bin'}}, components={
+        CLASSIFIER: (weights, json.dumps({'hidden_size': 3}), '{"tokenizer": true}')
+    })
+    bundle = ModelBundle(path)
+
+    assert bundle.manifest[CLASSIFIER] == {'checkpoint': 'model.bin'}
+    assert bundle.config(CLASSIFIER) == {'hidden_size': 3}
+    assert bundle.tokenizer(CLASSIFIER) == '{"tokenizer": true}'
+
+    state_dict = bundle.state_dict(CLASSIFIER)
+    assert state_dict.keys() == weights.keys()
+    for name, tensor in weights.items():
+        assert torch.equal(state_dict[name], tensor)
+
+
+@pytest.mark.unit
+def test_components_are_separated(tmp_path):
+    path = str(tmp_path / 'bundle.safetensors')
+    write_bundle(path, manifest={}, components={
+        'first': ({'weight': torch.zeros(1)}, '{}', ''),
+        'second': ({'weight': torch.ones(1)}, '{}', '')
+    })
+    bundle = ModelBundle(path)
+
+    assert torch.equal(bundle.state_dict('first')['weight'], torch.zeros(1))
+    assert torch.equal(bundle.state_dict('second')['weight'], torch.ones(1))
+
+
+@pytest.mark.unit
+def test_missing_manifest(tmp_path):
+    path = str(tmp_path / 'weights.safetensors')
+    save_file({'weight': torch.zeros(1)}, path)
+
+    with pytest.raises(ValueError):
+        ModelBundle(path)
+
+
+@pytest.mark.unit
+def test_unsupported_version(tmp_path):
+    path = str(tmp_path / 'bundle.safetensors')
+    save_file({'weight': torch.zeros(1)}, path, metadata={'manifest': json.dumps({'bundle_version': 0})})
+
+    with pytest.raises(ValueError):
+        ModelBundle(path)
+
+
+@pytest.mark.unit
+def test_load_classifier_from_bundle(tmp_path, tiny_classifier):
+    model, config, tokenizer = tiny_classifier
+    model.eval()
+    path = str(tmp_path / 'bundle.safetensors')
+    write_bundle(path, manifest={}, components={
+        CLASSIFIER: (model.state_dict(), config.to_json_string(), tokenizer.to_str())
+    })
+
+    classifier = CausalClassifier(bundle=ModelBundle(path))
+
+    sentence = 'if the button is pressed then the system shuts down .'
+    encoded = classifier.tokenizer([sentence], return_tensors='pt')
+    with torch.no_grad():
+        expected = torch.softmax(model(encoded['input_ids'], encoded['attention_mask']), dim=1)
+
+    causal, confidence = classifier.classify_batch([sentence])[0]
+    assert causal == (CLASS_NAMES[expected.argmax().item()] == 'causal')
+    assert confidence == pytest.approx(expected.max().item(), abs=1e-5)
+
+
+@pytest.mark.unit
+def test_load_quantized_classifier_from_bundle(tmp_path, tiny_classifier):
+    model, config, tokenizer = tiny_classifier
+    path = str(tmp_path / 'bundle.safetensors')
+    write_bundle(path, manifest={}, components={
+        CLASSIFIER: (model.state_dict(), config.to_json_string(), tokenizer.to_str())
+    })
+
+    classifier = CausalClassifier(bundle=ModelBundle(path), quantize='int8')
+
+    assert classifier.device.type == 'cpu'
+    assert type(classifier.model.out) != torch.nn.Linear
+    causal, confidence = classifier.classify_batch(['the button is pressed .'])[0]
+    assert 0.5 <= confidence <= 1
+
+
+@pytest.mark.unit
+def test_bundled_tokenizer_keeps_case(tmp_path, tiny_classifier):
+    # the tokenizer of the cased classification model must not lowercase the sentence when loaded from a bundle
+    model, config, _ = tiny_classifier
+    vocabulary = VOCABULARY + ['If', 'Button', 'System']
+    tokenizer = Tokenizer(models.WordPiece(vocab={token: index for index, token in enumerate(vocabulary)}, unk_token='[UNK]'))
+    tokenizer.normalizer = normalizers.BertNormalizer(lowercase=False)
+    tokenizer.pre_tokenizer = pre_tokenizers.BertPreTokenizer()
+    tokenizer.post_processor = processors.BertProcessing(('[SEP]', vocabulary.index('[SEP]')), ('[CLS]', vocabulary.index('[CLS]')))
+    path = str(tmp_path / 'bundle.safetensors')
+    write_bundle(path, manifest={}, components={
+        CLASSIFIER: (model.state_dict(), config.to_json_string(), tokenizer.to_str())
+    })
+
+    classifier = CausalClassifier(bundle=ModelBundle(path))
+
+    sentence = 'If the Button is pressed then the System shuts down.'
+    assert classifier.tokenizer(sentence)['input_ids'] == tokenizer.encode(sentence).ids
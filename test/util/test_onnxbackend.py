@@ -0,0 +1,64 @@
+import pytest
+import torch
+from transformers import BertConfig, RobertaConfig
+
+import src.util.constants as consts
+from src.classifiers.causalitydetection.classificationmodel import CausalClassificationModel
+from src.converters.sentencetolabels.model import LogitsModel, MultiLabelRoBERTaCustomModel, OnnxLabelingModel
+from src.util.onnxbackend import OnnxModel, export
+
+onnxruntime = pytest.importorskip('onnxruntime')
+
+VOCABULARY_SIZE = 32
+
+
+def tokenized_batch(batch_size: int, length: int) -> tuple[torch.Tensor, torch.Tensor]:
+    input_ids = torch.randint(3, VOCABULARY_SIZE, (batch_size, length))
+    attention_mask = torch.ones_like(input_ids)
+    # pad the first sentence
+    attention_mask[0, length//2:] = 0
+    return input_ids, attention_mask
+
+
+@pytest.mark.unit
+def test_classifier(tmp_path):
+    torch.manual_seed(0)
+    config = BertConfig(vocab_size=VOCABULARY_SIZE, hidden_size=8, num_hidden_layers=1, num_attention_heads=2, intermediate_size=16)
+    model = CausalClassificationModel(2, config=config).eval()
+    path = str(tmp_path / 'classifier.onnx')
+    export(model, path, *tokenized_batch(batch_size=2, length=6))
+
+    onnx_model = OnnxModel(path)
+
+    # both the batch size and the sequence length are dynamic
+    for batch_size, length in [(1, 4), (3, 12)]:
+        input_ids, attention_mask = tokenized_batch(batch_size, length)
+        with torch.no_grad():
+            expected = model(input_ids, attention_mask)
+        actual = onnx_model(input_ids, attention_mask)
+        assert actual.shape == (batch_size, 2)
+        assert torch.allclose(actual, expected, atol=1e-4)
+
+
+@pytest.mark.unit
+def test_labeler(tmp_path):
+    torch.manual_seed(0)
+    config = RobertaConfig(vocab_size=VOCABULARY_SIZE, hidden_size=8, num_hidden_layers=1, num_attention_heads=2, intermediate_size=16, max_position_embeddings=64)
+    model = MultiLabelRoBERTaCustomModel(
+        hyperparams={'dropout': 0.1, 'config': config},
+        training_dataset=None,
+        validation_dataset=None,
+        test_dataset=None,
+        labels=consts.LABEL_IDS,
+        model_to_use='roberta-base').eval()
+    path = str(tmp_path / 'labeler.onnx')
+    export(LogitsModel(model), path, *tokenized_batch(batch_size=2, length=6), token_logits=True)
+
+    onnx_model = OnnxLabelingModel(path)
+
+    input_ids, attention_mask = tokenized_batch(batch_size=3, length=10)
+    with torch.no_grad():
+        expected = model(input_ids, attention_mask, token_type_ids=None, labels=None).logits
+    actual = onnx_model(input_ids, attention_mask, token_type_ids=None, labels=None).logits
+    assert actual.shape == (3, 10, len(consts.LABEL_IDS))
+    assert torch.allclose(actual, expected, atol=1e-4)
@@ -0,0 +1,42 @@
+import pytest
+import torch
+
+from src.util.quantization import quantize, INT8
+
+
+@pytest.fixture
+def model() -> torch.nn.Module:
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(torch.nn.Linear(16, 32), torch.nn.ReLU(), torch.nn.Linear(32, 2))
+    model.eval()
+    return model
+
+
+@pytest.mark.unit
+def test_full_precision(model):
+    assert quantize(model, mode=None) is model
+    assert type(model[0]) == torch.nn.Linear
+
+
+@pytest.mark.unit
+def test_int8(model):
+    inputs = torch.randn(4, 16)
+    with torch.no_grad():
+        expected = model(inputs)
+
+    quantized = quantize(model, mode=INT8)
+
+    # the linear layers are replaced by their dynamically quantized counterparts
+    assert type(quantized[0]) != torch.nn.Linear
+    assert type(quantized[2]) != torch.nn.Linear
+    assert isinstance(quantized[0], torch.nn.quantized.dynamic.Linear)
+
+    with torch.no_grad():
+        actual = quantized(inputs)
+    assert torch.allclose(actual, expected, atol=0.05)
+
+
+@pytest.mark.unit
+def test_unsupported_mode(model):
+    with pytest.raises(ValueError):
+        quantize(model, mode='int4')